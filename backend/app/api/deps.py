@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Sequence, Type
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from app.models.hackathon import HackathonResponse
+from app.models.submission import SubmissionResponse
+from app.models.team import TeamResponse
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+# Response-model field name -> Appwrite system attribute
+SYSTEM_ATTRIBUTES = {"id": "$id", "created_at": "$createdAt", "updated_at": "$updatedAt"}
+
+
+class PageParams:
+    """Common `limit` / `cursor` / `stream` query params for list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+        cursor: Optional[str] = Query(None, description="$id of the last document from the previous page"),
+        stream: bool = Query(False, description="Stream every remaining document as NDJSON"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.stream = stream
+
+
+class Fieldset(list):
+    """
+    A parsed `fields` param: the Appwrite attributes to select (the list itself)
+    and `output`, the response keys to keep (always including `$id`).
+    """
+
+    def __init__(self, attributes: Sequence[str], output: Sequence[str]):
+        super().__init__(attributes)
+        self.output = frozenset(["$id", *output])
+
+
+class FieldSelector:
+    """
+    `fields` query param (comma-separated) for read endpoints. Names are checked
+    against a response model and mapped to Appwrite attributes for Query.select;
+    `requires` maps computed fields (e.g. enriched `team_name`) to the stored
+    attributes they are built from, and `derived` maps a field to view-only keys
+    returned along with it (e.g. `members` -> `members_enriched`).
+    Resolves to None when no fields were asked for.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        requires: Optional[Dict[str, Sequence[str]]] = None,
+        derived: Optional[Dict[str, Sequence[str]]] = None,
+    ):
+        self.attributes = {name: SYSTEM_ATTRIBUTES.get(name, name) for name in model.model_fields}
+        self.requires = requires or {}
+        self.derived = derived or {}
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,tagline,start_date (default: all)"),
+    ) -> Optional[Fieldset]:
+        if not fields:
+            return None
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(requested) - set(self.attributes))
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(sorted(self.attributes))}"
+            )
+        selected = []
+        output = []
+        for name in requested:
+            for attribute in self.requires.get(name, (self.attributes[name],)):
+                if attribute not in selected:
+                    selected.append(attribute)
+            output.append(self.attributes[name])
+            output.extend(self.derived.get(name, ()))
+        return Fieldset(selected, output)
+
+
+hackathon_fields = FieldSelector(HackathonResponse)
+team_fields = FieldSelector(TeamResponse, derived={
+    "members": ("members_enriched",),
+    "join_requests": ("join_requests_enriched",),
+})
+submission_fields = FieldSelector(SubmissionResponse, requires={"team_name": ("team_id",)})
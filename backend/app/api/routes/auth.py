@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from app.services.appwrite import get_db_service, get_users_service
+from app.services.counters import hackathon_counters
 from app.core.config import settings
+from app.utils.profiles import build_user_profile
 from app.models.user import UserRegister, UserLoginSync, UserUpdate, PasswordChange, UserResponse
 from appwrite.id import ID
 from appwrite.exception import AppwriteException
@@ -23,8 +25,7 @@ async def register_user(user: UserRegister):
         # A. Create Auth Account (must be first)
         new_account_id = ID.unique()
         try:
-            auth_user = await asyncio.to_thread(
-                users_service.create,
+            auth_user = await users_service.create(
                 user_id=new_account_id,
                 email=user.email,
                 password=user.password,
@@ -51,33 +52,16 @@ async def register_user(user: UserRegister):
             "bio": f"Hi! I'm {user.name}"
         }
 
-        doc = await asyncio.to_thread(
-            db_service.create_document,
+        doc = await db_service.create_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_USERS,
             document_id=auth_user['$id'],
             data=profile_data
         )
+        hackathon_counters.user_registered()
 
         # C. Return full data
-        return {
-            "id": doc['$id'],
-            "username": doc.get('username'),
-            "email": auth_user['email'],
-            "name": auth_user['name'],
-            "role": doc.get('role', 'participant'),
-            "bio": doc.get('bio'),
-            "avatar_url": doc.get('avatar_url'),
-            "github_url": doc.get('github_url'),
-            "portfolio_url": doc.get('portfolio_url'),
-            "skills": doc.get('skills', []),
-            "tech_stack": doc.get('tech_stack', []),
-            "xp": doc.get('xp', 0),
-            "reputation_score": doc.get('reputation_score', 0.0),
-            "account_id": doc.get('account_id'),
-            "created_at": doc['$createdAt'],
-            "updated_at": doc['$updatedAt']
-        }
+        return build_user_profile(doc, auth_user)
 
     except HTTPException:
         raise
@@ -98,36 +82,18 @@ async def login_sync(user: UserLoginSync):
         try:
             # Run both queries in parallel
             doc, auth_user = await asyncio.gather(
-                asyncio.to_thread(
-                    db.get_document,
+                db.get_document(
                     database_id=settings.APPWRITE_DATABASE_ID,
                     collection_id=settings.COLLECTION_USERS,
                     document_id=user.id
                 ),
-                asyncio.to_thread(users_service.get, user.id),
+                users_service.get(user.id),
                 return_exceptions=False
             )
         except Exception:
             raise HTTPException(status_code=401, detail="User not found or Session Invalid.")
 
-        return {
-            "id": doc['$id'],
-            "username": doc.get('username'),
-            "email": auth_user['email'],
-            "name": auth_user['name'],
-            "role": doc.get('role', 'participant'),
-            "bio": doc.get('bio'),
-            "avatar_url": doc.get('avatar_url'),
-            "github_url": doc.get('github_url'),
-            "portfolio_url": doc.get('portfolio_url'),
-            "skills": doc.get('skills', []),
-            "tech_stack": doc.get('tech_stack', []),
-            "xp": doc.get('xp', 0),
-            "reputation_score": doc.get('reputation_score', 0.0),
-            "account_id": doc.get('account_id'),
-            "created_at": doc['$createdAt'],
-            "updated_at": doc['$updatedAt']
-        }
+        return build_user_profile(doc, auth_user)
 
     except HTTPException:
         raise
@@ -156,8 +122,7 @@ async def update_profile(data: UserUpdate):
         if not updates:
             return {"success": False, "message": "No changes provided"}
 
-        await asyncio.to_thread(
-            db.update_document,
+        await db.update_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_USERS,
             document_id=data.user_id,
@@ -179,8 +144,7 @@ async def change_password(data: PasswordChange):
     try:
         users_service = get_users_service()
         
-        await asyncio.to_thread(
-            users_service.update_password,
+        await users_service.update_password(
             user_id=data.user_id,
             password=data.new_password
         )
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi import Query as QueryParam   # appwrite's Query is the query builder here
 from typing import List
+from app.api.deps import PageParams, hackathon_fields, team_fields
 from app.services.appwrite import get_db_service
+from app.services.tag_index import tag_index
+from app.services.summary_queue import summary_queue
+from app.utils.pagination import list_page, select_queries, sparse, next_cursor, iter_pages, ndjson_response
+from app.utils.etag import document_etag, content_etag, conditional
+from app.utils.responses import FastJSONResponse
 from app.core.config import settings
 from app.models.hackathon import HackathonCreate
 from appwrite.id import ID
 from appwrite.query import Query
 from fastapi.encoders import jsonable_encoder
-import asyncio
 from pydantic import BaseModel, Field
 from typing import Optional
 
 router = APIRouter()
 
+# Public event details: browsers may reuse for 30s, then revalidate with the ETag
+HACKATHON_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+
 class HackathonUpdate(BaseModel):
     description: Optional[str] = None
     prize_pool: Optional[str] = None
@@ -27,13 +36,14 @@ async def create_hackathon(hackathon: HackathonCreate):
     try:
         db = get_db_service()
         
-        result = await asyncio.to_thread(
-            db.create_document,
+        result = await db.create_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_HACKATHONS,
             document_id=ID.unique(),
             data=jsonable_encoder(hackathon)
         )
+        tag_index.upsert(result)
+        summary_queue.enqueue(result['$id'], hackathon.description)
         
         return {"success": True, "data": result}
         
@@ -42,35 +52,60 @@ async def create_hackathon(hackathon: HackathonCreate):
 
 
 # --- 2. GET ALL HACKATHONS ---
-@router.get("/", summary="Get all Hackathons")
-async def get_hackathons():
+@router.get("/", summary="Get all Hackathons", response_class=FastJSONResponse)
+async def get_hackathons(page: PageParams = Depends(), fields: Optional[List[str]] = Depends(hackathon_fields)):
+    """
+    Optimization: `fields=` becomes a Query.select, so card views skip long descriptions upstream.
+    """
     try:
-        db = get_db_service()
-        
-        result = await asyncio.to_thread(
-            db.list_documents,
-            database_id=settings.APPWRITE_DATABASE_ID,
-            collection_id=settings.COLLECTION_HACKATHONS
-        )
+        queries = select_queries([], fields)
+
+        if page.stream:
+            return await ndjson_response(
+                iter_pages(settings.COLLECTION_HACKATHONS, queries, page_size=page.limit, cursor=page.cursor),
+                fields=fields
+            )
+
+        result = await list_page(settings.COLLECTION_HACKATHONS, queries, page.limit, page.cursor)
         
-        return {"success": True, "documents": result['documents']}
+        return FastJSONResponse({
+            "success": True,
+            "documents": sparse(result['documents'], fields),
+            "total": result['total'],
+            "next_cursor": next_cursor(result['documents'], page.limit)
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # --- 3. GET HACKATHON BY ID ---
 @router.get("/{hackathon_id}", summary="Get Hackathon by ID")
-async def get_hackathon(hackathon_id: str):
+async def get_hackathon(hackathon_id: str, request: Request, response: Response, fields: Optional[List[str]] = Depends(hackathon_fields)):
+    """
+    Optimization: ETag from $id + $updatedAt; a client holding the current copy gets a bodiless 304.
+    A sparse fieldset (`fields=`) is its own representation, so it is tagged by content instead.
+    """
     try:
         db = get_db_service()
         
-        result = await asyncio.to_thread(
-            db.get_document,
+        result = await db.get_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_HACKATHONS,
-            document_id=hackathon_id
+            document_id=hackathon_id,
+            queries=select_queries(None, fields) or None
         )
+
+        if fields is None:
+            etag = document_etag(result)
+        else:
+            result = sparse([result], fields)[0]
+            etag = content_etag(result)
+        not_modified = conditional(request, response, etag, HACKATHON_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
         
         return {"success": True, "data": result}
         
@@ -79,54 +114,51 @@ async def get_hackathon(hackathon_id: str):
 
 
 # --- 4. RECOMMENDATION ENGINE (OPTIMIZED) ---
-@router.post("/recommendations", summary="Get personalized hackathons")
-async def get_recommendations(user_tags: List[str]):
+@router.post("/recommendations", summary="Get personalized hackathons", response_class=FastJSONResponse)
+async def get_recommendations(user_tags: List[str], limit: Optional[int] = QueryParam(None, ge=1), status: Optional[str] = None):
+    """
+    Optimization: Answers from the in-memory inverted tag index (tag -> hackathon IDs),
+    so cost scales with the matching postings instead of fetching every hackathon.
+    Ranked by number of overlapping tags, then status and start date.
+    """
     try:
-        db = get_db_service()
-        
-        # Fetch all hackathons
-        all_data = await asyncio.to_thread(
-            db.list_documents,
-            database_id=settings.APPWRITE_DATABASE_ID,
-            collection_id=settings.COLLECTION_HACKATHONS
-        )
-        
-        documents = all_data['documents']
+        await tag_index.ensure_built()
         
         # If no tags provided, return all
         if not user_tags:
-            return {"success": True, "documents": documents}
+            return FastJSONResponse({"success": True, "documents": tag_index.all(limit, status)})
         
-        # Convert user_tags to set for O(1) lookup (MAJOR OPTIMIZATION)
-        user_tags_set = set(user_tags)
+        matches = tag_index.query(user_tags, limit=limit, status=status)
         
-        # Filter matches using list comprehension with set intersection
-        matches = [
-            doc for doc in documents
-            if user_tags_set & set(doc.get('tags', []))
-        ]
-        
-        return {"success": True, "count": len(matches), "documents": matches}
+        return FastJSONResponse({"success": True, "count": len(matches), "documents": matches})
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # --- 5. GET HACKATHON TEAMS ---
-@router.get("/{hackathon_id}/teams", summary="Get all teams registered for a hackathon")
-async def get_hackathon_teams(hackathon_id: str):
+@router.get("/{hackathon_id}/teams", summary="Get all teams registered for a hackathon", response_class=FastJSONResponse)
+async def get_hackathon_teams(hackathon_id: str, page: PageParams = Depends(), fields: Optional[List[str]] = Depends(team_fields)):
     try:
-        db = get_db_service()
-        
-        result = await asyncio.to_thread(
-            db.list_documents,
-            database_id=settings.APPWRITE_DATABASE_ID,
-            collection_id=settings.COLLECTION_TEAMS,
-            queries=[Query.equal('hackathon_id', hackathon_id)]
-        )
+        queries = select_queries([Query.equal('hackathon_id', hackathon_id)], fields)
+
+        if page.stream:
+            return await ndjson_response(
+                iter_pages(settings.COLLECTION_TEAMS, queries, page_size=page.limit, cursor=page.cursor),
+                fields=fields
+            )
+
+        result = await list_page(settings.COLLECTION_TEAMS, queries, page.limit, page.cursor)
         
-        return {"success": True, "teams": result['documents']}
+        return FastJSONResponse({
+            "success": True,
+            "teams": sparse(result['documents'], fields),
+            "total": result['total'],
+            "next_cursor": next_cursor(result['documents'], page.limit)
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 # --- UPDATE DETAILS ---
@@ -137,13 +169,15 @@ async def update_hackathon(hackathon_id: str, update: HackathonUpdate):
         data = update.model_dump(exclude_unset=True)
         if not data: return {"success": False, "message": "No changes"}
 
-        result = await asyncio.to_thread(
-            db.update_document,
+        result = await db.update_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_HACKATHONS,
             document_id=hackathon_id,
             data=data
         )
+        tag_index.upsert(result)
+        if "description" in data:
+            summary_queue.enqueue(hackathon_id, data["description"])
         return {"success": True, "data": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -153,13 +187,13 @@ async def update_hackathon(hackathon_id: str, update: HackathonUpdate):
 async def change_status(hackathon_id: str, status: StatusUpdate):
     try:
         db = get_db_service()
-        result = await asyncio.to_thread(
-            db.update_document,
+        result = await db.update_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_HACKATHONS,
             document_id=hackathon_id,
             data={"status": status.status}
         )
+        tag_index.upsert(result)
         return {"success": True, "message": f"Status changed to {status.status}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from typing import List
 from app.services.appwrite import get_db_service
+from app.services.leaderboard import leaderboards
+from app.utils.pagination import MAX_PAGE_SIZE
 from app.core.config import settings
 from pydantic import BaseModel
 from appwrite.id import ID
 import asyncio
+import logging
 
 router = APIRouter()
+logger = logging.getLogger("hackconnect.judging")
 
 class ScoreSubmit(BaseModel):
     submission_id: str
@@ -15,32 +20,119 @@ class ScoreSubmit(BaseModel):
     utility_score: int
     comment: str = ""
 
+
+def _score_data(score: ScoreSubmit) -> dict:
+    """Score document as stored in Appwrite (total calculated automatically)"""
+    return {
+        "submission_id": score.submission_id,
+        "judge_id": score.judge_id,
+        "technical": score.technical_score,
+        "design": score.design_score,
+        "utility": score.utility_score,
+        "total": score.technical_score + score.design_score + score.utility_score,
+        "comment": score.comment
+    }
+
+
 # --- SUBMIT SCORE ---
 @router.post("/score", summary="Submit Judging Score")
 async def submit_score(score: ScoreSubmit):
     try:
         db = get_db_service()
         
-        # Calculate total automatically
-        total = score.technical_score + score.design_score + score.utility_score
+        data = _score_data(score)
+        total = data["total"]
         
-        result = await asyncio.to_thread(
-            db.create_document,
+        result = await db.create_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_SCORES, 
             document_id=ID.unique(),
-            data={
-                "submission_id": score.submission_id,
-                "judge_id": score.judge_id,
-                "technical": score.technical_score,
-                "design": score.design_score,
-                "utility": score.utility_score,
-                "total": total,
-                "comment": score.comment
-            }
+            data=data
         )
         
+        # Keep the in-memory leaderboard current (best effort: the score is already saved)
+        try:
+            await leaderboards.record([result])
+        except Exception:
+            logger.exception("Leaderboard update failed for score %s", result.get('$id'))
+        
         return {"success": True, "message": "Score submitted", "total": total}
         
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# --- SUBMIT SCORES (BATCH) ---
+@router.post("/scores/batch", summary="Submit Many Judging Scores")
+async def submit_scores_batch(scores: List[ScoreSubmit]):
+    """
+    Optimization: One round trip from the judging panel for a whole sitting.
+    Writes run with bounded parallelism, each item reports its own outcome,
+    and the leaderboard is updated once for every saved score.
+    """
+    if not scores:
+        raise HTTPException(status_code=400, detail="No scores provided")
+    if len(scores) > settings.SCORE_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {settings.SCORE_BATCH_MAX_SIZE} scores per batch")
+
+    # Validate the batch as a whole: a judge scores each submission once
+    seen = set()
+    duplicates = []
+    for i, score in enumerate(scores):
+        key = (score.judge_id, score.submission_id)
+        if key in seen:
+            duplicates.append(i)
+        seen.add(key)
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate judge/submission pairs at indexes {duplicates}")
+
+    db = get_db_service()
+    limit = asyncio.Semaphore(settings.SCORE_BATCH_CONCURRENCY)
+
+    async def write(score: ScoreSubmit):
+        async with limit:
+            return await db.create_document(
+                database_id=settings.APPWRITE_DATABASE_ID,
+                collection_id=settings.COLLECTION_SCORES,
+                document_id=ID.unique(),
+                data=_score_data(score)
+            )
+
+    outcomes = await asyncio.gather(*[write(s) for s in scores], return_exceptions=True)
+
+    results = []
+    saved = []
+    for i, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            results.append({"index": i, "success": False, "error": str(outcome)})
+        else:
+            saved.append(outcome)
+            results.append({"index": i, "success": True, "id": outcome['$id'], "total": outcome.get('total')})
+
+    # One leaderboard update for the whole batch (best effort: scores are already saved)
+    if saved:
+        try:
+            await leaderboards.record(saved)
+        except Exception:
+            logger.exception("Leaderboard update failed for a batch of %d scores", len(saved))
+
+    return {
+        "success": len(saved) == len(scores),
+        "saved": len(saved),
+        "failed": len(scores) - len(saved),
+        "results": results
+    }
+
+
+# --- LEADERBOARD ---
+@router.get("/{hackathon_id}/leaderboard", summary="Get Judging Leaderboard")
+async def get_leaderboard(hackathon_id: str, n: int = Query(10, ge=1, le=MAX_PAGE_SIZE)):
+    """
+    Optimization: Served from per-submission aggregates maintained as scores arrive,
+    so views never scan the scores collection (it is re-read at most every LEADERBOARD_MAX_AGE seconds).
+    """
+    try:
+        entries = await leaderboards.top(hackathon_id, n)
+        return {"success": True, "leaderboard": entries}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
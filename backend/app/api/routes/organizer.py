@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from app.services.appwrite import get_db_service
+from app.services.counters import hackathon_counters
+from app.services.announcements import announcement_hub, sse_events
 from app.core.config import settings
-from appwrite.query import Query
 from appwrite.id import ID
 from pydantic import BaseModel
-import asyncio
 from datetime import datetime
 
 router = APIRouter()
@@ -15,65 +17,17 @@ class AnnouncementCreate(BaseModel):
     message: str
     type: str = "info"  # info, warning, success
 
-# --- 1. DASHBOARD ANALYTICS (⚡ Parallel & Fast) ---
+# --- 1. DASHBOARD ANALYTICS (⚡ Materialized & Fast) ---
 @router.get("/{hackathon_id}/stats", summary="Get Dashboard Analytics")
 async def get_hackathon_stats(hackathon_id: str):
     """
-    Optimization: Runs 4 counting queries simultaneously.
+    Optimization: Served from in-memory counters kept current by the team,
+    submission and registration write paths. Appwrite is only queried when the
+    counters are older than STATS_MAX_STALENESS (then reconciled once).
     """
     try:
-        db = get_db_service()
-        
-        # Prepare 4 parallel queries
-        queries = [
-            # 1. Total Registrants
-            asyncio.to_thread(
-                db.list_documents,
-                database_id=settings.APPWRITE_DATABASE_ID,
-                collection_id=settings.COLLECTION_USERS, 
-                queries=[Query.limit(1)]
-            ),
-            # 2. Teams Formed
-            asyncio.to_thread(
-                db.list_documents,
-                database_id=settings.APPWRITE_DATABASE_ID,
-                collection_id=settings.COLLECTION_TEAMS,
-                queries=[Query.equal('hackathon_id', hackathon_id), Query.limit(1)]
-            ),
-            # 3. Submissions Received
-            asyncio.to_thread(
-                db.list_documents,
-                database_id=settings.APPWRITE_DATABASE_ID,
-                collection_id=settings.COLLECTION_SUBMISSIONS,
-                queries=[Query.equal('hackathon_id', hackathon_id), Query.limit(1)]
-            ),
-            # 4. Looking for Team (Placeholder logic)
-            asyncio.to_thread(
-                db.list_documents,
-                database_id=settings.APPWRITE_DATABASE_ID,
-                collection_id=settings.COLLECTION_USERS,
-                queries=[Query.limit(1)] 
-            )
-        ]
-
-        # Execute all at once
-        results = await asyncio.gather(*queries, return_exceptions=True)
-        
-        # Safely extract totals
-        stats = []
-        for res in results:
-            if isinstance(res, Exception):
-                stats.append(0)
-            else:
-                stats.append(res['total'])
-
-        return {
-            "success": True,
-            "total_registrants": stats[0],
-            "teams_formed": stats[1],
-            "submissions_received": stats[2],
-            "looking_for_team": stats[3]
-        }
+        stats = await hackathon_counters.stats(hackathon_id)
+        return {"success": True, **stats}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -85,8 +39,7 @@ async def create_announcement(hackathon_id: str, data: AnnouncementCreate):
     try:
         db = get_db_service()
         
-        result = await asyncio.to_thread(
-            db.create_document,
+        result = await db.create_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_ANNOUNCEMENTS, 
             document_id=ID.unique(),
@@ -99,7 +52,31 @@ async def create_announcement(hackathon_id: str, data: AnnouncementCreate):
             }
         )
         
-        return {"success": True, "message": "Announcement broadcasted"}
+        # Push to every connected participant right away
+        event_id = announcement_hub.publish(hackathon_id, result)
+        
+        return {"success": True, "message": "Announcement broadcasted", "event_id": event_id}
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# --- 3. LIVE ANNOUNCEMENTS (Server-Sent Events) ---
+@router.get("/{hackathon_id}/announcements/stream", summary="Subscribe to Announcements (SSE)")
+async def stream_announcements(hackathon_id: str, request: Request, last_event_id: Optional[int] = None):
+    """
+    Optimization: Participants hold one open connection instead of polling.
+    New announcements are pushed as soon as they are created; reconnecting
+    clients send Last-Event-ID (EventSource does this automatically) and get
+    what they missed replayed from the in-memory buffer.
+    """
+    header_id = request.headers.get("last-event-id")
+    if header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+
+    sub = announcement_hub.subscribe(hackathon_id, last_event_id)
+    return StreamingResponse(
+        sse_events(announcement_hub, sub, settings.SSE_HEARTBEAT_SECONDS, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
\ No newline at end of file
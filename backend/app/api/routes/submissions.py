@@ -1,15 +1,22 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional
+from app.api.deps import PageParams, submission_fields
 from app.services.appwrite import get_db_service
+from app.services.counters import hackathon_counters
+from app.utils.etag import content_etag, conditional
+from app.utils.pagination import list_page, select_queries, sparse, next_cursor, iter_pages, ndjson_response
+from app.utils.responses import FastJSONResponse
 from app.core.config import settings
 from app.models.submission import SubmissionCreate
 from appwrite.id import ID
 from appwrite.query import Query
 from fastapi.encoders import jsonable_encoder
-import asyncio
 
 router = APIRouter()
 
+# New submissions keep arriving until the deadline: always revalidate (cheap 304 when unchanged)
+SUBMISSIONS_CACHE_CONTROL = "private, no-cache"
+
 # --- 1. CREATE SUBMISSION ---
 @router.post("/", summary="Submit Final Project")
 async def create_submission(submission: SubmissionCreate):
@@ -20,13 +27,13 @@ async def create_submission(submission: SubmissionCreate):
         data = jsonable_encoder(submission)
         
         # Async write to database
-        result = await asyncio.to_thread(
-            db.create_document,
+        result = await db.create_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_SUBMISSIONS,
             document_id=ID.unique(),
             data=data
         )
+        hackathon_counters.submission_created(submission.hackathon_id)
         
         return {"success": True, "message": "Project submitted successfully", "data": result}
         
@@ -35,55 +42,86 @@ async def create_submission(submission: SubmissionCreate):
 
 
 # --- 2. GET SUBMISSIONS (Optimized with Team Names) ---
-@router.get("/{hackathon_id}", summary="Get All Submissions for a Hackathon")
-async def get_hackathon_submissions(hackathon_id: str):
-    """
-    Optimization: Fetches submissions AND team details efficiently.
-    Prevents the frontend from showing 'Team ID: 123' -> Shows 'Team Name: CodeWizards'
-    """
-    try:
+async def _attach_team_names(submissions: list) -> list:
+    """Batch-resolve team names for a page of submissions"""
+    # Extract all unique team IDs from the submissions (absent when `fields=` left team_name out)
+    team_ids = list(set(sub['team_id'] for sub in submissions if 'team_id' in sub))
+    
+    if team_ids:
         db = get_db_service()
-        
-        # A. Fetch Submissions
-        submissions_result = await asyncio.to_thread(
-            db.list_documents,
+
+        # Fetch all related teams in ONE query (Database Optimization)
+        teams_result = await db.list_documents(
             database_id=settings.APPWRITE_DATABASE_ID,
-            collection_id=settings.COLLECTION_SUBMISSIONS,
+            collection_id=settings.COLLECTION_TEAMS,
             queries=[
-                Query.equal('hackathon_id', hackathon_id),
-                Query.order_desc('$createdAt')
+                Query.equal('$id', team_ids),
+                Query.select(['$id', 'name']), # Fetch only names to save bandwidth
+                Query.limit(len(team_ids))
             ]
         )
         
-        submissions = submissions_result['documents']
+        # Create a lookup map: {'team_id_1': 'Team Alpha', ...}
+        team_map = {t['$id']: t['name'] for t in teams_result['documents']}
         
-        if not submissions:
-            return {"success": True, "submissions": []}
+        # Merge Data
+        for sub in submissions:
+            if 'team_id' in sub:
+                sub['team_name'] = team_map.get(sub['team_id'], "Unknown Team")
 
-        # B. Batch Fetch Teams (The "Enrichment" Step)
-        # Extract all unique team IDs from the submissions
-        team_ids = list(set(sub['team_id'] for sub in submissions))
-        
-        if team_ids:
-            # Fetch all related teams in ONE query (Database Optimization)
-            teams_result = await asyncio.to_thread(
-                db.list_documents,
-                database_id=settings.APPWRITE_DATABASE_ID,
-                collection_id=settings.COLLECTION_TEAMS,
-                queries=[
-                    Query.equal('$id', team_ids),
-                    Query.select(['$id', 'name']) # Fetch only names to save bandwidth
-                ]
+    return submissions
+
+
+@router.get("/{hackathon_id}", summary="Get All Submissions for a Hackathon", response_class=FastJSONResponse)
+async def get_hackathon_submissions(
+    hackathon_id: str,
+    request: Request,
+    page: PageParams = Depends(),
+    fields: Optional[List[str]] = Depends(submission_fields),
+):
+    """
+    Optimization: Fetches submissions AND team details efficiently.
+    Prevents the frontend from showing 'Team ID: 123' -> Shows 'Team Name: CodeWizards'
+    """
+    try:
+        queries = select_queries([
+            Query.equal('hackathon_id', hackathon_id),
+            Query.order_desc('$createdAt')
+        ], fields)
+
+        if page.stream:
+            return await ndjson_response(
+                iter_pages(settings.COLLECTION_SUBMISSIONS, queries, page_size=page.limit, cursor=page.cursor),
+                transform=_attach_team_names,
+                fields=fields
             )
-            
-            # Create a lookup map: {'team_id_1': 'Team Alpha', ...}
-            team_map = {t['$id']: t['name'] for t in teams_result['documents']}
-            
-            # C. Merge Data
-            for sub in submissions:
-                sub['team_name'] = team_map.get(sub['team_id'], "Unknown Team")
+
+        # A. Fetch one page of Submissions
+        submissions_result = await list_page(settings.COLLECTION_SUBMISSIONS, queries, page.limit, page.cursor)
         
-        return {"success": True, "submissions": submissions}
+        submissions = submissions_result['documents']
+
+        # B. Batch Fetch Teams (The "Enrichment" Step)
+        if submissions:
+            await _attach_team_names(submissions)
         
+        result = {
+            "success": True,
+            "submissions": sparse(submissions, fields),
+            "total": submissions_result['total'],
+            "next_cursor": next_cursor(submissions, page.limit)
+        }
+
+        # C. Conditional GET: content hash of the page (judges re-open this list a lot).
+        # Headers go on the response we return - FastAPI ignores an injected Response then.
+        response = FastJSONResponse(result)
+        not_modified = conditional(request, response, content_etag(result), SUBMISSIONS_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
+
+        return response
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,15 +1,31 @@
-from fastapi import APIRouter, HTTPException
-from app.services.appwrite import get_db_service, get_users_service
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi import Query as QueryParam   # appwrite's Query is the query builder here
+from app.api.deps import PageParams, team_fields
+from app.services.appwrite import get_db_service
+from app.services.user_directory import get_user_names
+from app.services.counters import hackathon_counters
+from app.services.matching import MatchEngine
+from app.utils.pagination import MAX_PAGE_SIZE, list_page, select_queries, sparse, next_cursor, iter_pages, iter_documents, ndjson_response
+from app.utils.locks import KeyedLocks
+from app.utils.coalescer import WriteCoalescer
+from app.utils.etag import content_etag, conditional
+from app.utils.responses import FastJSONResponse
 from app.core.config import settings
 from app.models.team import TeamCreate
 from pydantic import BaseModel
 from appwrite.id import ID
+from appwrite.operator import Operator
 from appwrite.query import Query
-from typing import Optional, List
-import asyncio
+from typing import Callable, Optional, List
 
 router = APIRouter()
 
+# Membership changes often during events: always revalidate (cheap 304 when unchanged)
+TEAM_CACHE_CONTROL = "private, no-cache"
+
+# Serializes membership writes per team within this worker
+team_locks = KeyedLocks(shards=settings.TEAM_LOCK_SHARDS)
+
 
 # Action Models
 class TeamAction(BaseModel):
@@ -32,22 +48,21 @@ class TeamUpdate(BaseModel):
 
 
 # Helper function to fetch team (reused multiple times)
-async def _get_team(team_id: str) -> dict:
+async def _get_team(team_id: str, queries: Optional[List[str]] = None) -> dict:
     """Fetch team document"""
     db = get_db_service()
-    return await asyncio.to_thread(
-        db.get_document,
+    return await db.get_document(
         database_id=settings.APPWRITE_DATABASE_ID,
         collection_id=settings.COLLECTION_TEAMS,
-        document_id=team_id
+        document_id=team_id,
+        queries=queries
     )
 
 
 async def _update_team(team_id: str, data: dict):
     """Update team document"""
     db = get_db_service()
-    return await asyncio.to_thread(
-        db.update_document,
+    return await db.update_document(
         database_id=settings.APPWRITE_DATABASE_ID,
         collection_id=settings.COLLECTION_TEAMS,
         document_id=team_id,
@@ -55,6 +70,49 @@ async def _update_team(team_id: str, data: dict):
     )
 
 
+async def _mutate_team(team_id: str, change: Callable[[dict], Optional[dict]]):
+    """
+    Validate-then-write for a team's membership arrays.
+    `change(team)` checks the action against a fresh read and returns the fields
+    to update as Appwrite array operators (Operator.array_append / array_remove),
+    or None to skip writing; it may raise HTTPException to reject the action.
+    Appwrite applies operators atomically per element, so concurrent writers on
+    any worker can't overwrite each other's additions/removals the way a
+    whole-array read-modify-write can. Within this worker, writers to the same
+    team queue on a per-team lock so each validation sees the previous write;
+    across workers validation is best effort (two workers may both accept the
+    same requester, leaving a duplicate entry that a later remove clears).
+    Two upstream calls: get + update. Returns (team as read, updated document or None).
+    """
+    async with team_locks.hold(team_id):
+        team = await _get_team(team_id)
+        data = change(team)
+        if data is None:
+            return team, None
+        return team, await _update_team(team_id, data)
+
+
+def _enrich_team(doc: dict, user_map: dict):
+    """Attach display names for members and pending join requests"""
+    doc.setdefault('leader_id', "")
+    doc['members_enriched'] = [
+        {
+            "userId": m_id,
+            "name": user_map.get(m_id, "Unknown User"),
+            "avatar": ""
+        }
+        for m_id in doc.get('members', [])
+    ]
+    doc['join_requests_enriched'] = [
+        {
+            "userId": r_id,
+            "name": user_map.get(r_id, "Unknown User")
+        }
+        for r_id in (doc.get('join_requests') or [])
+    ]
+    return doc
+
+
 # --- 1. CREATE TEAM ---
 @router.post("/", summary="Create a Team")
 async def create_team(team: TeamCreate):
@@ -80,13 +138,13 @@ async def create_team(team: TeamCreate):
             }.items() if v is not None
         }
 
-        result = await asyncio.to_thread(
-            db.create_document,
+        result = await db.create_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_TEAMS,
             document_id=ID.unique(),
             data=data_to_save
         )
+        hackathon_counters.team_created(result)
         
         return {"success": True, "data": result}
         
@@ -106,12 +164,12 @@ async def delete_team(action: TeamAction):
         if team['leader_id'] != action.user_id:
             raise HTTPException(status_code=403, detail="Only leader can delete.")
 
-        await asyncio.to_thread(
-            db.delete_document,
+        await db.delete_document(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_TEAMS,
             document_id=action.team_id
         )
+        hackathon_counters.team_deleted(team)
         
         return {"success": True, "message": "Team deleted"}
 
@@ -126,26 +184,28 @@ async def delete_team(action: TeamAction):
 async def leave_team(action: TeamAction):
     try:
         db = get_db_service()
-        team = await _get_team(action.team_id)
 
-        current_members = team.get('members', [])
+        def change(team):
+            current_members = team.get('members', [])
+            if action.user_id not in current_members:
+                raise HTTPException(status_code=400, detail="Not in team")
+            if action.user_id == team['leader_id']:
+                return None  # leader leaving disbands the team (below)
+            return {"members": Operator.array_remove(action.user_id)}
 
-        if action.user_id not in current_members:
-            raise HTTPException(status_code=400, detail="Not in team")
+        team, updated = await _mutate_team(action.team_id, change)
 
         # Leader leaving? Delete team
-        if action.user_id == team['leader_id']:
-            await asyncio.to_thread(
-                db.delete_document,
+        if updated is None:
+            await db.delete_document(
                 database_id=settings.APPWRITE_DATABASE_ID,
                 collection_id=settings.COLLECTION_TEAMS,
                 document_id=action.team_id
             )
+            hackathon_counters.team_deleted(team)
             return {"success": True, "message": "Leader left. Team disbanded."}
 
-        # Remove member and update
-        current_members.remove(action.user_id)
-        await _update_team(action.team_id, {"members": current_members})
+        hackathon_counters.member_removed(team.get('hackathon_id'), action.user_id)
         
         return {"success": True, "message": "Left team"}
 
@@ -156,97 +216,104 @@ async def leave_team(action: TeamAction):
 
 
 # --- 4. LIST TEAMS (OPTIMIZED) ---
-@router.get("/", summary="List All Teams")
-async def list_teams(user_id: Optional[str] = None):
-    try:
-        db = get_db_service()
-        users_service = get_users_service()
+async def _enrich_teams(docs: list) -> list:
+    """Resolve every member / requester name for a page of teams in one pass"""
+    # 1. Collect all unique user IDs
+    user_ids = set()
+    for doc in docs:
+        user_ids.update(doc.get('members', []))
+        user_ids.update(doc.get('join_requests', []) or [])
         
-        queries = []
+    # 2. Resolve names (shared TTL+LRU cache, only misses go upstream)
+    user_map = await get_user_names(user_ids) if user_ids else {}
+    
+    # 3. Enrich teams
+    for doc in docs:
+        _enrich_team(doc, user_map)
+    return docs
+
+
+@router.get("/", summary="List All Teams", response_class=FastJSONResponse)
+async def list_teams(user_id: Optional[str] = None, page: PageParams = Depends(), fields: Optional[List[str]] = Depends(team_fields)):
+    try:
+        queries = select_queries([], fields)
         if user_id:
             # Filter teams where user is a member
             # Query.equal works for array containment in Appwrite (matches if array contains value)
             queries.append(Query.equal("members", user_id))
 
-        # 1. Fetch teams
-        teams_result = await asyncio.to_thread(
-            db.list_documents,
-            database_id=settings.APPWRITE_DATABASE_ID,
-            collection_id=settings.COLLECTION_TEAMS,
-            queries=queries
-        )
-        
-        # 2. Collect all unique user IDs
-        user_ids = set()
-        for doc in teams_result['documents']:
-            user_ids.update(doc.get('members', []))
-            user_ids.update(doc.get('join_requests', []) or [])
-            
-        # 3. Fetch users in parallel (if any)
-        user_map = {}
-        if user_ids:
-            # Limit concurrency to avoid rate limits
-            # Appwrite doesn't support bulk fetch by ID list, so we fetch individually
-            # For production, this should be cached or handled differently
-            async def fetch_user_safe(uid):
-                try:
-                    u = await asyncio.to_thread(users_service.get, uid)
-                    return u
-                except:
-                    return None
-
-            users_data = await asyncio.gather(*[fetch_user_safe(uid) for uid in user_ids])
-            
-            for u in users_data:
-                if u:
-                    user_map[u['$id']] = u['name']
+        if page.stream:
+            return await ndjson_response(
+                iter_pages(settings.COLLECTION_TEAMS, queries, page_size=page.limit, cursor=page.cursor),
+                transform=_enrich_teams,
+                fields=fields
+            )
+
+        # 1. Fetch one page of teams
+        teams_result = await list_page(settings.COLLECTION_TEAMS, queries, page.limit, page.cursor)
         
-        # 4. Enrich teams
-        for doc in teams_result['documents']:
-            doc.setdefault('leader_id', "")
-            
-            # Enrich members
-            doc['members_enriched'] = [
-                {
-                    "userId": m_id,
-                    "name": user_map.get(m_id, "Unknown User"),
-                    "avatar": ""
-                }
-                for m_id in doc.get('members', [])
-            ]
-            
-            # Enrich join requests
-            doc['join_requests_enriched'] = [
-                {
-                    "userId": r_id,
-                    "name": user_map.get(r_id, "Unknown User")
-                }
-                for r_id in (doc.get('join_requests') or [])
-            ]
-
-        return teams_result
+        # 2. Enrich with member names
+        await _enrich_teams(teams_result['documents'])
+        teams_result['next_cursor'] = next_cursor(teams_result['documents'], page.limit)
+        teams_result['documents'] = sparse(teams_result['documents'], fields)
+
+        return FastJSONResponse(teams_result)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # --- 5. JOIN TEAM ---
+async def _apply_join_requests(team_id: str, user_ids: List[str]) -> list:
+    """
+    One merged write for every join request buffered for a team: a single
+    array_append of the new requesters (get + update, 2 upstream calls per window).
+    Each requester gets their own outcome: None (added) or the HTTPException
+    they would have got on their own.
+    """
+    outcomes = []
+
+    def change(team):
+        current_members = set(team.get('members', []))
+        current_requests = set(team.get('join_requests') or [])
+        added = []
+
+        for user_id in user_ids:
+            if user_id in current_members:
+                outcomes.append(HTTPException(status_code=400, detail="Already in team"))
+            elif user_id in current_requests:
+                outcomes.append(HTTPException(status_code=400, detail="Request already pending"))
+            else:
+                current_requests.add(user_id)
+                added.append(user_id)
+                outcomes.append(None)
+
+        if not added:
+            return None
+        return {"join_requests": Operator.array_append(added)}
+
+    await _mutate_team(team_id, change)
+    return list(outcomes)
+
+
+# Join bursts on a hot team become one get + one update (2 upstream calls) per team per window
+join_coalescer = WriteCoalescer(
+    _apply_join_requests,
+    window=settings.JOIN_COALESCE_MS / 1000,
+    max_batch_size=settings.JOIN_COALESCE_MAX_BATCH,
+)
+
+
 @router.post("/join", summary="Request to Join Team")
 async def join_team(action: TeamAction):
+    """
+    Optimization: Requests for the same team arriving within a few ms are
+    merged into a single join_requests update; each caller still gets its own answer.
+    """
     try:
-        team = await _get_team(action.team_id)
-
-        current_members = team.get('members', [])
-        current_requests = team.get('join_requests', [])
-
-        if action.user_id in current_members:
-            raise HTTPException(status_code=400, detail="Already in team")
-        
-        if action.user_id in current_requests:
-            raise HTTPException(status_code=400, detail="Request already pending")
-
-        current_requests.append(action.user_id)
-        await _update_team(action.team_id, {"join_requests": current_requests})
+        await join_coalescer.submit(action.team_id, action.user_id)
         
         return {"success": True, "message": "Join request sent"}
 
@@ -260,25 +327,23 @@ async def join_team(action: TeamAction):
 @router.post("/approve", summary="Approve Join Request")
 async def approve_request(action: TeamRequestAction):
     try:
-        team = await _get_team(action.team_id)
+        def change(team):
+            if team['leader_id'] != action.leader_id:
+                raise HTTPException(status_code=403, detail="Only leader can approve requests")
 
-        if team['leader_id'] != action.leader_id:
-            raise HTTPException(status_code=403, detail="Only leader can approve requests")
+            current_requests = team.get('join_requests') or []
 
-        current_requests = team.get('join_requests', [])
-        current_members = team.get('members', [])
+            if action.target_user_id not in current_requests:
+                raise HTTPException(status_code=404, detail="Request not found")
 
-        if action.target_user_id not in current_requests:
-            raise HTTPException(status_code=404, detail="Request not found")
-
-        # Update both lists
-        current_requests.remove(action.target_user_id)
-        current_members.append(action.target_user_id)
+            # Update both lists
+            return {
+                "join_requests": Operator.array_remove(action.target_user_id),
+                "members": Operator.array_append([action.target_user_id])
+            }
 
-        await _update_team(action.team_id, {
-            "join_requests": current_requests,
-            "members": current_members
-        })
+        team, _ = await _mutate_team(action.team_id, change)
+        hackathon_counters.member_added(team.get('hackathon_id'), action.target_user_id)
         
         return {"success": True, "message": "Member approved"}
         
@@ -292,18 +357,18 @@ async def approve_request(action: TeamRequestAction):
 @router.post("/reject", summary="Reject Join Request")
 async def reject_request(action: TeamRequestAction):
     try:
-        team = await _get_team(action.team_id)
+        def change(team):
+            if team['leader_id'] != action.leader_id:
+                raise HTTPException(status_code=403, detail="Only leader can reject requests")
 
-        if team['leader_id'] != action.leader_id:
-            raise HTTPException(status_code=403, detail="Only leader can reject requests")
+            current_requests = team.get('join_requests') or []
 
-        current_requests = team.get('join_requests', [])
+            if action.target_user_id not in current_requests:
+                raise HTTPException(status_code=404, detail="Request not found")
 
-        if action.target_user_id not in current_requests:
-            raise HTTPException(status_code=404, detail="Request not found")
+            return {"join_requests": Operator.array_remove(action.target_user_id)}
 
-        current_requests.remove(action.target_user_id)
-        await _update_team(action.team_id, {"join_requests": current_requests})
+        await _mutate_team(action.team_id, change)
         
         return {"success": True, "message": "Request rejected"}
         
@@ -336,54 +401,107 @@ async def update_team_details(team_id: str, update: TeamUpdate, user_id: str):
 
 # --- 10. GET TEAM ---
 @router.get("/{team_id}", summary="Get Team Details")
-async def get_team(team_id: str):
+async def get_team(team_id: str, request: Request, response: Response, fields: Optional[List[str]] = Depends(team_fields)):
+    """
+    Optimization: ETag over the enriched team (member names are part of the view),
+    so a client holding the current copy gets a bodiless 304.
+    """
     try:
-        db = get_db_service()
-        users_service = get_users_service()
-        
-        # 1. Fetch team
-        team = await _get_team(team_id)
+        # 1. Fetch team (only the requested attributes)
+        team = await _get_team(team_id, select_queries(None, fields) or None)
         
-        # 2. Collect user IDs
-        user_ids = set()
-        user_ids.update(team.get('members', []))
-        user_ids.update(team.get('join_requests', []) or [])
+        # 2. Enrich with member names (cached), then trim to the requested fields
+        await _enrich_teams([team])
+        team = sparse([team], fields)[0]
+
+        not_modified = conditional(request, response, content_etag(team), TEAM_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
         
-        # 3. Fetch users in parallel
-        user_map = {}
-        if user_ids:
-            async def fetch_user_safe(uid):
-                try:
-                    u = await asyncio.to_thread(users_service.get, uid)
-                    return u
-                except:
-                    return None
-
-            users_data = await asyncio.gather(*[fetch_user_safe(uid) for uid in user_ids])
-            
-            for u in users_data:
-                if u:
-                    user_map[u['$id']] = u['name']
-            
-        # Enrich
-        team.setdefault('leader_id', "")
-        team['members_enriched'] = [
-            {
-                "userId": m_id,
-                "name": user_map.get(m_id, "Unknown User"),
-                "avatar": ""
-            }
-            for m_id in team.get('members', [])
+        return team
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# --- 11. MATCHMAKING ---
+CLOSED_TEAM_STATUSES = {"full", "closed"}
+
+
+async def _hackathon_teams(hackathon_id: str) -> list:
+    """Every team in a hackathon (all pages)"""
+    return [
+        doc async for doc in iter_documents(
+            settings.COLLECTION_TEAMS,
+            [Query.equal('hackathon_id', hackathon_id)]
+        )
+    ]
+
+
+@router.get("/match/{user_id}", summary="Best Open Teams for a User")
+async def match_teams_for_user(user_id: str, hackathon_id: str, k: int = QueryParam(10, ge=1, le=MAX_PAGE_SIZE)):
+    """
+    Optimization: Ranks every open team in the hackathon against the user's skills
+    in one batched bitset pass (see MatchEngine).
+    """
+    try:
+        db = get_db_service()
+        try:
+            user_doc = await db.get_document(
+                database_id=settings.APPWRITE_DATABASE_ID,
+                collection_id=settings.COLLECTION_USERS,
+                document_id=user_id
+            )
+        except Exception:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        open_teams = [
+            t for t in await _hackathon_teams(hackathon_id)
+            if t.get('status') not in CLOSED_TEAM_STATUSES and user_id not in t.get('members', [])
         ]
-        team['join_requests_enriched'] = [
-            {
-                "userId": r_id,
-                "name": user_map.get(r_id, "Unknown User")
-            }
-            for r_id in (team.get('join_requests') or [])
+
+        ranked = MatchEngine().rank_teams_for_user(user_doc.get('skills', []), open_teams, k)
+        return {
+            "success": True,
+            "matches": [{"score": score, "team": team} for score, team in ranked]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{team_id}/candidates", summary="Best Candidate Users for a Team")
+async def match_candidates_for_team(team_id: str, k: int = QueryParam(10, ge=1, le=MAX_PAGE_SIZE)):
+    """
+    Optimization: Scores every participant without a team in this hackathon against
+    the team's `looking_for` in one batched bitset pass.
+    Every participant has to be scored, so this reads the participant list in full
+    (one list call per MAX_PAGE_SIZE users, only $id/username/skills selected);
+    the N+1 detector counts those pages as a scan, not as repeated calls.
+    """
+    try:
+        team = await _get_team(team_id)
+
+        # Anyone already on a team for this hackathon is not a candidate
+        taken = set()
+        for t in await _hackathon_teams(team['hackathon_id']):
+            taken.update(t.get('members', []))
+
+        users = [
+            u async for u in iter_documents(
+                settings.COLLECTION_USERS,
+                [Query.equal('role', 'participant'), Query.select(['$id', 'username', 'skills'])]
+            )
+            if u['$id'] not in taken
         ]
-        
-        return team
+
+        ranked = MatchEngine().rank_users_for_team(team.get('looking_for', []), users, k)
+        return {
+            "success": True,
+            "candidates": [{"score": score, "user": user} for score, user in ranked]
+        }
     except HTTPException:
         raise
     except Exception as e:
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.services.appwrite import get_db_service, get_users_service
+from app.services.user_directory import remember_user_name, invalidate_user
 from app.core.config import settings
+from app.utils.profiles import build_user_profile
+from app.utils.etag import document_etag, conditional
 from app.models.user import UserResponse, UserUpdate
 from appwrite.query import Query
 import asyncio
@@ -8,54 +11,52 @@ import asyncio
 
 router = APIRouter()
 
+# Profiles are per-user and editable: always revalidate (cheap 304 when unchanged)
+PROFILE_CACHE_CONTROL = "private, no-cache"
+
 
 # --- OPTIMIZED: GET USER PROFILE ---
+async def _load_user_profile(user_id: str):
+    """Profile document + auth account, merged. Returns (profile, etag)."""
+    db = get_db_service()
+    users = get_users_service()
+    
+    try:
+        # Run both database queries concurrently using asyncio
+        doc, auth_user = await asyncio.gather(
+            db.get_document(
+                database_id=settings.APPWRITE_DATABASE_ID,
+                collection_id=settings.COLLECTION_USERS,
+                document_id=user_id
+            ),
+            users.get(user_id),
+            return_exceptions=False
+        )
+    except Exception as e:
+        if "404" in str(e):
+            raise HTTPException(status_code=404, detail="User not found")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    remember_user_name(user_id, auth_user['name'])
+
+    # Return merged data; either side changing (e.g. a rename) changes the ETag
+    return build_user_profile(doc, auth_user), document_etag(doc, auth_user)
+
+
 @router.get("/{user_id}", response_model=UserResponse, summary="Get User Profile")
-async def get_user_profile(user_id: str):
+async def get_user_profile(user_id: str, request: Request, response: Response):
     """
-    Optimization: Uses asyncio.to_thread instead of ThreadPoolExecutor for better performance
+    Optimization: Native async Appwrite calls run concurrently on the event loop (no thread hops).
+    ETag from both documents' $updatedAt; unchanged profiles cost a bodiless 304.
     """
     try:
-        db = get_db_service()
-        users = get_users_service()
-        
-        try:
-            # Run both database queries concurrently using asyncio
-            doc, auth_user = await asyncio.gather(
-                asyncio.to_thread(
-                    db.get_document,
-                    database_id=settings.APPWRITE_DATABASE_ID,
-                    collection_id=settings.COLLECTION_USERS,
-                    document_id=user_id
-                ),
-                asyncio.to_thread(users.get, user_id),
-                return_exceptions=False
-            )
+        profile, etag = await _load_user_profile(user_id)
 
-            # Return merged data
-            return {
-                "id": doc['$id'],
-                "username": doc.get('username'),
-                "email": auth_user['email'],      
-                "name": auth_user['name'],        
-                "role": doc.get('role', 'participant'), 
-                "bio": doc.get('bio'),
-                "avatar_url": doc.get('avatar_url'),
-                "github_url": doc.get('github_url'),
-                "portfolio_url": doc.get('portfolio_url'),
-                "skills": doc.get('skills', []),
-                "tech_stack": doc.get('tech_stack', []),
-                "xp": doc.get('xp', 0),
-                "reputation_score": doc.get('reputation_score', 0.0),
-                "account_id": doc.get('account_id'),
-                "created_at": doc['$createdAt'],
-                "updated_at": doc['$updatedAt']
-            }
-            
-        except Exception as e:
-            if "404" in str(e):
-                raise HTTPException(status_code=404, detail="User not found")
-            raise HTTPException(status_code=500, detail=str(e))
+        not_modified = conditional(request, response, etag, PROFILE_CACHE_CONTROL)
+        if not_modified:
+            return not_modified
+
+        return profile
 
     except HTTPException:
         raise
@@ -84,13 +85,12 @@ async def update_user_profile(user_id: str, user_update: UserUpdate):
         
         if name_update:
             tasks.append(
-                asyncio.to_thread(users.update_name, user_id, name_update)
+                users.update_name(user_id, name_update)
             )
         
         if update_data:
             tasks.append(
-                asyncio.to_thread(
-                    db.update_document,
+                db.update_document(
                     database_id=settings.APPWRITE_DATABASE_ID,
                     collection_id=settings.COLLECTION_USERS,
                     document_id=user_id,
@@ -101,9 +101,14 @@ async def update_user_profile(user_id: str, user_update: UserUpdate):
         # Execute all updates concurrently
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Drop the cached display name so team views pick up the rename
+        if name_update:
+            invalidate_user(user_id)
         
         # Return updated profile
-        return await get_user_profile(user_id)
+        profile, _ = await _load_user_profile(user_id)
+        return profile
 
     except HTTPException:
         raise
@@ -121,8 +126,7 @@ async def get_user_hackathons(user_id: str):
         db = get_db_service()
         
         # Step 1: Fetch user's teams
-        teams_result = await asyncio.to_thread(
-            db.list_documents,
+        teams_result = await db.list_documents(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_TEAMS,
             queries=[Query.equal('members', user_id)]
@@ -136,8 +140,7 @@ async def get_user_hackathons(user_id: str):
         hackathon_ids = list(hackathon_team_map.keys())
         
         # Step 3: Fetch hackathon details (already optimized - single query with multiple IDs)
-        hackathons_result = await asyncio.to_thread(
-            db.list_documents,
+        hackathons_result = await db.list_documents(
             database_id=settings.APPWRITE_DATABASE_ID,
             collection_id=settings.COLLECTION_HACKATHONS,
             queries=[
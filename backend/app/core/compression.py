@@ -0,0 +1,130 @@
+import gzip
+from typing import Iterable
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Optional: brotli compresses JSON ~15-25% smaller than gzip at similar speed
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Streaming types (application/x-ndjson, text/event-stream) are deliberately absent:
+# they must reach the client as each chunk is produced.
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/plain",
+    "text/html",
+    "text/css",
+    "application/javascript",
+)
+
+
+class CompressionMiddleware:
+    """
+    Brotli or gzip (whichever the client accepts, brotli preferred) for sized
+    responses of an allowlisted content type of at least `minimum_size` bytes.
+    Streaming bodies (no Content-Length), already-encoded responses and small
+    payloads pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = COMPRESSIBLE_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = tuple(content_types)
+
+    @staticmethod
+    def _qvalues(accept_encoding: str) -> dict:
+        """Accept-Encoding as coding -> q (q=0 means the client refuses it)."""
+        qvalues = {}
+        for part in accept_encoding.split(","):
+            coding, *params = [p.strip() for p in part.split(";")]
+            q = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            if coding:
+                qvalues[coding.lower()] = q
+        return qvalues
+
+    def _choose(self, accept_encoding: str):
+        qvalues = self._qvalues(accept_encoding)
+        wildcard = qvalues.get("*", 0.0)
+        accepts = lambda coding: qvalues.get(coding, wildcard) > 0
+        if brotli is not None and accepts("br"):
+            return "br"
+        if accepts("gzip"):
+            return "gzip"
+        return None
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        chunks = []
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "").split(";")[0].strip()
+                # No Content-Length means a streaming body: never hold it back
+                length = int(headers.get("content-length") or -1)
+                if (
+                    "content-encoding" in headers
+                    or content_type not in self.content_types
+                    or length < self.minimum_size
+                ):
+                    await send(message)
+                else:
+                    start_message = message  # hold until the whole body is in
+                return
+
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            # Sized body, possibly re-chunked by an outer/inner middleware
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            compressed = self._compress(encoding, b"".join(chunks))
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            # Encoded bytes differ from the identity ones, so a strong ETag becomes weak
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
@@ -12,13 +12,88 @@ class Settings:
     APPWRITE_PROJECT_ID: str = os.getenv("APPWRITE_PROJECT_ID")
     APPWRITE_API_KEY: str = os.getenv("APPWRITE_API_KEY")
     APPWRITE_DATABASE_ID: str = os.getenv("APPWRITE_DATABASE_ID")
+    # "appwrite" (default) or "fake": in-memory stand-in for offline runs and load tests
+    APPWRITE_BACKEND: str = os.getenv("APPWRITE_BACKEND", "appwrite")
+
+    # Appwrite HTTP pool (shared keep-alive connections)
+    APPWRITE_MAX_CONNECTIONS: int = int(os.getenv("APPWRITE_MAX_CONNECTIONS", "200"))
+    APPWRITE_MAX_KEEPALIVE: int = int(os.getenv("APPWRITE_MAX_KEEPALIVE", "100"))
+    APPWRITE_KEEPALIVE_EXPIRY: float = float(os.getenv("APPWRITE_KEEPALIVE_EXPIRY", "30"))
+    APPWRITE_TIMEOUT: float = float(os.getenv("APPWRITE_TIMEOUT", "15"))
+    APPWRITE_HTTP2: bool = os.getenv("APPWRITE_HTTP2", "false").lower() == "true"
+
+    # DNS cache for the Appwrite host (replaces the old IPv6-stripping getaddrinfo patch)
+    DNS_CACHE_TTL: float = float(os.getenv("DNS_CACHE_TTL", "60"))
+    DNS_STALE_TTL: float = float(os.getenv("DNS_STALE_TTL", "600"))   # serve old answers this long if lookups fail
+    DNS_PREFER_IPV4: bool = os.getenv("DNS_PREFER_IPV4", "true").lower() == "true"
+    DNS_HAPPY_EYEBALLS_DELAY: float = float(os.getenv("DNS_HAPPY_EYEBALLS_DELAY", "0.25"))
     
+    # User display-name cache (team enrichment)
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "300"))
+    USER_BATCH_DELAY_MS: float = float(os.getenv("USER_BATCH_DELAY_MS", "2"))
+    USER_BATCH_SIZE: int = int(os.getenv("USER_BATCH_SIZE", "100"))
+    USER_FETCH_CONCURRENCY: int = int(os.getenv("USER_FETCH_CONCURRENCY", "16"))
+
+    # Hackathon tag index (recommendations) - full rebuild interval in seconds
+    TAG_INDEX_MAX_AGE: float = float(os.getenv("TAG_INDEX_MAX_AGE", "300"))
+
+    # Team membership writes: per-team lock shards per worker
+    TEAM_LOCK_SHARDS: int = int(os.getenv("TEAM_LOCK_SHARDS", "64"))
+    # Join requests to one team within this window are written as one update
+    JOIN_COALESCE_MS: float = float(os.getenv("JOIN_COALESCE_MS", "5"))
+    JOIN_COALESCE_MAX_BATCH: int = int(os.getenv("JOIN_COALESCE_MAX_BATCH", "100"))
+
+    # Response compression (brotli if installed and accepted, else gzip); bodies under MIN_SIZE bytes go as-is
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Judging: bulk score ingestion
+    SCORE_BATCH_MAX_SIZE: int = int(os.getenv("SCORE_BATCH_MAX_SIZE", "100"))
+    SCORE_BATCH_CONCURRENCY: int = int(os.getenv("SCORE_BATCH_CONCURRENCY", "8"))
+    # Leaderboard - seconds before a board is re-read from Appwrite (picks up other workers' scores)
+    LEADERBOARD_MAX_AGE: float = float(os.getenv("LEADERBOARD_MAX_AGE", "60"))
+
+    # Organizer dashboard counters - seconds before a reconcile against Appwrite
+    STATS_MAX_STALENESS: float = float(os.getenv("STATS_MAX_STALENESS", "60"))
+
+    # Announcements push channel (SSE)
+    ANNOUNCEMENT_REPLAY_SIZE: int = int(os.getenv("ANNOUNCEMENT_REPLAY_SIZE", "100"))
+    ANNOUNCEMENT_QUEUE_SIZE: int = int(os.getenv("ANNOUNCEMENT_QUEUE_SIZE", "64"))
+    SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+    # AI summaries (Gemini) - on-disk cache location
+    AI_SUMMARY_CACHE_DIR: str = os.getenv("AI_SUMMARY_CACHE_DIR", ".cache/ai_summaries")
+
+    # Background summary jobs: backend is "gemini", "fake" (local, no API) or "off"
+    AI_SUMMARY_BACKEND: str = os.getenv("AI_SUMMARY_BACKEND", "gemini" if os.getenv("GEMINI_API_KEY") else "off")
+    AI_SUMMARY_ATTRIBUTE: str = os.getenv("AI_SUMMARY_ATTRIBUTE", "ai_summary")
+    AI_SUMMARY_WORKERS: int = int(os.getenv("AI_SUMMARY_WORKERS", "2"))
+    AI_SUMMARY_RATE: float = float(os.getenv("AI_SUMMARY_RATE", "1"))      # model calls per second
+    AI_SUMMARY_BURST: int = int(os.getenv("AI_SUMMARY_BURST", "5"))
+    AI_SUMMARY_MAX_RETRIES: int = int(os.getenv("AI_SUMMARY_MAX_RETRIES", "3"))
+
+    # Tracing: emit OpenTelemetry spans for Appwrite calls (needs opentelemetry-api installed)
+    OTEL_SPANS: bool = os.getenv("OTEL_SPANS", "false").lower() == "true"
+
+    # N+1 detector: per-request upstream call budget; mode is "warn" (log) or "off"
+    UPSTREAM_CHECK_MODE: str = os.getenv("UPSTREAM_CHECK_MODE", "warn" if os.getenv("ENVIRONMENT", "development") == "development" else "off")
+    UPSTREAM_CALL_BUDGET: int = int(os.getenv("UPSTREAM_CALL_BUDGET", "25"))
+    UPSTREAM_REPEAT_LIMIT: int = int(os.getenv("UPSTREAM_REPEAT_LIMIT", "10"))
+    UPSTREAM_FANOUT_LIMIT: int = int(os.getenv("UPSTREAM_FANOUT_LIMIT", "100"))   # users.get / cursor-scan pages per request
+
+    # Fake Appwrite (APPWRITE_BACKEND=fake): injected per-call latency and failure rate
+    FAKE_APPWRITE_LATENCY_MS: float = float(os.getenv("FAKE_APPWRITE_LATENCY_MS", "0"))
+    FAKE_APPWRITE_JITTER_MS: float = float(os.getenv("FAKE_APPWRITE_JITTER_MS", "0"))
+    FAKE_APPWRITE_ERROR_RATE: float = float(os.getenv("FAKE_APPWRITE_ERROR_RATE", "0"))
+
     # Collections
-    COLLECTION_HACKATHONS: str = os.getenv("COLLECTION_HACKATHONS")
-    COLLECTION_USERS: str = os.getenv("COLLECTION_USERS")
-    COLLECTION_TEAMS: str = os.getenv("COLLECTION_TEAMS")
-    COLLECTION_ANNOUNCEMENTS: str = os.getenv("COLLECTION_ANNOUNCEMENTS")
-    COLLECTION_SUBMISSIONS: str = os.getenv("COLLECTION_SUBMISSIONS")
-    COLLECTION_SCORES: str = os.getenv("COLLECTION_SCORES")
+    COLLECTION_HACKATHONS: str = os.getenv("COLLECTION_HACKATHONS", "hackathons")
+    COLLECTION_USERS: str = os.getenv("COLLECTION_USERS", "users")
+    COLLECTION_TEAMS: str = os.getenv("COLLECTION_TEAMS", "teams")
+    COLLECTION_ANNOUNCEMENTS: str = os.getenv("COLLECTION_ANNOUNCEMENTS", "announcements")
+    COLLECTION_SUBMISSIONS: str = os.getenv("COLLECTION_SUBMISSIONS", "submissions")
+    COLLECTION_SCORES: str = os.getenv("COLLECTION_SCORES", "scores")
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import asyncio
+import os
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict
+
+# Seconds. Coarse enough to stay cheap, fine enough for p50/p99 via histogram_quantile()
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+class MetricsRegistry:
+    """
+    Per-worker request metrics in Prometheus text format.
+    Everything is mutated from the event loop thread only, so plain dicts and
+    ints are enough - no locks on the request path. Each worker process
+    exposes its own numbers, labelled with its pid.
+    """
+
+    def __init__(self):
+        self.pid = str(os.getpid())
+        self.requests = defaultdict(int)       # (method, route, status) -> count
+        self.latency = defaultdict(Histogram)  # (method, route) -> Histogram
+        self.in_flight = defaultdict(int)      # method -> gauge (route is only known once routing ran)
+        self._gauges: Dict[str, Callable[[], dict]] = {}
+
+    def register_gauges(self, prefix: str, collect: Callable[[], dict]):
+        """Expose numeric values of `collect()` as `hackconnect_<prefix>_<key>` gauges."""
+        self._gauges[prefix] = collect
+
+    def track_start(self, method: str):
+        self.in_flight[method] += 1
+
+    def track_end(self, method: str, route: str, status: int, duration: float):
+        self.in_flight[method] -= 1
+        self.requests[(method, route, str(status))] += 1
+        self.latency[(method, route)].observe(duration)
+
+    def _executor_queue_depth(self) -> int:
+        # Default executor still serves asyncio.to_thread / getaddrinfo calls
+        try:
+            executor = asyncio.get_running_loop()._default_executor
+            return executor._work_queue.qsize() if executor is not None else 0
+        except (AttributeError, RuntimeError):
+            return 0
+
+    def render(self) -> str:
+        lines = []
+        worker = self.pid
+
+        lines.append("# HELP hackconnect_http_requests_total HTTP requests by route and status code")
+        lines.append("# TYPE hackconnect_http_requests_total counter")
+        for (method, route, status), value in sorted(self.requests.items()):
+            lines.append(f"hackconnect_http_requests_total{{{_labels(worker=worker, method=method, route=route, status=status)}}} {value}")
+
+        lines.append("# HELP hackconnect_http_request_duration_seconds Request latency by route")
+        lines.append("# TYPE hackconnect_http_request_duration_seconds histogram")
+        for (method, route), hist in sorted(self.latency.items()):
+            base = _labels(worker=worker, method=method, route=route)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), hist.counts):
+                cumulative += count
+                lines.append(f'hackconnect_http_request_duration_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"hackconnect_http_request_duration_seconds_sum{{{base}}} {hist.sum:.6f}")
+            lines.append(f"hackconnect_http_request_duration_seconds_count{{{base}}} {hist.count}")
+
+        lines.append("# HELP hackconnect_http_requests_in_flight Requests currently being handled")
+        lines.append("# TYPE hackconnect_http_requests_in_flight gauge")
+        for method, value in sorted(self.in_flight.items()):
+            lines.append(f"hackconnect_http_requests_in_flight{{{_labels(worker=worker, method=method)}}} {value}")
+
+        lines.append("# HELP hackconnect_executor_queue_depth Jobs waiting for a default-executor thread")
+        lines.append("# TYPE hackconnect_executor_queue_depth gauge")
+        lines.append(f"hackconnect_executor_queue_depth{{{_labels(worker=worker)}}} {self._executor_queue_depth()}")
+
+        for prefix, collect in self._gauges.items():
+            try:
+                values = collect()
+            except Exception:
+                continue
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    name = f"hackconnect_{prefix}_{key}"
+                    lines.append(f"# TYPE {name} gauge")
+                    lines.append(f"{name}{{{_labels(worker=worker)}}} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
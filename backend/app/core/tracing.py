@@ -0,0 +1,233 @@
+import functools
+import inspect
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+from app.core.config import settings
+
+# Optional OpenTelemetry spans: only if the API package is installed and enabled
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None
+
+logger = logging.getLogger("hackconnect.upstream")
+
+_tracer = otel_trace.get_tracer("hackconnect.appwrite") if (otel_trace and settings.OTEL_SPANS) else None
+
+
+class UpstreamCall:
+    __slots__ = ("service", "operation", "collection", "duration", "error", "paged")
+
+    def __init__(self, service: str, operation: str, collection: Optional[str], duration: float, error: bool,
+                 paged: bool = False):
+        self.service = service
+        self.operation = operation
+        self.collection = collection
+        self.duration = duration
+        self.error = error
+        self.paged = paged   # one page of a cursor scan (see paged_scan)
+
+
+class RequestTrace:
+    """Every upstream call made while handling one request."""
+
+    def __init__(self):
+        self.calls: List[UpstreamCall] = []
+
+    def record(self, call: UpstreamCall):
+        self.calls.append(call)
+
+    def grouped(self) -> Counter:
+        """Call counts keyed by (service, operation, collection)."""
+        return Counter((c.service, c.operation, c.collection) for c in self.calls)
+
+    @property
+    def upstream_duration(self) -> float:
+        return sum(c.duration for c in self.calls)
+
+    def server_timing(self, total_duration: float) -> str:
+        """
+        Server-Timing header value, e.g.
+        `app;dur=41.2, appwrite;dur=35.0;desc="12 calls"`.
+        appwrite dur is the summed call time (calls may overlap when run concurrently).
+        """
+        parts = [f"app;dur={total_duration * 1000:.1f}"]
+        if self.calls:
+            count = len(self.calls)
+            label = "call" if count == 1 else "calls"
+            parts.append(f'appwrite;dur={self.upstream_duration * 1000:.1f};desc="{count} {label}"')
+        return ", ".join(parts)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("upstream_trace", default=None)
+_paged: ContextVar[bool] = ContextVar("upstream_paged", default=False)
+
+
+def start_request_trace():
+    """Begin collecting calls for the current request; returns a token for end_request_trace()."""
+    return _current_trace.set(RequestTrace())
+
+
+def end_request_trace(token) -> Optional[RequestTrace]:
+    trace = _current_trace.get()
+    _current_trace.reset(token)
+    return trace
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def paged_scan():
+    """Mark upstream calls made inside as pages of one cursor scan (iter_pages)."""
+    token = _paged.set(True)
+    try:
+        yield
+    finally:
+        _paged.reset(token)
+
+
+def traced(service: str):
+    """
+    Instrument an async Appwrite service method: records operation name,
+    collection and duration into the current request's trace, and emits an
+    OpenTelemetry span when enabled.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        operation = fn.__name__
+        takes_collection = "collection_id" in signature.parameters
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            collection = None
+            if takes_collection:
+                collection = signature.bind_partial(*args, **kwargs).arguments.get("collection_id")
+
+            span = None
+            if _tracer is not None:
+                span = _tracer.start_span(
+                    f"{service}.{operation}",
+                    attributes={"db.system": "appwrite", "db.operation": operation, "db.collection": collection or ""}
+                )
+
+            start = time.perf_counter()
+            error = False
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                duration = time.perf_counter() - start
+                if span is not None:
+                    span.end()
+                trace = _current_trace.get()
+                if trace is not None:
+                    trace.record(UpstreamCall(service, operation, collection, duration, error, _paged.get()))
+
+        return wrapper
+    return decorator
+
+
+# --- N+1 DETECTION ---
+
+class UpstreamBudgetExceeded(AssertionError):
+    pass
+
+
+def _describe(key) -> str:
+    service, operation, collection = key
+    return f"{service}.{operation}({collection})" if collection else f"{service}.{operation}"
+
+
+# Operations Appwrite has no bulk form of. Resolving N distinct IDs takes N calls
+# whatever the code does, so a cold-cache users.get per team member is expected
+# (user_directory already dedupes, batches and caches them). Pages of a cursor
+# scan are the same kind of fan-out: their number is set by collection size, not
+# by code shape. Both are checked against their own `max_fanout` rather than the
+# call budget and repeat limit.
+FANOUT_OPERATIONS = {("users", "get")}
+
+
+def _is_fanout(call: UpstreamCall) -> bool:
+    return call.paged or (call.service, call.operation) in FANOUT_OPERATIONS
+
+
+def check_budget(trace: RequestTrace, max_calls: int = None, max_repeats: int = None, max_fanout: int = None) -> List[str]:
+    """
+    Problems with one request's upstream calls: more than `max_calls` in total,
+    or the same operation on the same collection more than `max_repeats` times
+    (the usual N+1 shape: one get_document per listed team).
+    FANOUT_OPERATIONS and scan pages only count against `max_fanout`.
+    """
+    max_calls = settings.UPSTREAM_CALL_BUDGET if max_calls is None else max_calls
+    max_repeats = settings.UPSTREAM_REPEAT_LIMIT if max_repeats is None else max_repeats
+    max_fanout = settings.UPSTREAM_FANOUT_LIMIT if max_fanout is None else max_fanout
+
+    problems = []
+    direct = Counter((c.service, c.operation, c.collection) for c in trace.calls if not _is_fanout(c))
+    fanout = Counter((c.service, c.operation, c.collection) for c in trace.calls if _is_fanout(c))
+    calls = sum(direct.values())
+    if calls > max_calls:
+        problems.append(f"{calls} upstream calls (budget {max_calls})")
+    for key, count in direct.most_common():
+        if count <= max_repeats:
+            break
+        problems.append(f"{_describe(key)} called {count} times (limit {max_repeats}) - likely N+1")
+    for key, count in fanout.most_common():
+        if count <= max_fanout:
+            break
+        problems.append(f"{_describe(key)} called {count} times (fan-out limit {max_fanout})")
+    return problems
+
+
+# Callbacks receiving (label, trace) for every finished request (used by assert_upstream_calls)
+_observers: List[Callable[[str, RequestTrace], None]] = []
+
+
+def report_request(label: str, trace: RequestTrace):
+    """Called by the request middleware once a request is done."""
+    for observer in list(_observers):
+        observer(label, trace)
+
+    if settings.UPSTREAM_CHECK_MODE == "warn":
+        problems = check_budget(trace)
+        if problems:
+            logger.warning("%s: %s", label, "; ".join(problems))
+
+
+@contextmanager
+def assert_upstream_calls(max_calls: int = None, max_repeats: int = None, max_fanout: int = None):
+    """
+    Test helper: fail if any request handled (or service code awaited) inside
+    the block exceeds the upstream call budget.
+
+        with assert_upstream_calls(max_repeats=1):
+            client.get("/api/teams/")
+
+    Yields the list of (label, trace) pairs seen, for finer-grained assertions.
+    """
+    seen = []
+    observer = lambda label, trace: seen.append((label, trace))
+    _observers.append(observer)
+    token = start_request_trace()
+    try:
+        yield seen
+    finally:
+        _observers.remove(observer)
+        block_trace = end_request_trace(token)
+
+    if block_trace.calls:
+        seen.append(("<block>", block_trace))
+
+    failures = []
+    for label, trace in seen:
+        failures.extend(f"{label}: {p}" for p in check_budget(trace, max_calls, max_repeats, max_fanout))
+    if failures:
+        raise UpstreamBudgetExceeded("\n".join(failures))
@@ -1,44 +1,101 @@
 from fastapi import FastAPI, Request
-import socket
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.tracing import start_request_trace, end_request_trace, report_request
 
-from app.services.appwrite import get_db_service # <--- NEW IMPORT
+from app.services.appwrite import get_db_service, close_appwrite_client
+from app.services.summary_queue import summary_queue
+from app.services.user_directory import user_name_cache, user_loader
+from app.services.tag_index import tag_index
+from app.services.announcements import announcement_hub
+from app.services.dns_cache import dns_cache
 
 import time
 from app.api.routes import hackathons, auth, users, teams, submissions, organizer, judging
 
-# --- 🚀 FIX: FORCE IPV4 (Paste this at the top) ---
-# This forces Python to ignore IPv6, fixing the 30s timeout on Cloud.
-def force_ipv4():
-    old_getaddrinfo = socket.getaddrinfo
-    def new_getaddrinfo(*args, **kwargs):
-        responses = old_getaddrinfo(*args, **kwargs)
-        return [r for r in responses if r[0] == socket.AF_INET]
-    socket.getaddrinfo = new_getaddrinfo
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    summary_queue.start()
+    yield
+    await summary_queue.stop()
+    # Release pooled keep-alive connections to Appwrite
+    await close_appwrite_client()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+# --- 1. PERFORMANCE TIMER + METRICS ---
+# id(route) -> full template incl. router prefix (filled by _include_router below)
+_route_paths = {}
+
+
+def _route_template(request: Request) -> str:
+    """
+    Route template (e.g. /api/teams/{team_id}) so metric labels stay low-cardinality.
+    Routing leaves the matched route in the scope. Depending on the FastAPI version
+    that is the router's own route (path without the include prefix, looked up in
+    _route_paths) or a prefixed copy whose `path` is already the full template.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    return _route_paths.get(id(route)) or getattr(route, "path", None) or "unmatched"
 
-force_ipv4() # <--- Run it immediately
 
-app = FastAPI(title=settings.PROJECT_NAME)
-# --- 1. PERFORMANCE TIMER (Add This Block) ---
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    
-    # Run the request
-    response = await call_next(request)
+    start_time = time.perf_counter()
+    method = request.method
+    metrics.track_start(method)
+    trace_token = start_request_trace()
     
-    # Calculate time
-    process_time = time.time() - start_time
+    status = 500
+    try:
+        # Run the request
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        # Calculate time
+        process_time = time.perf_counter() - start_time
+        route = _route_template(request)
+        metrics.track_end(method, route, status, process_time)
+        trace = end_request_trace(trace_token)
+        report_request(f"{method} {route}", trace)
     
     # Add it to the response headers (so Frontend can see it)
     response.headers["X-Process-Time"] = str(process_time)
-    
-    # Print to your console
-    print(f"⏱️ API LOG: {request.method} {request.url.path} completed in {process_time:.4f} seconds")
+    # Our time vs. Appwrite round trips, visible in browser devtools
+    response.headers["Server-Timing"] = trace.server_timing(process_time)
     
     return response
 
+
+# Cache / queue / hub internals exposed as gauges on /metrics
+metrics.register_gauges("user_cache", user_name_cache.stats)
+metrics.register_gauges("user_loader", user_loader.stats)
+metrics.register_gauges("tag_index", tag_index.stats)
+metrics.register_gauges("summary_queue", summary_queue.stats)
+metrics.register_gauges("announcements", announcement_hub.stats)
+metrics.register_gauges("dns", dns_cache.stats)
+metrics.register_gauges("team_locks", teams.team_locks.stats)
+metrics.register_gauges("join_coalescer", teams.join_coalescer.stats)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint (per worker process)."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Compress large JSON bodies (NDJSON / SSE streams pass through untouched)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -49,11 +106,11 @@ app.add_middleware(
 )
 
 @app.get("/")
-def read_root():
+async def read_root():
     status = "Checking..."
     try:
         # CORRECT METHOD: list_documents (Plural)
-        get_db_service().list_documents(
+        await get_db_service().list_documents(
             database_id=settings.APPWRITE_DATABASE_ID, 
             collection_id=settings.COLLECTION_HACKATHONS
         )
@@ -67,11 +124,17 @@ def read_root():
     }
 
 # Register Routes
-app.include_router(hackathons.router, prefix="/api/hackathons", tags=["Hackathons"])
-app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
-app.include_router(teams.router, prefix="/api/teams", tags=["Teams"])
-app.include_router(users.router, prefix="/api/users", tags=["Users"])
-
-app.include_router(submissions.router, prefix="/api/submissions", tags=["Submissions"])
-app.include_router(organizer.router, prefix="/api/organizer", tags=["Organizer"])
-app.include_router(judging.router, prefix="/api/judging", tags=["Judging"])
\ No newline at end of file
+def _include_router(router, prefix: str, tags: list):
+    app.include_router(router, prefix=prefix, tags=tags)
+    for route in router.routes:
+        _route_paths[id(route)] = prefix + route.path
+
+
+_include_router(hackathons.router, prefix="/api/hackathons", tags=["Hackathons"])
+_include_router(auth.router, prefix="/api/auth", tags=["Auth"])
+_include_router(teams.router, prefix="/api/teams", tags=["Teams"])
+_include_router(users.router, prefix="/api/users", tags=["Users"])
+
+_include_router(submissions.router, prefix="/api/submissions", tags=["Submissions"])
+_include_router(organizer.router, prefix="/api/organizer", tags=["Organizer"])
+_include_router(judging.router, prefix="/api/judging", tags=["Judging"])
\ No newline at end of file
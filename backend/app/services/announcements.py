@@ -0,0 +1,119 @@
+import asyncio
+import itertools
+import json
+from collections import deque
+from typing import AsyncIterator, Dict, Optional, Set
+from app.core.config import settings
+
+
+class Subscription:
+    """One connected client. Its queue is bounded so a slow reader can't grow memory."""
+
+    def __init__(self, hackathon_id: str, maxsize: int):
+        self.hackathon_id = hackathon_id
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+
+
+class _Channel:
+    def __init__(self, replay_size: int):
+        self.buffer = deque(maxlen=replay_size)   # recent (event_id, payload)
+        self.subscribers: Set[Subscription] = set()
+
+
+class AnnouncementHub:
+    """
+    In-process pub/sub for announcements, keyed by hackathon_id.
+
+    - Every event gets a monotonically increasing id; the last `replay_size`
+      events per hackathon are kept so reconnecting clients can resume from
+      their Last-Event-ID.
+    - Backpressure: if a subscriber's queue is full it is marked lagged and
+      dropped after draining what it has; the client reconnects and replays.
+    Event ids are per process - behind several workers a client replays from
+    the buffer of whichever worker it reconnects to.
+    """
+
+    def __init__(self, replay_size: int = 100, queue_size: int = 64):
+        self.replay_size = replay_size
+        self.queue_size = queue_size
+        self._channels: Dict[str, _Channel] = {}
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    def _channel(self, hackathon_id: str) -> _Channel:
+        channel = self._channels.get(hackathon_id)
+        if channel is None:
+            channel = self._channels[hackathon_id] = _Channel(self.replay_size)
+        return channel
+
+    def publish(self, hackathon_id: str, payload: dict) -> int:
+        event_id = next(self._ids)
+        event = (event_id, payload)
+        channel = self._channel(hackathon_id)
+        channel.buffer.append(event)
+        self.published += 1
+
+        for sub in list(channel.subscribers):
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                sub.lagged = True
+                channel.subscribers.discard(sub)
+                self.dropped_subscribers += 1
+        return event_id
+
+    def subscribe(self, hackathon_id: str, last_event_id: Optional[int] = None) -> Subscription:
+        channel = self._channel(hackathon_id)
+        sub = Subscription(hackathon_id, self.queue_size)
+        if last_event_id is not None:
+            missed = [e for e in channel.buffer if e[0] > last_event_id]
+            # Replay the oldest ones that fit. If some don't, the subscription is
+            # lagged from the start: it is not attached to live events (that would
+            # leave a gap), it drains the replay and the client resumes from its last id.
+            for event in missed[:self.queue_size]:
+                sub.queue.put_nowait(event)
+            if len(missed) > self.queue_size:
+                sub.lagged = True
+                return sub
+        channel.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        channel = self._channels.get(sub.hackathon_id)
+        if channel is not None:
+            channel.subscribers.discard(sub)
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+            "published": self.published,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+
+async def sse_events(hub: AnnouncementHub, sub: Subscription, heartbeat: float, is_disconnected) -> AsyncIterator[str]:
+    """Format a subscription as a text/event-stream, with keep-alive comments."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            if sub.lagged and sub.queue.empty():
+                return  # dropped for being slow; client reconnects with Last-Event-ID
+            try:
+                event_id, payload = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event_id}\nevent: announcement\ndata: {json.dumps(payload, default=str)}\n\n"
+    finally:
+        hub.unsubscribe(sub)
+
+
+announcement_hub = AnnouncementHub(
+    replay_size=settings.ANNOUNCEMENT_REPLAY_SIZE,
+    queue_size=settings.ANNOUNCEMENT_QUEUE_SIZE,
+)
@@ -1,28 +1,206 @@
-from appwrite.client import Client
-from appwrite.services.databases import Databases
-from appwrite.services.users import Users
+from appwrite.exception import AppwriteException
 from app.core.config import settings
+from app.core.tracing import traced
 from functools import lru_cache
 
+
+def _flatten(data, prefix=""):
+    """Flatten nested params into Appwrite's `queries[0]=...` query-string form."""
+    output = {}
+    items = data.items() if isinstance(data, dict) else enumerate(data)
+    for key, value in items:
+        final_key = f"{prefix}[{key}]" if prefix else str(key)
+        if isinstance(value, (list, dict)):
+            output.update(_flatten(value, final_key))
+        elif isinstance(value, bool):
+            output[final_key] = "true" if value else "false"
+        else:
+            output[final_key] = value
+    return output
+
+
+class AsyncAppwriteClient:
+    """
+    Async-native Appwrite REST client.
+    One pooled httpx.AsyncClient is shared by every service, so upstream calls
+    reuse keep-alive (or HTTP/2) connections instead of burning a worker thread each.
+    """
+
+    def __init__(self, endpoint: str, project_id: str, api_key: str):
+        # Imported on first use (first Appwrite call), not at app import: keeps
+        # httpx and its TLS setup out of serverless cold starts that never hit Appwrite
+        import httpcore
+        import httpx
+        from app.services.dns_cache import CachedDNSBackend, dns_cache
+        from app.services.http_transport import PoolTransport, proxy_for
+
+        # Our own pool, so new connections resolve through the DNS cache and race
+        # IPv4/IPv6. HTTP(S)_PROXY / NO_PROXY are honoured here, since httpx skips
+        # environment proxies when a transport is passed in.
+        proxy_url = proxy_for(endpoint)
+        pool = httpcore.AsyncConnectionPool(
+            max_connections=settings.APPWRITE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.APPWRITE_MAX_KEEPALIVE,
+            keepalive_expiry=settings.APPWRITE_KEEPALIVE_EXPIRY,
+            http2=settings.APPWRITE_HTTP2,
+            proxy=httpcore.Proxy(proxy_url) if proxy_url else None,
+            network_backend=CachedDNSBackend(dns_cache, settings.DNS_HAPPY_EYEBALLS_DELAY),
+            # ⚡ OPTIMIZATION TIP:
+            # For a self-hosted Appwrite with a self-signed cert, pass an ssl_context here.
+        )
+        transport = PoolTransport(pool)
+
+        self._transport_error = httpx.HTTPError
+        self._http = httpx.AsyncClient(
+            base_url=endpoint,
+            headers={
+                "x-appwrite-project": project_id,
+                "x-appwrite-key": api_key,
+                "user-agent": "HackConnectBackend (httpx)",
+            },
+            transport=transport,
+            timeout=settings.APPWRITE_TIMEOUT,
+        )
+
+    async def call(self, method: str, path: str, params: dict = None):
+        try:
+            if method == "get":
+                response = await self._http.get(path, params=_flatten(params or {}))
+            elif params is None:
+                response = await self._http.request(method.upper(), path)
+            else:
+                response = await self._http.request(method.upper(), path, json=params)
+        except self._transport_error as e:
+            raise AppwriteException(str(e))
+
+        is_json = response.headers.get("content-type", "").startswith("application/json")
+        if response.is_error:
+            if is_json:
+                body = response.json()
+                raise AppwriteException(body.get("message"), response.status_code, body.get("type"), response.text)
+            raise AppwriteException(response.text, response.status_code, None, response.text)
+
+        if is_json:
+            return response.json()
+        return {}
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+class AsyncDatabases:
+    """Async equivalent of `appwrite.services.databases.Databases` (document subset)."""
+
+    def __init__(self, client: AsyncAppwriteClient):
+        self.client = client
+
+    @staticmethod
+    def _path(database_id: str, collection_id: str, document_id: str = None) -> str:
+        path = f"/databases/{database_id}/collections/{collection_id}/documents"
+        return f"{path}/{document_id}" if document_id else path
+
+    @traced("databases")
+    async def list_documents(self, database_id: str, collection_id: str, queries: list = None):
+        params = {"queries": queries} if queries else None
+        return await self.client.call("get", self._path(database_id, collection_id), params)
+
+    @traced("databases")
+    async def get_document(self, database_id: str, collection_id: str, document_id: str, queries: list = None):
+        params = {"queries": queries} if queries else None
+        return await self.client.call("get", self._path(database_id, collection_id, document_id), params)
+
+    @traced("databases")
+    async def create_document(self, database_id: str, collection_id: str, document_id: str, data: dict, permissions: list = None):
+        params = {"documentId": document_id, "data": data}
+        if permissions is not None:
+            params["permissions"] = permissions
+        return await self.client.call("post", self._path(database_id, collection_id), params)
+
+    @traced("databases")
+    async def update_document(self, database_id: str, collection_id: str, document_id: str, data: dict = None, permissions: list = None):
+        params = {}
+        if data is not None:
+            params["data"] = data
+        if permissions is not None:
+            params["permissions"] = permissions
+        return await self.client.call("patch", self._path(database_id, collection_id, document_id), params)
+
+    @traced("databases")
+    async def delete_document(self, database_id: str, collection_id: str, document_id: str):
+        return await self.client.call("delete", self._path(database_id, collection_id, document_id))
+
+
+class AsyncUsers:
+    """Async equivalent of `appwrite.services.users.Users` (the calls the app makes)."""
+
+    def __init__(self, client: AsyncAppwriteClient):
+        self.client = client
+
+    @traced("users")
+    async def get(self, user_id: str):
+        return await self.client.call("get", f"/users/{user_id}")
+
+    @traced("users")
+    async def create(self, user_id: str, email: str = None, phone: str = None, password: str = None, name: str = None):
+        params = {"userId": user_id, "email": email, "phone": phone, "password": password, "name": name}
+        return await self.client.call("post", "/users", {k: v for k, v in params.items() if v is not None})
+
+    @traced("users")
+    async def update_name(self, user_id: str, name: str):
+        return await self.client.call("patch", f"/users/{user_id}/name", {"name": name})
+
+    @traced("users")
+    async def update_password(self, user_id: str, password: str):
+        return await self.client.call("patch", f"/users/{user_id}/password", {"password": password})
+
+
 @lru_cache()
 def get_appwrite_client():
-    client = Client()
-    client.set_endpoint(settings.APPWRITE_ENDPOINT)
-    client.set_project(settings.APPWRITE_PROJECT_ID)
-    client.set_key(settings.APPWRITE_API_KEY)
-    
-    # ⚡ OPTIMIZATION TIP: 
-    # If using Cloud, try setting this to True temporarily to see if it speeds up the handshake.
-    # client.set_self_signed(True) 
-    
-    return client
+    return AsyncAppwriteClient(
+        settings.APPWRITE_ENDPOINT,
+        settings.APPWRITE_PROJECT_ID,
+        settings.APPWRITE_API_KEY,
+    )
+
+# Service objects swapped in by use_services() (e.g. the in-memory fake)
+_overrides = {}
+
+
+def use_services(databases=None, users=None):
+    """
+    Serve `databases`/`users` from get_db_service()/get_users_service() instead
+    of the real Appwrite services. Pass None to restore the default.
+    """
+    _overrides["databases"] = databases
+    _overrides["users"] = users
+    get_db_service.cache_clear()
+    get_users_service.cache_clear()
+
 
 @lru_cache()
 def get_db_service():
+    if _overrides.get("databases") is not None:
+        return _overrides["databases"]
+    if settings.APPWRITE_BACKEND == "fake":
+        from app.services.fake_appwrite import get_fake_appwrite
+        return get_fake_appwrite().databases
     client = get_appwrite_client()
-    return Databases(client)
+    return AsyncDatabases(client)
 
 @lru_cache()
 def get_users_service():
+    if _overrides.get("users") is not None:
+        return _overrides["users"]
+    if settings.APPWRITE_BACKEND == "fake":
+        from app.services.fake_appwrite import get_fake_appwrite
+        return get_fake_appwrite().users_service
     client = get_appwrite_client()
-    return Users(client)
\ No newline at end of file
+    return AsyncUsers(client)
+
+async def close_appwrite_client():
+    """Close pooled connections (called on app shutdown)."""
+    if get_appwrite_client.cache_info().currsize:
+        await get_appwrite_client().aclose()
+    get_appwrite_client.cache_clear()
+    get_db_service.cache_clear()
+    get_users_service.cache_clear()
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+from appwrite.query import Query
+from app.core.config import settings
+from app.services.appwrite import get_db_service
+from app.utils.locks import KeyedLocks
+from app.utils.pagination import iter_documents
+
+
+class HackathonCounters:
+    """Materialized dashboard numbers for one hackathon."""
+
+    __slots__ = ("teams_formed", "submissions", "member_teams", "reconciled_at")
+
+    def __init__(self):
+        self.teams_formed = 0
+        self.submissions = 0
+        self.member_teams = Counter()  # user_id -> number of this hackathon's teams they're on
+        self.reconciled_at = 0.0
+
+    def add_members(self, user_ids: Iterable[str]):
+        self.member_teams.update(user_ids)
+
+    def remove_members(self, user_ids: Iterable[str]):
+        for uid in user_ids:
+            self.member_teams[uid] -= 1
+            if self.member_teams[uid] <= 0:
+                del self.member_teams[uid]
+
+
+class CounterRegistry:
+    """
+    Per-hackathon counters kept current by the team, submission and registration
+    write paths and served from memory. Counters older than `max_staleness`
+    seconds are reconciled against Appwrite on the next read (one reconcile per
+    hackathon at a time), which also corrects drift from writes on other workers.
+    Writes that land while a reconcile runs are replayed onto its result; one
+    whose Appwrite write the reconcile already saw is counted twice until the
+    next reconcile - over-counting briefly beats silently dropping it.
+
+    HackConnect has no per-hackathon registration, so the user count is
+    platform-wide (the whole users collection) and is reported as such:
+    `participants` is the per-hackathon number (distinct users on its teams),
+    and `platform_users_without_team` is every platform user not on one of
+    this hackathon's teams - an upper bound on who could still join, not a
+    count of this event's registrants.
+    """
+
+    def __init__(self, max_staleness: float = 60.0):
+        self.max_staleness = max_staleness
+        self._platform_users: Optional[int] = None
+        self._registrations = 0   # user_registered() calls so far (reconciles diff against it)
+        self._hackathons: Dict[str, HackathonCounters] = {}
+        self._pending: Dict[str, List[Callable[[HackathonCounters], None]]] = {}   # deltas during a reconcile
+        self._locks = KeyedLocks()
+
+    # --- Write paths (no-ops until a hackathon's counters are materialized) ---
+    def _apply(self, hackathon_id: str, delta: Callable[[HackathonCounters], None]):
+        c = self._hackathons.get(hackathon_id)
+        if c is not None:
+            delta(c)
+        pending = self._pending.get(hackathon_id)
+        if pending is not None:
+            pending.append(delta)
+
+    def user_registered(self):
+        self._registrations += 1
+        if self._platform_users is not None:
+            self._platform_users += 1
+
+    def team_created(self, team: dict):
+        members = list(team.get('members', []))
+
+        def delta(c: HackathonCounters):
+            c.teams_formed += 1
+            c.add_members(members)
+        self._apply(team.get('hackathon_id'), delta)
+
+    def team_deleted(self, team: dict):
+        members = list(team.get('members', []))
+
+        def delta(c: HackathonCounters):
+            c.teams_formed = max(c.teams_formed - 1, 0)
+            c.remove_members(members)
+        self._apply(team.get('hackathon_id'), delta)
+
+    def member_added(self, hackathon_id: str, user_id: str):
+        self._apply(hackathon_id, lambda c: c.add_members([user_id]))
+
+    def member_removed(self, hackathon_id: str, user_id: str):
+        self._apply(hackathon_id, lambda c: c.remove_members([user_id]))
+
+    def submission_created(self, hackathon_id: str):
+        def delta(c: HackathonCounters):
+            c.submissions += 1
+        self._apply(hackathon_id, delta)
+
+    # --- Reads ---
+    def _is_stale(self, c: Optional[HackathonCounters]) -> bool:
+        return c is None or time.monotonic() - c.reconciled_at > self.max_staleness
+
+    async def _reconcile(self, hackathon_id: str) -> HackathonCounters:
+        self._pending[hackathon_id] = []
+        registrations_before = self._registrations
+        try:
+            return await self._count(hackathon_id, registrations_before)
+        finally:
+            del self._pending[hackathon_id]
+
+    async def _count(self, hackathon_id: str, registrations_before: int) -> HackathonCounters:
+        db = get_db_service()
+        users, submissions = await asyncio.gather(
+            db.list_documents(
+                database_id=settings.APPWRITE_DATABASE_ID,
+                collection_id=settings.COLLECTION_USERS,
+                queries=[Query.limit(1)]
+            ),
+            db.list_documents(
+                database_id=settings.APPWRITE_DATABASE_ID,
+                collection_id=settings.COLLECTION_SUBMISSIONS,
+                queries=[Query.equal('hackathon_id', hackathon_id), Query.limit(1)]
+            ),
+        )
+
+        c = HackathonCounters()
+        async for team in iter_documents(
+            settings.COLLECTION_TEAMS,
+            [Query.equal('hackathon_id', hackathon_id), Query.select(['$id', 'members'])]
+        ):
+            c.teams_formed += 1
+            c.add_members(team.get('members', []))
+        c.submissions = submissions['total']
+        c.reconciled_at = time.monotonic()
+
+        # Replay writes made while we were counting
+        for delta in self._pending[hackathon_id]:
+            delta(c)
+        self._platform_users = users['total'] + (self._registrations - registrations_before)
+        self._hackathons[hackathon_id] = c
+        return c
+
+    async def stats(self, hackathon_id: str) -> dict:
+        c = self._hackathons.get(hackathon_id)
+        if self._is_stale(c):
+            async with self._locks.hold(hackathon_id):
+                c = self._hackathons.get(hackathon_id)
+                if self._is_stale(c):
+                    try:
+                        c = await self._reconcile(hackathon_id)
+                    except Exception:
+                        # Appwrite hiccup: serve the last known numbers if we have them
+                        if c is None:
+                            raise
+
+        platform_users = self._platform_users or 0
+        return {
+            "platform_users": platform_users,
+            "participants": len(c.member_teams),
+            "teams_formed": c.teams_formed,
+            "submissions_received": c.submissions,
+            "platform_users_without_team": max(platform_users - len(c.member_teams), 0),
+            "as_of_seconds": round(time.monotonic() - c.reconciled_at, 1),
+        }
+
+
+hackathon_counters = CounterRegistry(max_staleness=settings.STATS_MAX_STALENESS)
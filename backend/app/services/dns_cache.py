@@ -0,0 +1,182 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from typing import Dict, List, Tuple
+from app.core.config import settings
+
+
+def order_addresses(infos, prefer_ipv4: bool = True) -> List[str]:
+    """
+    Unique IPs from getaddrinfo results, interleaved by family with the
+    preferred family first (v4, v6, v4, v6 ...) as Happy Eyeballs (RFC 8305) suggests.
+    """
+    v4, v6 = [], []
+    for family, _, _, _, sockaddr in infos:
+        ip = sockaddr[0]
+        bucket = v4 if family == socket.AF_INET else v6
+        if ip not in bucket:
+            bucket.append(ip)
+
+    first, second = (v4, v6) if prefer_ipv4 else (v6, v4)
+    ordered = []
+    for i in range(max(len(first), len(second))):
+        ordered.extend(group[i] for group in (first, second) if i < len(group))
+    return ordered
+
+
+class DNSCache:
+    """
+    Host -> resolved addresses, kept for `ttl` seconds.
+    Resolution runs in the loop's executor (getaddrinfo blocks), concurrent
+    lookups for the same host share one call, and if a refresh fails the last
+    known addresses are served for up to `stale_ttl` more seconds.
+    (getaddrinfo does not expose record TTLs, so the TTL is configured.)
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, prefer_ipv4: bool = True):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.prefer_ipv4 = prefer_ipv4
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.errors = 0
+
+    async def _lookup(self, key: Tuple[str, int]) -> List[str]:
+        host, port = key
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = order_addresses(infos, self.prefer_ipv4)
+            if not addresses:
+                raise socket.gaierror(f"no addresses for {host}")
+        except OSError:
+            self.errors += 1
+            entry = self._entries.get(key)
+            if entry and time.monotonic() < entry[0] + self.stale_ttl:
+                self.stale_served += 1
+                return entry[1]
+            raise
+        self._entries[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses to try, in connection order."""
+        try:
+            ipaddress.ip_address(host)
+            return [host]  # already a literal
+        except ValueError:
+            pass
+
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry and time.monotonic() < entry[0]:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield: a cancelled caller must not cancel the shared lookup
+        return await asyncio.shield(task)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CachedDNSBackend:
+    """
+    httpcore network backend that resolves through a DNSCache and connects
+    Happy-Eyeballs style: start with the first address, and if it has not
+    connected (or has failed) within `delay`, race the next one too.
+    The first connection to succeed wins; the rest are cancelled or closed.
+    """
+
+    def __init__(self, resolver: DNSCache, delay: float):
+        import httpcore
+
+        self._httpcore = httpcore
+        self._backend = httpcore.AnyIOBackend()
+        self.resolver = resolver
+        self.delay = delay
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await asyncio.wait_for(self.resolver.resolve(host, port), timeout)
+        except asyncio.TimeoutError:
+            raise self._httpcore.ConnectTimeout(f"DNS lookup for {host} timed out")
+        except OSError as e:
+            raise self._httpcore.ConnectError(str(e))
+
+        attempts = set()
+        error = None
+        try:
+            for ip in addresses:
+                attempts.add(asyncio.ensure_future(
+                    self._backend.connect_tcp(ip, port, timeout, local_address, socket_options)
+                ))
+                stream, error = await self._race(attempts, self.delay, error)
+                if stream is not None:
+                    return stream
+
+            while attempts:
+                stream, error = await self._race(attempts, None, error)
+                if stream is not None:
+                    return stream
+        finally:
+            for task in attempts:
+                task.cancel()
+                task.add_done_callback(_close_if_connected)
+
+        raise error or self._httpcore.ConnectError(f"could not connect to {host}:{port}")
+
+    async def _race(self, attempts: set, delay, error):
+        """Wait up to `delay` for an attempt to finish; returns (stream or None, last error)."""
+        done, _ = await asyncio.wait(attempts, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        stream = None
+        for task in done:
+            attempts.discard(task)
+            if task.exception() is not None:
+                error = task.exception()
+            elif stream is None:
+                stream = task.result()
+            else:
+                task.add_done_callback(_close_if_connected)  # lost a tie
+        return stream, error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+def _close_if_connected(task: asyncio.Future):
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(task.result().aclose())
+
+
+dns_cache = DNSCache(
+    ttl=settings.DNS_CACHE_TTL,
+    stale_ttl=settings.DNS_STALE_TTL,
+    prefer_ipv4=settings.DNS_PREFER_IPV4,
+)
@@ -0,0 +1,331 @@
+import asyncio
+import json
+import random
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List
+from appwrite.exception import AppwriteException
+from app.core.config import settings
+from app.core.tracing import traced
+
+# Appwrite's default page size when a list call has no Query.limit
+DEFAULT_LIMIT = 25
+
+# Returned even when a Query.select omits them
+ALWAYS_SELECTED = ("$id", "$collectionId", "$databaseId")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _copy(doc: dict) -> dict:
+    """What the REST API would hand back: a fresh dict, not our stored one."""
+    return {k: list(v) if isinstance(v, list) else v for k, v in doc.items()}
+
+
+def _not_found(kind: str):
+    return AppwriteException(f"{kind.capitalize()} with the requested ID could not be found.", 404, f"{kind}_not_found")
+
+
+def _matches_equal(value, wanted: list) -> bool:
+    # On array attributes Appwrite matches if any element equals any wanted value
+    if isinstance(value, list):
+        return any(v in wanted for v in value)
+    return value in wanted
+
+
+def _compare(value, other, op) -> bool:
+    try:
+        return value is not None and op(value, other)
+    except TypeError:
+        return False
+
+
+FILTERS = {
+    "equal": lambda v, vals: _matches_equal(v, vals),
+    "notEqual": lambda v, vals: not _matches_equal(v, vals),
+    "contains": lambda v, vals: (
+        any(x in v for x in vals) if isinstance(v, list)
+        else isinstance(v, str) and any(str(x) in v for x in vals)
+    ),
+    "search": lambda v, vals: isinstance(v, str) and vals[0].casefold() in v.casefold(),
+    "greaterThan": lambda v, vals: _compare(v, vals[0], lambda a, b: a > b),
+    "greaterThanEqual": lambda v, vals: _compare(v, vals[0], lambda a, b: a >= b),
+    "lessThan": lambda v, vals: _compare(v, vals[0], lambda a, b: a < b),
+    "lessThanEqual": lambda v, vals: _compare(v, vals[0], lambda a, b: a <= b),
+    "isNull": lambda v, vals: v is None,
+    "isNotNull": lambda v, vals: v is not None,
+}
+
+
+# Atomic update operators (appwrite.operator.Operator, Appwrite 1.8+): value -> new value
+OPERATORS = {
+    "arrayAppend": lambda cur, vals: list(cur or []) + vals,
+    "arrayPrepend": lambda cur, vals: vals + list(cur or []),
+    "arrayRemove": lambda cur, vals: [v for v in cur or [] if v != vals[0]],
+    "arrayDiff": lambda cur, vals: [v for v in cur or [] if v not in vals],
+    "arrayIntersect": lambda cur, vals: [v for v in cur or [] if v in vals],
+    "arrayUnique": lambda cur, vals: list(dict.fromkeys(cur or [])),
+    "increment": lambda cur, vals: min([(cur or 0) + vals[0], *vals[1:]]),
+    "decrement": lambda cur, vals: max([(cur or 0) - vals[0], *vals[1:]]),
+}
+
+
+def _apply_update(current, value):
+    """A plain value replaces the attribute; an Operator string is applied to it."""
+    if not (isinstance(value, str) and value.startswith('{"method"')):
+        return value
+    op = json.loads(value)
+    apply = OPERATORS.get(op["method"])
+    if apply is None:
+        raise AppwriteException(f"Invalid operator: {op['method']} is not supported by the fake", 400, "general_argument_invalid")
+    return apply(current, op.get("values") or [])
+
+
+def apply_queries(docs: List[dict], queries: list = None):
+    """
+    Evaluate Appwrite query strings (as built by appwrite.query.Query) over
+    `docs` in insertion order. Returns (total matching the filters, page).
+    """
+    parsed = [json.loads(q) if isinstance(q, str) else q for q in (queries or [])]
+
+    selected, order, limit, offset, cursor = None, [], DEFAULT_LIMIT, 0, None
+    for q in parsed:
+        method = q["method"]
+        if method in FILTERS:
+            attribute, values = q.get("attribute"), q.get("values") or []
+            docs = [d for d in docs if FILTERS[method](d.get(attribute), values)]
+        elif method == "select":
+            selected = q["values"]
+        elif method in ("orderAsc", "orderDesc"):
+            order.append((q["attribute"], method == "orderDesc"))
+        elif method == "limit":
+            limit = q["values"][0]
+        elif method == "offset":
+            offset = q["values"][0]
+        elif method == "cursorAfter":
+            cursor = q["values"][0]
+        else:
+            raise AppwriteException(f"Invalid query: {method} is not supported by the fake", 400, "general_query_invalid")
+
+    total = len(docs)
+
+    # Stable sorts, last key first, so the first order query is the primary key
+    for attribute, descending in reversed(order):
+        present = [d for d in docs if d.get(attribute) is not None]
+        missing = [d for d in docs if d.get(attribute) is None]
+        docs = sorted(present, key=lambda d: d[attribute], reverse=descending) + missing
+
+    if cursor is not None:
+        ids = [d["$id"] for d in docs]
+        if cursor not in ids:
+            raise AppwriteException(f"Document '{cursor}' for the 'cursorAfter' value not found.", 400, "general_cursor_not_found")
+        docs = docs[ids.index(cursor) + 1:]
+
+    page = docs[offset:offset + limit]
+    if selected is not None:
+        keep = set(selected).union(ALWAYS_SELECTED)
+        return total, [{k: v for k, v in d.items() if k in keep} for d in page]
+    return total, [_copy(d) for d in page]
+
+
+class FakeAppwrite:
+    """
+    In-process stand-in for an Appwrite project: collections of documents and
+    auth users, held in dicts. Every call waits `latency` (+ up to `jitter`)
+    seconds and fails with probability `error_rate`, so routers can be
+    benchmarked and load-tested offline under realistic upstream behaviour.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.collections: Dict[str, Dict[str, dict]] = {}
+        self.users: Dict[str, dict] = {}
+        self.calls = 0
+        self.injected_errors = 0
+        self.databases = FakeDatabases(self)
+        self.users_service = FakeUsers(self)
+
+    async def simulate(self):
+        self.calls += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.injected_errors += 1
+            raise AppwriteException("Injected failure (fake Appwrite)", 503, "general_service_disabled")
+
+    def collection(self, collection_id: str) -> Dict[str, dict]:
+        return self.collections.setdefault(collection_id, {})
+
+    def seed(self, collection_id: str, docs: List[dict]):
+        """Load fixtures directly (no latency, no faults). Docs need a `$id`."""
+        col = self.collection(collection_id)
+        now = _now()
+        for doc in docs:
+            col[doc["$id"]] = {"$createdAt": now, "$updatedAt": now, "$permissions": [], **doc,
+                               "$collectionId": collection_id, "$databaseId": settings.APPWRITE_DATABASE_ID}
+
+    def seed_user(self, user_id: str, email: str, name: str, password: str = "password"):
+        now = _now()
+        self.users[user_id] = {"$id": user_id, "email": email, "name": name, "password": password,
+                               "status": True, "$createdAt": now, "$updatedAt": now}
+
+    def reset(self):
+        self.collections.clear()
+        self.users.clear()
+        self.calls = 0
+        self.injected_errors = 0
+
+    def stats(self) -> dict:
+        return {
+            "collections": {cid: len(docs) for cid, docs in self.collections.items()},
+            "users": len(self.users),
+            "calls": self.calls,
+            "injected_errors": self.injected_errors,
+        }
+
+
+class FakeDatabases:
+    """Same surface as AsyncDatabases, backed by FakeAppwrite."""
+
+    def __init__(self, store: FakeAppwrite):
+        self.store = store
+
+    @traced("databases")
+    async def list_documents(self, database_id: str, collection_id: str, queries: list = None):
+        await self.store.simulate()
+        total, docs = apply_queries(list(self.store.collection(collection_id).values()), queries)
+        return {"total": total, "documents": docs}
+
+    @traced("databases")
+    async def get_document(self, database_id: str, collection_id: str, document_id: str, queries: list = None):
+        await self.store.simulate()
+        doc = self.store.collection(collection_id).get(document_id)
+        if doc is None:
+            raise _not_found("document")
+        if queries:
+            queries = [q for q in queries if json.loads(q)["method"] == "select"]
+            return apply_queries([doc], queries)[1][0]
+        return _copy(doc)
+
+    @traced("databases")
+    async def create_document(self, database_id: str, collection_id: str, document_id: str, data: dict, permissions: list = None):
+        await self.store.simulate()
+        col = self.store.collection(collection_id)
+        if document_id == "unique()":
+            document_id = uuid.uuid4().hex[:20]
+        if document_id in col:
+            raise AppwriteException("Document with the requested ID already exists.", 409, "document_already_exists")
+        now = _now()
+        col[document_id] = {
+            **data,
+            "$id": document_id,
+            "$collectionId": collection_id,
+            "$databaseId": database_id,
+            "$createdAt": now,
+            "$updatedAt": now,
+            "$permissions": permissions or [],
+        }
+        return _copy(col[document_id])
+
+    @traced("databases")
+    async def update_document(self, database_id: str, collection_id: str, document_id: str, data: dict = None, permissions: list = None):
+        await self.store.simulate()
+        doc = self.store.collection(collection_id).get(document_id)
+        if doc is None:
+            raise _not_found("document")
+        # Operators are applied to the stored value in one step, like Appwrite does atomically
+        doc.update({k: _apply_update(doc.get(k), v) for k, v in (data or {}).items()})
+        if permissions is not None:
+            doc["$permissions"] = permissions
+        doc["$updatedAt"] = _now()
+        return _copy(doc)
+
+    @traced("databases")
+    async def delete_document(self, database_id: str, collection_id: str, document_id: str):
+        await self.store.simulate()
+        if self.store.collection(collection_id).pop(document_id, None) is None:
+            raise _not_found("document")
+        return {}
+
+
+class FakeUsers:
+    """Same surface as AsyncUsers, backed by FakeAppwrite."""
+
+    def __init__(self, store: FakeAppwrite):
+        self.store = store
+
+    def _get(self, user_id: str) -> dict:
+        user = self.store.users.get(user_id)
+        if user is None:
+            raise _not_found("user")
+        return user
+
+    @staticmethod
+    def _public(user: dict) -> dict:
+        return {k: v for k, v in user.items() if k != "password"}
+
+    @traced("users")
+    async def get(self, user_id: str):
+        await self.store.simulate()
+        return self._public(self._get(user_id))
+
+    @traced("users")
+    async def create(self, user_id: str, email: str = None, phone: str = None, password: str = None, name: str = None):
+        await self.store.simulate()
+        if user_id == "unique()":
+            user_id = uuid.uuid4().hex[:20]
+        if user_id in self.store.users or any(u["email"] == email for u in self.store.users.values()):
+            raise AppwriteException("A user with the same id, email, or phone already exists in this project.", 409, "user_already_exists")
+        self.store.seed_user(user_id, email, name or "", password)
+        return self._public(self.store.users[user_id])
+
+    @traced("users")
+    async def update_name(self, user_id: str, name: str):
+        await self.store.simulate()
+        user = self._get(user_id)
+        user["name"] = name
+        user["$updatedAt"] = _now()
+        return self._public(user)
+
+    @traced("users")
+    async def update_password(self, user_id: str, password: str):
+        await self.store.simulate()
+        user = self._get(user_id)
+        user["password"] = password
+        user["$updatedAt"] = _now()
+        return self._public(user)
+
+
+@lru_cache()
+def get_fake_appwrite() -> FakeAppwrite:
+    """Process-wide fake used when APPWRITE_BACKEND=fake."""
+    return FakeAppwrite(
+        latency=settings.FAKE_APPWRITE_LATENCY_MS / 1000,
+        jitter=settings.FAKE_APPWRITE_JITTER_MS / 1000,
+        error_rate=settings.FAKE_APPWRITE_ERROR_RATE,
+    )
+
+
+def install_fake_backend(latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = None) -> FakeAppwrite:
+    """
+    Route get_db_service()/get_users_service() to a fresh fake (tests, benchmarks,
+    load tests). Returns it so callers can seed data and tune faults.
+    """
+    from app.services.appwrite import use_services
+
+    fake = FakeAppwrite(latency=latency, jitter=jitter, error_rate=error_rate, seed=seed)
+    use_services(databases=fake.databases, users=fake.users_service)
+    return fake
+
+
+def uninstall_fake_backend():
+    from app.services.appwrite import use_services
+
+    use_services(None, None)
@@ -1,22 +1,118 @@
-import google.generativeai as genai
+import asyncio
+import hashlib
+import json
 import os
+from functools import lru_cache
+from pathlib import Path
 from dotenv import load_dotenv
+from app.core.config import settings
 
 load_dotenv()
 
-def get_gemini_summary(text: str):
+MODEL_NAME = 'gemini-pro'
+
+# Simple Prompt Engineering
+PROMPT_TEMPLATE = "Summarize this hackathon description in 2 exciting sentences for students: {text}"
+
+
+@lru_cache()
+def get_gemini_model():
+    """
+    Configure the SDK and build the model handle once per process.
+    The SDK is imported here, not at module load: it is slow to import and
+    most requests (and most cold starts) never need it.
+    """
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(MODEL_NAME)
+
+
+def summary_key(text: str) -> str:
+    """Content address: same description + prompt + model -> same key."""
+    return hashlib.sha256(f"{MODEL_NAME}\0{PROMPT_TEMPLATE}\0{text}".encode()).hexdigest()
+
+
+class SummaryCache:
+    """
+    Summaries keyed by summary_key(), kept in memory and persisted as one
+    small JSON file per key so they survive restarts.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._memory = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, key: str):
+        try:
+            return json.loads(self._path(key).read_text())["summary"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write(self, key: str, summary: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(key).with_suffix(".tmp")
+        tmp.write_text(json.dumps({"summary": summary}))
+        os.replace(tmp, self._path(key))  # atomic: readers never see a partial file
+
+    async def get(self, key: str):
+        summary = self._memory.get(key)
+        if summary is None:
+            summary = await asyncio.to_thread(self._read, key)
+            if summary is not None:
+                self._memory[key] = summary
+        return summary
+
+    async def set(self, key: str, summary: str):
+        self._memory[key] = summary
+        try:
+            await asyncio.to_thread(self._write, key, summary)
+        except OSError:
+            pass  # read-only filesystem (e.g. serverless): memory cache still works
+
+
+summary_cache = SummaryCache(settings.AI_SUMMARY_CACHE_DIR)
+
+# key -> in-flight generation task (single-flight: concurrent callers share one model call)
+_inflight = {}
+
+
+async def _generate(text: str, key: str) -> str:
+    response = await get_gemini_model().generate_content_async(PROMPT_TEMPLATE.format(text=text))
+    summary = response.text
+    await summary_cache.set(key, summary)
+    return summary
+
+
+async def summarize(text: str) -> str:
+    """
+    Cached, single-flight summary. Raises on model errors (nothing is cached),
+    so callers like the summary job queue can retry.
+    """
+    key = summary_key(text)
+    cached = await summary_cache.get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_generate(text, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield: a cancelled caller must not cancel the shared generation
+    return await asyncio.shield(task)
+
+
+async def get_gemini_summary(text: str):
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         return "⚠️ AI Error: GEMINI_API_KEY is missing in .env"
 
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        
-        # Simple Prompt Engineering
-        prompt = f"Summarize this hackathon description in 2 exciting sentences for students: {text}"
-        
-        response = model.generate_content(prompt)
-        return response.text
+        return await summarize(text)
     except Exception as e:
-        return f"AI Error: {str(e)}"
\ No newline at end of file
+        return f"AI Error: {str(e)}"
@@ -0,0 +1,85 @@
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from typing import Optional
+import httpcore
+import httpx
+
+# httpcore -> httpx exception types, most specific first
+_ERROR_NAMES = (
+    "ConnectTimeout", "ReadTimeout", "WriteTimeout", "PoolTimeout",
+    "ConnectError", "ReadError", "WriteError",
+    "LocalProtocolError", "RemoteProtocolError", "ProxyError", "UnsupportedProtocol",
+    "TimeoutException", "NetworkError", "ProtocolError",
+)
+_ERRORS = [(getattr(httpcore, name), getattr(httpx, name)) for name in _ERROR_NAMES]
+
+
+@contextmanager
+def _mapped_errors(request: httpx.Request):
+    try:
+        yield
+    except Exception as e:
+        for core_error, httpx_error in _ERRORS:
+            if isinstance(e, core_error):
+                raise httpx_error(str(e), request=request) from e
+        raise
+
+
+def proxy_for(url: str) -> Optional[str]:
+    """Proxy URL from HTTP(S)_PROXY / NO_PROXY for `url` - what httpx applies by default."""
+    host = urllib.parse.urlsplit(url).hostname or ""
+    if urllib.request.proxy_bypass(host):
+        return None
+    return urllib.request.getproxies().get(urllib.parse.urlsplit(url).scheme)
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream, request: httpx.Request):
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self):
+        with _mapped_errors(self._request):
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self):
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class PoolTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over a caller-built httpcore.AsyncConnectionPool, so the pool's
+    network backend (DNS cache, Happy Eyeballs) and proxy are set through public
+    constructor arguments rather than by patching httpx.AsyncHTTPTransport internals.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,   # carries httpx's per-request timeouts
+        )
+        with _mapped_errors(request):
+            response = await self._pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream, request),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._pool.aclose()
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional
+from appwrite.query import Query
+from app.core.config import settings
+from app.services.appwrite import get_db_service
+from app.utils.locks import KeyedLocks
+from app.utils.pagination import iter_documents, MAX_PAGE_SIZE
+
+CRITERIA = ("technical", "design", "utility")
+
+
+class SubmissionAggregate:
+    """Running count/sum of every score a submission has received."""
+
+    __slots__ = ("submission_id", "count", "total_sum", "sums")
+
+    def __init__(self, submission_id: str):
+        self.submission_id = submission_id
+        self.count = 0
+        self.total_sum = 0
+        self.sums = dict.fromkeys(CRITERIA, 0)
+
+    def add(self, score: dict):
+        self.count += 1
+        self.total_sum += score.get('total', 0)
+        for c in CRITERIA:
+            self.sums[c] += score.get(c, 0)
+
+    @property
+    def mean(self) -> float:
+        return self.total_sum / self.count if self.count else 0.0
+
+    def sort_key(self):
+        # Highest mean first, then most scores, then a stable tiebreak
+        return (-self.mean, -self.count, self.submission_id)
+
+    def to_dict(self) -> dict:
+        return {
+            "submission_id": self.submission_id,
+            "count": self.count,
+            "sum": self.total_sum,
+            "mean": round(self.mean, 2),
+            **{f"avg_{c}": round(self.sums[c] / self.count, 2) if self.count else 0.0 for c in CRITERIA},
+        }
+
+
+class Leaderboard:
+    """
+    One hackathon's ranking, kept sorted as scores arrive.
+    Each score moves one entry: bisect finds its old and new slot in O(log n)
+    comparisons, and the list delete/insert shifts are O(n) memmoves - cheap
+    at hackathon sizes (hundreds of submissions), far cheaper than a re-sort.
+    """
+
+    def __init__(self):
+        self._aggregates: Dict[str, SubmissionAggregate] = {}
+        self._ranked = []          # sorted sort_keys
+        self._seen = set()         # score $ids already applied (hydration + live writes may overlap)
+        self.meta: Dict[str, dict] = {}
+        self.hydrated_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self._aggregates)
+
+    def add(self, score: dict):
+        if score.get('$id') in self._seen:
+            return
+        self._seen.add(score.get('$id'))
+
+        sid = score['submission_id']
+        agg = self._aggregates.get(sid)
+        if agg is None:
+            agg = self._aggregates[sid] = SubmissionAggregate(sid)
+        else:
+            del self._ranked[bisect_left(self._ranked, agg.sort_key())]
+        agg.add(score)
+        insort(self._ranked, agg.sort_key())
+
+    def top(self, n: int) -> List[dict]:
+        entries = []
+        for rank, key in enumerate(self._ranked[:n], start=1):
+            sid = key[2]
+            entries.append({"rank": rank, **self.meta.get(sid, {}), **self._aggregates[sid].to_dict()})
+        return entries
+
+
+class LeaderboardRegistry:
+    """
+    Process-wide leaderboards keyed by hackathon_id.
+    Scores saved by this worker are applied live; a board is re-hydrated from
+    Appwrite once it is older than `max_age` seconds, so scores recorded by
+    other workers show up within that bound.
+    """
+
+    def __init__(self, max_age: float = 60.0):
+        self.max_age = max_age
+        self._boards: Dict[str, Leaderboard] = defaultdict(Leaderboard)
+        self._submission_hackathon: Dict[str, str] = {}
+        self._locks = KeyedLocks()
+        self._live: Dict[str, List[dict]] = {}   # hackathon_id -> scores recorded while it re-hydrates
+
+    def _remember_submission(self, board: Leaderboard, submission: dict):
+        self._submission_hackathon[submission['$id']] = submission['hackathon_id']
+        board.meta[submission['$id']] = {
+            "project_title": submission.get('project_title'),
+            "team_id": submission.get('team_id'),
+        }
+
+    async def _hackathon_for(self, submission_id: str) -> str:
+        hackathon_id = self._submission_hackathon.get(submission_id)
+        if hackathon_id is None:
+            submission = await get_db_service().get_document(
+                database_id=settings.APPWRITE_DATABASE_ID,
+                collection_id=settings.COLLECTION_SUBMISSIONS,
+                document_id=submission_id
+            )
+            hackathon_id = submission['hackathon_id']
+            self._remember_submission(self._boards[hackathon_id], submission)
+        return hackathon_id
+
+    async def record(self, scores: List[dict]):
+        """
+        Apply freshly written score documents to their hackathons' boards.
+        Unknown submissions are resolved concurrently; scores whose submission
+        can't be resolved are skipped (the next warm-up picks them up).
+        """
+        submission_ids = list({score['submission_id'] for score in scores})
+        resolved = await asyncio.gather(
+            *[self._hackathon_for(sid) for sid in submission_ids],
+            return_exceptions=True
+        )
+        hackathon_of = {
+            sid: hid for sid, hid in zip(submission_ids, resolved)
+            if not isinstance(hid, BaseException)
+        }
+        for score in scores:
+            hackathon_id = hackathon_of.get(score['submission_id'])
+            if hackathon_id is not None:
+                self._boards[hackathon_id].add(score)
+                if hackathon_id in self._live:
+                    self._live[hackathon_id].append(score)
+
+    def _is_stale(self, board: Optional[Leaderboard]) -> bool:
+        return board is None or board.hydrated_at is None or time.monotonic() - board.hydrated_at > self.max_age
+
+    async def _hydrate(self, hackathon_id: str) -> Leaderboard:
+        """Build a fresh board from every submission and score in Appwrite."""
+        board = Leaderboard()
+        submission_ids = []
+        async for sub in iter_documents(
+            settings.COLLECTION_SUBMISSIONS,
+            [Query.equal('hackathon_id', hackathon_id), Query.select(['$id', 'hackathon_id', 'project_title', 'team_id'])]
+        ):
+            self._remember_submission(board, sub)
+            submission_ids.append(sub['$id'])
+
+        for i in range(0, len(submission_ids), MAX_PAGE_SIZE):
+            chunk = submission_ids[i:i + MAX_PAGE_SIZE]
+            async for score in iter_documents(settings.COLLECTION_SCORES, [Query.equal('submission_id', chunk)]):
+                board.add(score)
+        board.hydrated_at = time.monotonic()
+        return board
+
+    async def _refresh(self, hackathon_id: str) -> Leaderboard:
+        """
+        Swap in a freshly hydrated board. Scores this worker records meanwhile
+        may be missed by the hydration reads, so they are replayed onto it
+        (Leaderboard.add skips score IDs it has already applied).
+        """
+        self._live[hackathon_id] = []
+        try:
+            fresh = await self._hydrate(hackathon_id)
+            old = self._boards.get(hackathon_id)
+            for score in self._live[hackathon_id]:
+                fresh.add(score)
+            if old is not None:
+                for sid, meta in old.meta.items():
+                    fresh.meta.setdefault(sid, meta)
+            self._boards[hackathon_id] = fresh
+            return fresh
+        finally:
+            del self._live[hackathon_id]
+
+    async def top(self, hackathon_id: str, n: int = 10) -> List[dict]:
+        board = self._boards.get(hackathon_id)
+        if self._is_stale(board):
+            async with self._locks.hold(hackathon_id):
+                board = self._boards.get(hackathon_id)
+                if self._is_stale(board):
+                    try:
+                        board = await self._refresh(hackathon_id)
+                    except Exception:
+                        # Appwrite hiccup: serve the last hydrated board if we have one
+                        if board is None or board.hydrated_at is None:
+                            raise
+        return board.top(n)
+
+
+leaderboards = LeaderboardRegistry(max_age=settings.LEADERBOARD_MAX_AGE)
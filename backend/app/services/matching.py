@@ -1,4 +1,5 @@
-from typing import List
+import heapq
+from typing import Dict, Iterable, List, Tuple
 
 def calculate_match_score(user_skills: List[str], team_requirements: List[str]) -> int:
     """
@@ -16,4 +17,79 @@ def calculate_match_score(user_skills: List[str], team_requirements: List[str])
     
     # Calculate percentage
     score = (len(matches) / len(req_set)) * 100
-    return int(score)
\ No newline at end of file
+    return int(score)
+
+# --- BATCHED MATCHMAKING ---
+# Skills are interned into bit positions so a skill set becomes one Python int.
+# Overlap is then `(a & b).bit_count()` - no per-comparison set building.
+# A vocabulary lives as long as one MatchEngine (one request), so user-supplied
+# skills never accumulate and bitsets stay as wide as that request's skill set.
+
+class SkillVocabulary:
+    """Interns lowercase skill names into integer IDs (bit positions)."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def encode(self, skills: Iterable[str]) -> int:
+        bits = 0
+        for skill in skills or []:
+            key = skill.strip().lower()
+            if not key:
+                continue
+            bit = self._ids.get(key)
+            if bit is None:
+                bit = self._ids[key] = len(self._ids)
+            bits |= 1 << bit
+        return bits
+
+
+def _score(overlap: int, required: int) -> int:
+    """Same 0-100 score as calculate_match_score, in integer math."""
+    return overlap * 100 // required if required else 0
+
+
+class MatchEngine:
+    """
+    Ranks open teams for users (and users for teams) on packed skill bitsets.
+    Users are matched on `skills`, teams on `looking_for`.
+    Create one per request: it owns the vocabulary its bitsets are encoded with.
+    """
+
+    def __init__(self, vocab: SkillVocabulary = None):
+        self.vocab = vocab if vocab is not None else SkillVocabulary()
+
+    def _encode_teams(self, teams: List[dict]):
+        encoded = []
+        for team in teams:
+            bits = self.vocab.encode(team.get('looking_for'))
+            if bits:
+                encoded.append((bits, bits.bit_count(), team))
+        return encoded
+
+    def _top_teams(self, user_bits: int, encoded_teams, k: int) -> List[Tuple[int, dict]]:
+        scored = [
+            (_score(overlap, required), team)
+            for bits, required, team in encoded_teams
+            if (overlap := (user_bits & bits).bit_count())
+        ]
+        return heapq.nlargest(k, scored, key=lambda s: s[0])
+
+    def rank_teams_for_user(self, user_skills: List[str], teams: List[dict], k: int = 10) -> List[Tuple[int, dict]]:
+        """Top-k (score, team) for one user."""
+        return self._top_teams(self.vocab.encode(user_skills), self._encode_teams(teams), k)
+
+    def rank_users_for_team(self, team_requirements: List[str], users: List[dict], k: int = 10) -> List[Tuple[int, dict]]:
+        """Top-k (score, user) candidates for one team."""
+        req_bits = self.vocab.encode(team_requirements)
+        if not req_bits:
+            return []
+        required = req_bits.bit_count()
+        scored = (
+            (_score((self.vocab.encode(u.get('skills')) & req_bits).bit_count(), required), u)
+            for u in users
+        )
+        return heapq.nlargest(k, (s for s in scored if s[0] > 0), key=lambda s: s[0])
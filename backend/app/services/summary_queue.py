@@ -0,0 +1,195 @@
+import asyncio
+import itertools
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.appwrite import get_db_service
+from app.utils.locks import LoopLocal
+
+logger = logging.getLogger("hackconnect.summaries")
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        # rate=0 would divide by zero in acquire() and capacity<1 would never refill;
+        # to pause summaries set AI_SUMMARY_BACKEND=off instead
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"TokenBucket needs rate > 0 and capacity >= 1 (got rate={rate}, capacity={capacity})")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = LoopLocal(asyncio.Lock)
+
+    async def acquire(self):
+        async with self._lock.get():
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# --- Model backends: anything with `async summarize(text) -> str` that raises on failure ---
+class GeminiSummaryBackend:
+    async def summarize(self, text: str) -> str:
+        from app.services.gemini import summarize
+        return await summarize(text)
+
+
+class FakeSummaryBackend:
+    """Local stand-in for offline dev and tests: first sentence, optional latency and failures."""
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    async def summarize(self, text: str) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise RuntimeError("fake model failure")
+        return text.split(". ")[0].strip()[:280]
+
+
+def get_summary_backend(name: str):
+    if name == "gemini":
+        return GeminiSummaryBackend()
+    if name == "fake":
+        return FakeSummaryBackend()
+    return None
+
+
+class SummaryQueue:
+    """
+    Background AI summaries for hackathon documents.
+
+    Jobs are keyed by hackathon_id: re-enqueueing a hackathon that is still
+    waiting just replaces its text. A small pool of workers shares one token
+    bucket (provider quota), retries failures with exponential backoff and
+    writes the result back to the hackathon document. Every enqueue gets a
+    version; a job whose text was superseded meanwhile is dropped instead of
+    written, so a slow job for an old description can't overwrite a newer summary.
+    """
+
+    def __init__(self, backend, workers: int = 2, rate: float = 1.0, burst: int = 5,
+                 max_retries: int = 3, retry_delay: float = 2.0):
+        self.backend = backend
+        self.workers = workers
+        self.bucket = TokenBucket(rate, burst) if backend is not None else None
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Dict[str, Tuple[int, str]] = {}   # hackathon_id -> (version, latest text)
+        self._latest: Dict[str, int] = {}                 # hackathon_id -> newest enqueued version
+        self._versions = itertools.count(1)
+        self._tasks: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.superseded = 0
+
+    def enqueue(self, hackathon_id: str, text: Optional[str]):
+        if self.backend is None or not text:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        already_queued = hackathon_id in self._pending
+        version = self._latest[hackathon_id] = next(self._versions)
+        self._pending[hackathon_id] = (version, text)
+        if not already_queued:
+            self._queue.put_nowait(hackathon_id)
+
+    def start(self):
+        if self.backend is None or self._tasks:
+            return
+        # Fresh queue on this loop (a previous loop's can't be awaited here); re-queue what's waiting
+        self._queue = asyncio.Queue()
+        for hackathon_id in self._pending:
+            self._queue.put_nowait(hackathon_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self):
+        """Wait until every queued job is processed (handy in tests and scripts)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _write_back(self, hackathon_id: str, summary: str):
+        await get_db_service().update_document(
+            database_id=settings.APPWRITE_DATABASE_ID,
+            collection_id=settings.COLLECTION_HACKATHONS,
+            document_id=hackathon_id,
+            data={settings.AI_SUMMARY_ATTRIBUTE: summary}
+        )
+
+    def _is_current(self, hackathon_id: str, version: int) -> bool:
+        return self._latest.get(hackathon_id) == version
+
+    async def _process(self, hackathon_id: str, version: int, text: str):
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                summary = await self.backend.summarize(text)
+                if not self._is_current(hackathon_id, version):
+                    self.superseded += 1   # a newer description is queued or done; don't overwrite it
+                    return
+                await self._write_back(hackathon_id, summary)
+                self.completed += 1
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logger.exception("AI summary for hackathon %s failed after %d attempts", hackathon_id, attempt + 1)
+                    return
+                self.retries += 1
+                await asyncio.sleep(self.retry_delay * 2 ** attempt * (0.5 + random.random()))
+
+    async def _worker(self):
+        while True:
+            hackathon_id = await self._queue.get()
+            job = self._pending.pop(hackathon_id, None)
+            try:
+                if job:
+                    await self._process(hackathon_id, *job)
+            except Exception:
+                # Keep the worker alive: a dead worker would stall the queue without a trace
+                self.failed += 1
+                logger.exception("AI summary worker error for hackathon %s", hackathon_id)
+            finally:
+                if job and self._is_current(hackathon_id, job[0]) and hackathon_id not in self._pending:
+                    del self._latest[hackathon_id]
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._pending),
+            "workers": len(self._tasks),
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "superseded": self.superseded,
+        }
+
+
+summary_queue = SummaryQueue(
+    get_summary_backend(settings.AI_SUMMARY_BACKEND),
+    workers=settings.AI_SUMMARY_WORKERS,
+    rate=settings.AI_SUMMARY_RATE,
+    burst=settings.AI_SUMMARY_BURST,
+    max_retries=settings.AI_SUMMARY_MAX_RETRIES,
+)
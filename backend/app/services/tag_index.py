@@ -0,0 +1,113 @@
+import asyncio
+import heapq
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from app.core.config import settings
+from app.utils.locks import LoopLocal
+from app.utils.pagination import iter_documents
+
+# Live events first, then upcoming, then drafts/unknown, finished events last
+STATUS_RANK = {"ongoing": 0, "upcoming": 1, "ended": 3}
+DEFAULT_STATUS_RANK = 2
+
+
+def _norm(tag: str) -> str:
+    return tag.strip().casefold()
+
+
+class HackathonTagIndex:
+    """
+    In-process inverted index: tag -> hackathon IDs.
+    Built once from Appwrite, updated incrementally by the hackathon write
+    endpoints, and fully rebuilt after `max_age` seconds so other workers'
+    writes are eventually picked up.
+    """
+
+    def __init__(self, max_age: float = 300.0):
+        self.max_age = max_age
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._docs: Dict[str, dict] = {}
+        self._built_at: Optional[float] = None
+        self._build_lock = LoopLocal(asyncio.Lock)
+
+    # --- Maintenance ---
+    def upsert(self, doc: dict):
+        hid = doc['$id']
+        self.remove(hid)
+        self._docs[hid] = doc
+        for tag in {_norm(t) for t in doc.get('tags') or []}:
+            self._postings[tag].add(hid)
+
+    def remove(self, hackathon_id: str):
+        old = self._docs.pop(hackathon_id, None)
+        if old is None:
+            return
+        for tag in {_norm(t) for t in old.get('tags') or []}:
+            posting = self._postings.get(tag)
+            if posting is not None:
+                posting.discard(hackathon_id)
+                if not posting:
+                    del self._postings[tag]
+
+    def replace_all(self, docs: Iterable[dict]):
+        self._postings = defaultdict(set)
+        self._docs = {}
+        for doc in docs:
+            self.upsert(doc)
+        self._built_at = time.monotonic()
+
+    @property
+    def is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.max_age
+
+    async def ensure_built(self):
+        """(Re)build from Appwrite if never built or older than max_age. Concurrent callers share one build."""
+        if not self.is_stale:
+            return
+        async with self._build_lock.get():
+            if self.is_stale:
+                docs = [doc async for doc in iter_documents(settings.COLLECTION_HACKATHONS)]
+                self.replace_all(docs)
+
+    # --- Queries ---
+    def _rank_key(self, hid: str, overlap: int):
+        doc = self._docs[hid]
+        return (
+            -overlap,
+            STATUS_RANK.get(doc.get('status'), DEFAULT_STATUS_RANK),
+            doc.get('start_date') or "",
+            hid,
+        )
+
+    def query(self, tags: Iterable[str], limit: Optional[int] = None, status: Optional[str] = None) -> List[dict]:
+        """
+        Hackathons sharing at least one tag, ranked by number of overlapping
+        tags, then status and start date. Cost is proportional to the matching
+        postings, not the number of hackathons.
+        """
+        overlap = Counter()
+        for tag in {_norm(t) for t in tags}:
+            overlap.update(self._postings.get(tag, ()))
+
+        candidates = [
+            (hid, count) for hid, count in overlap.items()
+            if status is None or self._docs[hid].get('status') == status
+        ]
+        key = lambda item: self._rank_key(*item)
+        ranked = heapq.nsmallest(limit, candidates, key=key) if limit is not None else sorted(candidates, key=key)
+        return [self._docs[hid] for hid, _ in ranked]
+
+    def all(self, limit: Optional[int] = None, status: Optional[str] = None) -> List[dict]:
+        docs = [d for d in self._docs.values() if status is None or d.get('status') == status]
+        return docs[:limit] if limit is not None else docs
+
+    def stats(self) -> dict:
+        return {
+            "hackathons": len(self._docs),
+            "tags": len(self._postings),
+            "age_seconds": None if self._built_at is None else round(time.monotonic() - self._built_at, 1),
+        }
+
+
+tag_index = HackathonTagIndex(max_age=settings.TAG_INDEX_MAX_AGE)
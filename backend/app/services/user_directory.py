@@ -0,0 +1,100 @@
+import asyncio
+from typing import Dict, Iterable, List
+from app.core.config import settings
+from app.services.appwrite import get_users_service
+from app.utils.cache import TTLCache
+from app.utils.dataloader import BatchLoader
+from app.utils.locks import LoopLocal
+
+# Process-wide cache of user ID -> display name (read through by team enrichment)
+user_name_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# Caps concurrent users.get calls across ALL requests (Appwrite has no bulk get by ID)
+_upstream_limit = LoopLocal(lambda: asyncio.Semaphore(settings.USER_FETCH_CONCURRENCY))
+
+
+async def _fetch_user_safe(uid: str):
+    async with _upstream_limit.get():
+        try:
+            return await get_users_service().get(uid)
+        except Exception:
+            return None
+
+
+# Only tracked while a fetch for the ID is running:
+# user ID -> running fetches, and user ID -> cache writes/invalidations since they started
+_in_flight: Dict[str, int] = {}
+_generation: Dict[str, int] = {}
+
+
+def _bump_generation(user_id: str):
+    if user_id in _in_flight:
+        _generation[user_id] = _generation.get(user_id, 0) + 1
+
+
+async def _fetch_user_names(user_ids: List[str]) -> Dict[str, str]:
+    """
+    Batch function: one upstream call per distinct ID, bounded concurrency.
+    A name invalidated (or rewritten) while its fetch was running is still
+    returned to this batch's callers, but not cached - the fetch may predate the change.
+    """
+    started = {}
+    for uid in user_ids:
+        _in_flight[uid] = _in_flight.get(uid, 0) + 1
+        started[uid] = _generation.get(uid, 0)
+    try:
+        users = await asyncio.gather(*[_fetch_user_safe(uid) for uid in user_ids])
+        names = {}
+        for u in users:
+            if u:
+                if _generation.get(u['$id'], 0) == started.get(u['$id'], 0):
+                    user_name_cache.set(u['$id'], u['name'])
+                names[u['$id']] = u['name']
+        return names
+    finally:
+        for uid in user_ids:
+            _in_flight[uid] -= 1
+            if not _in_flight[uid]:
+                del _in_flight[uid]
+                _generation.pop(uid, None)
+
+
+# Coalesces lookups from concurrent requests that land within the same tick
+user_loader = BatchLoader(
+    _fetch_user_names,
+    delay=settings.USER_BATCH_DELAY_MS / 1000,
+    max_batch_size=settings.USER_BATCH_SIZE,
+)
+
+
+async def get_user_names(user_ids: Iterable[str]) -> Dict[str, str]:
+    """
+    Resolve user IDs to display names.
+    Cached names are served from memory; misses are coalesced with other
+    in-flight requests by `user_loader`. Unknown users are absent from the result.
+    """
+    names = {}
+    missing = []
+    for uid in set(user_ids):
+        name = user_name_cache.get(uid)
+        if name is None:
+            missing.append(uid)
+        else:
+            names[uid] = name
+
+    if missing:
+        loaded = await user_loader.load_many(missing)
+        names.update({uid: name for uid, name in loaded.items() if name is not None})
+
+    return names
+
+
+def remember_user_name(user_id: str, name: str):
+    """Prime the cache with a name we just read or wrote."""
+    _bump_generation(user_id)
+    user_name_cache.set(user_id, name)
+
+
+def invalidate_user(user_id: str):
+    _bump_generation(user_id)
+    user_name_cache.invalidate(user_id)
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+
+
+class WriteCoalescer:
+    """
+    Buffers writes per key for `window` seconds and applies them together.
+    `flush_fn(key, items)` performs one merged write and returns a list aligned
+    with `items`: each entry is that caller's result, or an exception instance
+    to raise for that caller alone. If `flush_fn` itself raises, every caller
+    in the batch gets the error.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[Hashable, List[Any]], Awaitable[List[Any]]],
+        window: float = 0.005,
+        max_batch_size: int = 100,
+    ):
+        self._flush_fn = flush_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, key: Hashable, item: Any):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, fut))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        return await fut
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self._flush_fn(key, [item for item, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for (_, fut), result in zip(batch, results):
+            if fut.done():
+                continue  # caller went away; the write still happened
+            if isinstance(result, BaseException):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "pending_keys": len(self._pending),
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List
+
+
+class BatchLoader:
+    """
+    DataLoader-style request coalescing.
+    Keys requested within `delay` seconds - across every in-flight request -
+    are deduplicated and handed to `batch_fn` as one batch; all waiters for a
+    key are resolved from the same result.
+
+    `batch_fn(keys)` must return a dict of key -> value (missing keys resolve to None).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        delay: float = 0.002,
+        max_batch_size: int = 100,
+    ):
+        self._batch_fn = batch_fn
+        self.delay = delay
+        self.max_batch_size = max_batch_size
+        self._pending = {}    # key -> Future, waiting for the next tick
+        self._inflight = {}   # key -> Future, batch already dispatched
+        self._tasks = set()
+        self._timer = None
+        self.batches = 0
+        self.keys_loaded = 0
+        self.coalesced = 0
+
+    async def load(self, key: Hashable):
+        fut = self._inflight.get(key) or self._pending.get(key)
+        if fut is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._pending[key] = fut
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.delay, self._dispatch)
+
+        # Shield: one cancelled caller must not cancel the shared future for everyone else
+        return await asyncio.shield(fut)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*[self.load(k) for k in keys])
+        return dict(zip(keys, values))
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        self._inflight.update(batch)
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[Hashable, asyncio.Future]):
+        self.batches += 1
+        self.keys_loaded += len(batch)
+        try:
+            results = await self._batch_fn(list(batch))
+        except Exception as e:
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+        else:
+            for key, fut in batch.items():
+                if not fut.done():
+                    fut.set_result(results.get(key))
+        finally:
+            for key in batch:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "keys_loaded": self.keys_loaded,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,41 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.utils.responses import dumps
+
+
+def _tag(raw: bytes) -> str:
+    return '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+
+
+def document_etag(*docs: dict) -> str:
+    """Strong ETag from each document's `$id` + `$updatedAt`: changes whenever any of them is written."""
+    return _tag("|".join(f"{d['$id']}:{d['$updatedAt']}" for d in docs).encode())
+
+
+def content_etag(payload) -> str:
+    """Strong ETag from the response content itself (lists, enriched views)."""
+    return _tag(dumps(jsonable_encoder(payload), sort_keys=True))
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110): ignore W/ prefixes."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == wanted for candidate in if_none_match.split(","))
+
+
+def conditional(request: Request, response: Response, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    Tag the response with ETag + Cache-Control. If the client already has this
+    version (If-None-Match), return a bodiless 304 for the handler to send instead.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,80 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Generic, Hashable, List, TypeVar
+
+T = TypeVar("T")
+
+
+class _Entry:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0   # holders + waiters
+
+
+class KeyedLocks:
+    """
+    One asyncio.Lock per key (e.g. per team ID), so writes to the same key are
+    serialized while different keys proceed in parallel.
+    Keys are spread over `shards` small dicts, and a key's lock is dropped as
+    soon as nobody holds or waits on it - idle keys cost nothing.
+    """
+
+    def __init__(self, shards: int = 64):
+        self._shards: List[Dict[Hashable, _Entry]] = [{} for _ in range(shards)]
+        self.acquisitions = 0
+        self.contended = 0
+
+    def _shard(self, key: Hashable) -> Dict[Hashable, _Entry]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable):
+        shard = self._shard(key)
+        entry = shard.get(key)
+        if entry is None:
+            entry = shard[key] = _Entry()
+        entry.users += 1
+        if entry.lock.locked():
+            self.contended += 1
+        try:
+            async with entry.lock:
+                self.acquisitions += 1
+                yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del shard[key]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def stats(self) -> dict:
+        return {
+            "active_keys": len(self),
+            "shards": len(self._shards),
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+        }
+
+
+class LoopLocal(Generic[T]):
+    """
+    One asyncio primitive (Lock, Semaphore, ...) per running event loop, made on
+    first use. A primitive binds to the loop that first waits on it, so a
+    long-lived one fails with "bound to a different event loop" as soon as a
+    second loop (another asyncio.run, a test or embedded client) contends on it.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._per_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        value = self._per_loop.get(loop)
+        if value is None:
+            value = self._per_loop[loop] = self._factory()
+        return value
@@ -0,0 +1,129 @@
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from appwrite.exception import AppwriteException
+from appwrite.query import Query
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.tracing import paged_scan
+from app.services.appwrite import get_db_service
+from app.utils.responses import dumps
+
+DEFAULT_PAGE_SIZE = 25   # Appwrite's own default page size
+MAX_PAGE_SIZE = 100      # Appwrite's hard cap per list call
+
+
+def page_queries(queries: Optional[List[str]], limit: int, cursor: Optional[str] = None) -> List[str]:
+    """Append limit/cursor_after to a query list."""
+    paged = list(queries or [])
+    paged.append(Query.limit(limit))
+    if cursor:
+        paged.append(Query.cursor_after(cursor))
+    return paged
+
+
+def select_queries(queries: Optional[List[str]], fields: Optional[List[str]]) -> List[str]:
+    """Append Query.select for a sparse fieldset."""
+    selected = list(queries or [])
+    if fields is not None:
+        selected.append(Query.select(list(fields)))
+    return selected
+
+
+def sparse(documents: List[dict], fields: Optional[List[str]]) -> List[dict]:
+    """
+    Trim documents to a sparse fieldset's `output` keys (a deps.Fieldset): drops
+    Appwrite bookkeeping ($collectionId, ...) and attributes only selected to
+    compute another field (team_id behind team_name).
+    """
+    if fields is None:
+        return documents
+    return [{key: value for key, value in doc.items() if key in fields.output} for doc in documents]
+
+
+def next_cursor(documents: List[dict], limit: int) -> Optional[str]:
+    """A full page means there may be more; the last $id is the cursor for the next one."""
+    if len(documents) < limit or not documents:
+        return None
+    return documents[-1]['$id']
+
+
+async def list_page(
+    collection_id: str,
+    queries: Optional[List[str]],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    One list_documents page. Appwrite answers a cursor it doesn't know (stale,
+    deleted or made up) with a 400; that is the client's error, not ours.
+    """
+    try:
+        return await get_db_service().list_documents(
+            database_id=settings.APPWRITE_DATABASE_ID,
+            collection_id=collection_id,
+            queries=page_queries(queries, limit, cursor)
+        )
+    except AppwriteException as e:
+        if cursor and e.code == 400:
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        raise
+
+
+async def iter_pages(
+    collection_id: str,
+    queries: Optional[List[str]] = None,
+    page_size: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> AsyncIterator[List[dict]]:
+    """Walk a collection page by page using Query.cursor_after."""
+    while True:
+        with paged_scan():
+            result = await list_page(collection_id, queries, page_size, cursor)
+        documents = result['documents']
+        if documents:
+            yield documents
+        cursor = next_cursor(documents, page_size)
+        if cursor is None:
+            return
+
+
+async def iter_documents(
+    collection_id: str,
+    queries: Optional[List[str]] = None,
+    page_size: int = MAX_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> AsyncIterator[dict]:
+    """Same as iter_pages, one document at a time."""
+    async for page in iter_pages(collection_id, queries, page_size, cursor):
+        for doc in page:
+            yield doc
+
+
+async def ndjson_response(
+    pages: AsyncIterator[List[dict]],
+    transform: Optional[Callable[[List[dict]], Awaitable[List[dict]]]] = None,
+    fields: Optional[List[str]] = None,
+) -> StreamingResponse:
+    """
+    Stream documents as newline-delimited JSON while pages arrive,
+    instead of buffering the whole collection in memory.
+    `transform` can enrich each page before it is written; `fields` then trims it.
+    The first page is read before the response starts, so a bad cursor or an
+    upstream failure on it still gets a proper status code instead of a cut stream.
+    """
+    first = await anext(pages, None)
+
+    async def all_pages():
+        if first is not None:
+            yield first
+            async for page in pages:
+                yield page
+
+    async def body():
+        async for page in all_pages():
+            if transform is not None:
+                page = await transform(page)
+            page = sparse(page, fields)
+            yield b"".join(dumps(doc) + b"\n" for doc in page)
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
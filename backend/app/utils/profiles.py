@@ -0,0 +1,29 @@
+from typing import Any, Tuple
+
+# Profile document fields copied into UserResponse, with their defaults
+PROFILE_FIELDS: Tuple[Tuple[str, Any], ...] = (
+    ("username", None),
+    ("role", "participant"),
+    ("bio", None),
+    ("avatar_url", None),
+    ("github_url", None),
+    ("portfolio_url", None),
+    ("skills", []),
+    ("tech_stack", []),
+    ("xp", 0),
+    ("reputation_score", 0.0),
+    ("account_id", None),
+)
+
+
+def build_user_profile(doc: dict, auth_user: dict) -> dict:
+    """Merge a users-collection document with its Appwrite auth account (UserResponse shape)."""
+    get = doc.get
+    profile = {"id": doc['$id'], "email": auth_user['email'], "name": auth_user['name']}
+    for field, default in PROFILE_FIELDS:
+        value = get(field, default)
+        # Fresh lists per response: defaults are shared
+        profile[field] = list(value) if value is default and isinstance(default, list) else value
+    profile["created_at"] = doc['$createdAt']
+    profile["updated_at"] = doc['$updatedAt']
+    return profile
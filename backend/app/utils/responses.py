@@ -0,0 +1,28 @@
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+
+# Optional: orjson is several times faster than the stdlib encoder
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(content: Any, sort_keys: bool = False) -> bytes:
+    """Compact JSON bytes; datetimes and other non-JSON values fall back to str()."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(content, default=str, option=option)
+    return json.dumps(content, default=str, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when installed.
+    Return it directly from a route (`return FastJSONResponse({...})`) to also
+    skip FastAPI's jsonable_encoder pass - Appwrite documents are already plain JSON.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
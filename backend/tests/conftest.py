@@ -0,0 +1,26 @@
+import asyncio
+import httpx
+import pytest
+from app.main import app
+from app.services.fake_appwrite import install_fake_backend, uninstall_fake_backend
+from app.services.user_directory import user_name_cache
+
+
+@pytest.fixture
+def fake():
+    """A fresh in-memory Appwrite behind get_db_service()/get_users_service(), with a cold name cache."""
+    user_name_cache.clear()
+    backend = install_fake_backend()
+    yield backend
+    uninstall_fake_backend()
+
+
+@pytest.fixture
+def call_api(fake):
+    """Run `scenario(client)` against the app on a fresh event loop and return its result."""
+    def run(scenario):
+        async def main():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return await scenario(client)
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,130 @@
+import asyncio
+import gzip
+import json
+import pytest
+from app.core import compression
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+
+BIG_JSON = json.dumps({"documents": [{"$id": f"d{i}", "name": "hackathon " * 5} for i in range(100)]}).encode()
+
+
+def sized(body: bytes, content_type: str, extra_headers=(), chunks=1):
+    """ASGI app sending `body` with a Content-Length, split into `chunks` messages."""
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode()),
+                   (b"etag", b'"v1"'), *extra_headers]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        step = -(-len(body) // chunks)
+        for i in range(0, len(body), step):
+            await send({"type": "http.response.body", "body": body[i:i + step], "more_body": i + step < len(body)})
+    return app
+
+
+def streamed(content_type: str, parts):
+    """ASGI app streaming `parts` without a Content-Length (NDJSON, SSE)."""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", content_type.encode())]})
+        for part in parts:
+            await send({"type": "http.response.body", "body": part, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    return app
+
+
+def call(app, accept_encoding, **kwargs):
+    """Run the middleware around `app`; returns (headers dict, body messages)."""
+    middleware = CompressionMiddleware(app, minimum_size=1024, **kwargs)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    start, *bodies = sent
+    headers = {}
+    for name, value in start["headers"]:
+        headers.setdefault(name.decode().lower(), []).append(value.decode())
+    return {k: ", ".join(v) for k, v in headers.items()}, [m["body"] for m in bodies]
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+def test_brotli_preferred_over_gzip():
+    headers, bodies = call(sized(BIG_JSON, "application/json"), "gzip, deflate, br")
+    assert headers["content-encoding"] == "br"
+    assert compression.brotli.decompress(b"".join(bodies)) == BIG_JSON
+    assert headers["content-length"] == str(len(b"".join(bodies)))
+
+
+def test_gzip_when_brotli_is_refused_or_not_offered():
+    for accept in ("gzip", "gzip, br;q=0"):
+        headers, bodies = call(sized(BIG_JSON, "application/json"), accept)
+        assert headers["content-encoding"] == "gzip"
+        assert gzip.decompress(b"".join(bodies)) == BIG_JSON
+
+
+def test_rechunked_body_is_compressed_whole():
+    headers, bodies = call(sized(BIG_JSON, "application/json; charset=utf-8", chunks=7), "gzip")
+    assert len(bodies) == 1
+    assert gzip.decompress(bodies[0]) == BIG_JSON
+
+
+def test_compressed_response_varies_on_accept_encoding_and_weakens_etag():
+    headers, _ = call(sized(BIG_JSON, "application/json", extra_headers=[(b"vary", b"Origin")]), "gzip")
+    assert "Accept-Encoding" in headers["vary"]
+    assert "Origin" in headers["vary"]
+    assert headers["etag"] == 'W/"v1"'
+
+
+@pytest.mark.parametrize("accept", ["", "identity", "gzip;q=0, br;q=0"])
+def test_no_acceptable_encoding_passes_through(accept):
+    headers, bodies = call(sized(BIG_JSON, "application/json"), accept)
+    assert "content-encoding" not in headers
+    assert b"".join(bodies) == BIG_JSON
+
+
+def test_small_bodies_are_not_compressed():
+    body = b'{"ok": true}'
+    headers, bodies = call(sized(body, "application/json"), "gzip, br")
+    assert "content-encoding" not in headers
+    assert "vary" not in headers
+    assert headers["etag"] == '"v1"'
+    assert bodies == [body]
+
+
+def test_other_content_types_and_encoded_bodies_pass_through():
+    png = b"\x89PNG" + bytes(4000)
+    headers, bodies = call(sized(png, "image/png"), "gzip")
+    assert "content-encoding" not in headers and b"".join(bodies) == png
+
+    pre = gzip.compress(BIG_JSON)
+    headers, bodies = call(sized(pre, "application/json", extra_headers=[(b"content-encoding", b"gzip")]), "gzip, br")
+    assert headers["content-encoding"] == "gzip"
+    assert b"".join(bodies) == pre
+
+
+@pytest.mark.parametrize("content_type", ["application/x-ndjson", "text/event-stream", "application/json"])
+def test_streaming_bodies_pass_through_chunk_by_chunk(content_type):
+    parts = [b'{"a": 1}\n' * 200, b'{"b": 2}\n' * 200]
+    headers, bodies = call(streamed(content_type, parts), "gzip, br")
+    assert "content-encoding" not in headers
+    assert bodies == parts + [b""]
+
+
+def test_list_endpoint_is_compressed_end_to_end(fake, call_api):
+    fake.seed(settings.COLLECTION_HACKATHONS, [{"$id": f"h{i}", "name": f"Hackathon {i}", "description": "x" * 100}
+                                               for i in range(50)])
+
+    async def scenario(client):
+        return (
+            await client.get("/api/hackathons/", params={"limit": 50}, headers={"Accept-Encoding": "gzip"}),
+            await client.get("/api/hackathons/", params={"stream": True}, headers={"Accept-Encoding": "gzip"}),
+        )
+
+    page, stream = call_api(scenario)
+    assert page.headers["content-encoding"] == "gzip"
+    assert len(page.json()["documents"]) == 50   # httpx decodes it
+    assert "content-encoding" not in stream.headers
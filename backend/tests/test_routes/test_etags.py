@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from app.core.config import settings
+
+
+@pytest.fixture
+def seeded(fake):
+    fake.seed_user("u1", "ada@example.com", "Ada")
+    fake.seed(settings.COLLECTION_USERS, [{"$id": "u1", "username": "ada", "account_id": "u1", "bio": "hi"}])
+    fake.seed(settings.COLLECTION_HACKATHONS, [{"$id": "h1", "name": "Hack", "description": "Old.", "status": "upcoming"}])
+    fake.seed(settings.COLLECTION_TEAMS, [{"$id": "t1", "name": "Team", "description": "d", "hackathon_id": "h1",
+                                           "leader_id": "u1", "members": ["u1"], "join_requests": []}])
+    fake.seed(settings.COLLECTION_SUBMISSIONS, [{"$id": "s1", "hackathon_id": "h1", "team_id": "t1", "project_title": "P"}])
+    return fake
+
+
+GETS = ["/api/hackathons/h1", "/api/teams/t1", "/api/users/u1", "/api/submissions/h1"]
+
+
+@pytest.mark.parametrize("path", GETS)
+def test_if_none_match_gets_a_bodiless_304(seeded, call_api, path):
+    async def scenario(client):
+        first = await client.get(path)
+        etag = first.headers["etag"]
+        return first, [await client.get(path, headers={"If-None-Match": value})
+                       for value in (etag, f"W/{etag}", f'"other", {etag}', "*")]
+
+    first, revalidations = call_api(scenario)
+    assert first.status_code == 200
+    assert first.headers["cache-control"]
+    for response in revalidations:
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == first.headers["etag"]
+
+
+@pytest.mark.parametrize("path", GETS)
+def test_stale_etag_gets_the_full_body(seeded, call_api, path):
+    async def scenario(client):
+        return await client.get(path, headers={"If-None-Match": '"stale"'})
+
+    response = call_api(scenario)
+    assert response.status_code == 200
+    assert response.content
+
+
+MUTATIONS = {
+    "/api/hackathons/h1": ("PUT", "/api/hackathons/h1", {"json": {"description": "New."}}),
+    "/api/teams/t1": ("PUT", "/api/teams/t1", {"params": {"user_id": "u1"}, "json": {"description": "new"}}),
+    "/api/users/u1": ("PUT", "/api/users/u1", {"json": {"bio": "hello"}}),
+    "/api/submissions/h1": ("POST", "/api/submissions/", {"json": {
+        "hackathon_id": "h1", "team_id": "t1", "project_title": "Q", "description": "d", "demo_video_url": "v"}}),
+}
+
+
+@pytest.mark.parametrize("path", GETS)
+def test_etag_changes_after_a_mutation(seeded, call_api, path):
+    method, url, kwargs = MUTATIONS[path]
+
+    async def scenario(client):
+        before = await client.get(path)
+        await asyncio.sleep(0.002)   # $updatedAt has millisecond resolution
+        assert (await client.request(method, url, **kwargs)).status_code == 200
+        after = await client.get(path, headers={"If-None-Match": before.headers["etag"]})
+        return before, after
+
+    before, after = call_api(scenario)
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+
+
+def test_member_rename_changes_the_team_etag(seeded, call_api):
+    async def scenario(client):
+        before = await client.get("/api/teams/t1")
+        assert (await client.put("/api/users/u1", json={"name": "Ada L."})).status_code == 200
+        after = await client.get("/api/teams/t1", headers={"If-None-Match": before.headers["etag"]})
+        return before, after
+
+    before, after = call_api(scenario)
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json()["members_enriched"][0]["name"] == "Ada L."
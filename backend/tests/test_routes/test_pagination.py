@@ -0,0 +1,60 @@
+import json
+import pytest
+from app.core.config import settings
+
+LIST_ROUTES = ["/api/teams/", "/api/hackathons/", "/api/hackathons/h1/teams", "/api/submissions/h1"]
+
+
+@pytest.fixture
+def seeded(fake):
+    fake.seed(settings.COLLECTION_HACKATHONS, [{"$id": f"h{i}", "name": f"Hack {i}"} for i in range(1, 6)])
+    fake.seed(settings.COLLECTION_TEAMS, [
+        {"$id": f"t{i}", "name": f"Team {i}", "hackathon_id": "h1", "leader_id": "u", "members": ["u"], "join_requests": []}
+        for i in range(5)
+    ])
+    fake.seed(settings.COLLECTION_SUBMISSIONS, [
+        {"$id": f"s{i}", "hackathon_id": "h1", "team_id": f"t{i}", "project_title": f"P{i}"} for i in range(5)
+    ])
+    return fake
+
+
+@pytest.mark.parametrize("path", LIST_ROUTES)
+@pytest.mark.parametrize("stream", [False, True])
+def test_unknown_cursor_is_a_client_error(seeded, call_api, path, stream):
+    async def scenario(client):
+        return await client.get(path, params={"cursor": "no-such-doc", "stream": stream})
+
+    response = call_api(scenario)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "invalid cursor"}
+
+
+def test_cursor_walks_the_collection(seeded, call_api):
+    async def scenario(client):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            body = (await client.get("/api/hackathons/", params=params)).json()
+            seen.extend(d["$id"] for d in body["documents"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return seen
+
+    assert call_api(scenario) == ["h1", "h2", "h3", "h4", "h5"]
+
+
+def test_stream_returns_every_document_as_ndjson(seeded, call_api):
+    async def scenario(client):
+        return await client.get("/api/hackathons/", params={"stream": True, "limit": 2})
+
+    response = call_api(scenario)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["$id"] for line in response.text.splitlines()] == ["h1", "h2", "h3", "h4", "h5"]
+
+
+def test_recommendations_reject_a_zero_limit(seeded, call_api):
+    async def scenario(client):
+        return await client.post("/api/hackathons/recommendations", params={"limit": 0}, json=["AI"])
+
+    assert call_api(scenario).status_code == 422
@@ -0,0 +1,79 @@
+import json
+import pytest
+from app.core.config import settings
+
+
+@pytest.fixture
+def seeded(fake):
+    fake.seed_user("u1", "ada@example.com", "Ada")
+    fake.seed(settings.COLLECTION_HACKATHONS, [{"$id": "h1", "name": "Hack", "tagline": "t", "description": "Long.",
+                                                "status": "upcoming", "tags": ["ai"]}])
+    fake.seed(settings.COLLECTION_TEAMS, [{"$id": "t1", "name": "Team", "description": "d", "hackathon_id": "h1",
+                                           "leader_id": "u1", "members": ["u1"], "join_requests": []}])
+    fake.seed(settings.COLLECTION_SUBMISSIONS, [{"$id": "s1", "hackathon_id": "h1", "team_id": "t1",
+                                                 "project_title": "P", "description": "x"}])
+    return fake
+
+
+LISTS = [
+    ("/api/hackathons/?fields=name,tagline", "documents", {"name", "tagline"}),
+    ("/api/hackathons/?fields=id,created_at", "documents", {"$createdAt"}),
+    ("/api/hackathons/h1/teams?fields=name", "teams", {"name"}),
+    ("/api/teams/?fields=name", "documents", {"name"}),
+    ("/api/teams/?fields=name,members", "documents", {"name", "members", "members_enriched"}),
+    ("/api/submissions/h1?fields=project_title", "submissions", {"project_title"}),
+    ("/api/submissions/h1?fields=project_title,team_name", "submissions", {"project_title", "team_name"}),
+]
+
+
+@pytest.mark.parametrize("path, key, requested", LISTS)
+def test_list_returns_only_requested_fields(seeded, call_api, path, key, requested):
+    async def scenario(client):
+        return await client.get(path)
+
+    response = call_api(scenario)
+    assert response.status_code == 200
+    documents = response.json()[key]
+    assert documents
+    for doc in documents:
+        assert set(doc) == {"$id", *requested}
+
+
+@pytest.mark.parametrize("path, key, requested", LISTS)
+def test_stream_returns_only_requested_fields(seeded, call_api, path, key, requested):
+    async def scenario(client):
+        return await client.get(path + "&stream=true")
+
+    response = call_api(scenario)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines
+    for doc in lines:
+        assert set(doc) == {"$id", *requested}
+
+
+def test_team_name_is_still_resolved(seeded, call_api):
+    async def scenario(client):
+        return await client.get("/api/submissions/h1?fields=team_name")
+
+    [submission] = call_api(scenario).json()["submissions"]
+    assert submission == {"$id": "s1", "team_name": "Team"}
+
+
+def test_single_reads_return_only_requested_fields(seeded, call_api):
+    async def scenario(client):
+        hackathon = await client.get("/api/hackathons/h1?fields=name")
+        team = await client.get("/api/teams/t1?fields=name,join_requests")
+        return hackathon, team
+
+    hackathon, team = call_api(scenario)
+    assert hackathon.json()["data"] == {"$id": "h1", "name": "Hack"}
+    assert set(team.json()) == {"$id", "name", "join_requests", "join_requests_enriched"}
+
+
+def test_without_fields_documents_are_untouched(seeded, call_api):
+    async def scenario(client):
+        return await client.get("/api/teams/")
+
+    [team] = call_api(scenario).json()["documents"]
+    assert {"description", "hackathon_id", "members_enriched", "$collectionId"} <= set(team)
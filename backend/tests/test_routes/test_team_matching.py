@@ -0,0 +1,52 @@
+import pytest
+from app.core.config import settings
+from app.core.tracing import assert_upstream_calls
+
+
+@pytest.fixture
+def event(fake):
+    fake.seed(settings.COLLECTION_USERS, [
+        {"$id": f"u{i}", "username": f"user{i}", "role": "participant",
+         "skills": ["Python", "React"] if i % 100 == 7 else ["Go"]}
+        for i in range(1200)
+    ])
+    fake.seed(settings.COLLECTION_TEAMS, [
+        {"$id": "t1", "name": "T1", "hackathon_id": "h1", "leader_id": "u7", "members": ["u7"],
+         "join_requests": [], "looking_for": ["python", "react"]},
+        {"$id": "t2", "name": "T2", "hackathon_id": "h1", "leader_id": "u0", "members": ["u0"],
+         "join_requests": [], "looking_for": ["React"]},
+    ])
+    return fake
+
+
+def test_candidates_scan_all_participants_without_tripping_the_n_plus_one_check(event, call_api):
+    async def scenario(client):
+        with assert_upstream_calls() as seen:
+            response = await client.get("/api/teams/t1/candidates", params={"k": 5})
+        return response, seen
+
+    response, seen = call_api(scenario)
+    assert response.status_code == 200
+    candidates = [(c["score"], c["user"]["$id"]) for c in response.json()["candidates"]]
+    # u7 is already on a team; the other Python+React users all match fully
+    assert candidates == [(100, f"u{i}") for i in (107, 207, 307, 407, 507)]
+    (_, trace), = seen
+    assert sum(c.paged for c in trace.calls) == 14   # 12 full pages of users, an empty last one, 1 of teams
+
+
+def test_matches_for_user(event, call_api):
+    async def scenario(client):
+        return await client.get("/api/teams/match/u107", params={"hackathon_id": "h1"})
+
+    response = call_api(scenario)
+    assert response.status_code == 200
+    assert [(m["score"], m["team"]["$id"]) for m in response.json()["matches"]] == [(100, "t1"), (100, "t2")]
+
+
+@pytest.mark.parametrize("path", ["/api/teams/t1/candidates", "/api/teams/match/u107?hackathon_id=h1"])
+@pytest.mark.parametrize("k", [0, 101])
+def test_k_is_bounded(event, call_api, path, k):
+    async def scenario(client):
+        return await client.get(path, params={"k": k})
+
+    assert call_api(scenario).status_code == 422
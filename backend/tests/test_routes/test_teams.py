@@ -0,0 +1,73 @@
+import asyncio
+from appwrite.operator import Operator
+from app.core.config import settings
+from app.services.user_directory import user_name_cache
+
+TEAMS = settings.COLLECTION_TEAMS
+
+
+def seed_team(fake, team_id, members=("leader",), join_requests=()):
+    fake.seed(TEAMS, [{
+        "$id": team_id, "name": "Team", "description": "d", "hackathon_id": "h1",
+        "leader_id": "leader", "members": list(members), "join_requests": list(join_requests),
+    }])
+
+
+def test_approvals_from_two_workers_are_not_lost(fake, call_api):
+    fake.latency, fake.jitter = 0.002, 0.01
+    requesters = [f"u{i}" for i in range(10)]
+    seed_team(fake, "t1", join_requests=requesters)
+
+    async def other_worker(user_id):
+        # Another process: its own team locks, the same Appwrite
+        await fake.databases.get_document(settings.APPWRITE_DATABASE_ID, TEAMS, "t1")
+        await fake.databases.update_document(settings.APPWRITE_DATABASE_ID, TEAMS, "t1", {
+            "join_requests": Operator.array_remove(user_id),
+            "members": Operator.array_append([user_id]),
+        })
+
+    async def scenario(client):
+        return await asyncio.gather(
+            *[client.post("/api/teams/approve", json={"team_id": "t1", "leader_id": "leader", "target_user_id": u})
+              for u in requesters[:5]],
+            *[other_worker(u) for u in requesters[5:]],
+        )
+
+    responses = call_api(scenario)
+    assert [r.status_code for r in responses[:5]] == [200] * 5
+    team = fake.collections[TEAMS]["t1"]
+    assert sorted(team["members"]) == sorted(["leader", *requesters])
+    assert team["join_requests"] == []
+
+
+def test_concurrent_join_requests_are_all_recorded(fake, call_api):
+    fake.latency = 0.002
+    seed_team(fake, "t2")
+    users = [f"j{i}" for i in range(40)]
+
+    async def scenario(client):
+        return await asyncio.gather(*[
+            client.post("/api/teams/join", json={"team_id": "t2", "user_id": u}) for u in users
+        ])
+
+    responses = call_api(scenario)
+    assert all(r.status_code == 200 for r in responses)
+    assert sorted(fake.collections[TEAMS]["t2"]["join_requests"]) == sorted(users)
+
+
+def test_member_lookups_work_on_a_second_event_loop(fake, call_api):
+    # More members than USER_FETCH_CONCURRENCY, with latency, so the fetch limit is contended
+    fake.latency = 0.002
+    members = [f"m{i}" for i in range(40)]
+    for uid in members:
+        fake.seed_user(uid, f"{uid}@example.com", uid.upper())
+    seed_team(fake, "big", members=members)
+
+    async def scenario(client):
+        return await client.get("/api/teams/big")
+
+    for _ in range(2):   # each call_api is its own asyncio.run
+        user_name_cache.clear()
+        response = call_api(scenario)
+        assert response.status_code == 200
+        assert response.json()["members_enriched"][39]["name"] == "M39"
@@ -0,0 +1,81 @@
+import logging
+import pytest
+from app.core.config import settings
+from app.core.tracing import UpstreamBudgetExceeded, assert_upstream_calls
+
+TEAMS = settings.COLLECTION_TEAMS
+
+
+@pytest.fixture
+def teams(fake):
+    """25 teams of 3 members (75 distinct users) plus one team with a long join queue."""
+    for i in range(75):
+        fake.seed_user(f"u{i}", f"u{i}@example.com", f"User {i}")
+    for i in range(12):
+        fake.seed_user(f"r{i}", f"r{i}@example.com", f"Requester {i}")
+    fake.seed(TEAMS, [
+        {"$id": f"t{i:02}", "name": f"Team {i}", "description": "d", "hackathon_id": "h1",
+         "leader_id": f"u{3 * i}", "members": [f"u{3 * i + j}" for j in range(3)], "join_requests": []}
+        for i in range(25)
+    ] + [
+        {"$id": "busy", "name": "Busy", "description": "d", "hackathon_id": "h1", "leader_id": "u0",
+         "members": ["u0", "u1"], "join_requests": [f"r{i}" for i in range(12)]},
+    ])
+    return fake
+
+
+def calls_by_operation(seen):
+    (_, trace), = seen
+    return {f"{service}.{operation}": count for (service, operation, _), count in trace.grouped().items()}
+
+
+def test_list_teams_resolves_each_member_once_then_from_cache(teams, call_api):
+    async def scenario(client):
+        with assert_upstream_calls(max_calls=1, max_repeats=1) as cold:
+            first = await client.get("/api/teams/", params={"limit": 25})
+        with assert_upstream_calls(max_calls=1, max_repeats=1, max_fanout=0) as warm:
+            second = await client.get("/api/teams/", params={"limit": 25})
+        return first, second, cold, warm
+
+    first, second, cold, warm = call_api(scenario)
+    assert first.status_code == second.status_code == 200
+    assert len(first.json()["documents"]) == 25
+    assert cold[0][0] == "GET /api/teams/"
+    # One page read, and one users.get per distinct member - never per occurrence
+    assert calls_by_operation(cold) == {"databases.list_documents": 1, "users.get": 75}
+    assert calls_by_operation(warm) == {"databases.list_documents": 1}
+
+
+def test_get_team_budget_cold_and_warm(teams, call_api):
+    async def scenario(client):
+        with assert_upstream_calls(max_calls=1, max_repeats=1) as cold:
+            first = await client.get("/api/teams/busy")
+        with assert_upstream_calls(max_calls=1, max_repeats=1, max_fanout=0) as warm:
+            second = await client.get("/api/teams/busy")
+        return first, second, cold, warm
+
+    first, second, cold, warm = call_api(scenario)
+    assert first.status_code == second.status_code == 200
+    assert [m["name"] for m in first.json()["join_requests_enriched"]] == [f"Requester {i}" for i in range(12)]
+    assert cold[0][0] == "GET /api/teams/{team_id}"
+    assert calls_by_operation(cold) == {"databases.get_document": 1, "users.get": 14}
+    assert calls_by_operation(warm) == {"databases.get_document": 1}
+
+
+def test_cold_get_team_fanout_is_not_reported_as_n_plus_one(teams, call_api, caplog):
+    async def scenario(client):
+        return await client.get("/api/teams/busy")
+
+    with caplog.at_level(logging.WARNING, logger="hackconnect.upstream"):
+        assert call_api(scenario).status_code == 200
+    assert "N+1" not in caplog.text
+    assert "fan-out" not in caplog.text
+
+
+def test_budget_catches_fanout_over_the_limit(teams, call_api):
+    async def scenario(client):
+        with assert_upstream_calls(max_fanout=10):
+            await client.get("/api/teams/", params={"limit": 25})
+
+    with pytest.raises(UpstreamBudgetExceeded, match=r"users\.get called 75 times"):
+        call_api(scenario)
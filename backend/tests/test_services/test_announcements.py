@@ -0,0 +1,46 @@
+from app.services.announcements import AnnouncementHub
+
+
+def drain(sub):
+    events = []
+    while not sub.queue.empty():
+        events.append(sub.queue.get_nowait()[0])
+    return events
+
+
+def test_reconnect_replays_missed_events_in_order():
+    hub = AnnouncementHub(replay_size=100, queue_size=64)
+    for i in range(10):
+        hub.publish("h", {"n": i})
+    sub = hub.subscribe("h", last_event_id=4)
+    assert drain(sub) == [5, 6, 7, 8, 9, 10]
+    assert not sub.lagged
+    assert hub.stats()["subscribers"] == 1
+
+
+def test_replay_larger_than_queue_keeps_oldest_and_marks_lagged():
+    hub = AnnouncementHub(replay_size=100, queue_size=64)
+    for i in range(80):
+        hub.publish("h", {"n": i})
+
+    sub = hub.subscribe("h", last_event_id=0)
+    first = drain(sub)
+    assert first == list(range(1, 65))
+    assert sub.lagged
+    # Not attached to live events, so nothing can land after the gap
+    assert hub.stats()["subscribers"] == 0
+
+    # The client reconnects from the last id it got and receives the rest
+    rest = hub.subscribe("h", last_event_id=first[-1])
+    assert drain(rest) == list(range(65, 81))
+    assert not rest.lagged
+
+
+def test_slow_subscriber_is_dropped_and_marked_lagged():
+    hub = AnnouncementHub(replay_size=10, queue_size=2)
+    sub = hub.subscribe("h")
+    for i in range(3):
+        hub.publish("h", {"n": i})
+    assert sub.lagged
+    assert drain(sub) == [1, 2]
+    assert hub.stats()["dropped_subscribers"] == 1
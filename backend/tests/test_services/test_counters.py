@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services.counters import CounterRegistry
+
+
+@pytest.fixture
+def event(fake):
+    fake.seed(settings.COLLECTION_USERS, [{"$id": f"u{i}"} for i in range(10)])
+    fake.seed(settings.COLLECTION_TEAMS, [
+        {"$id": "t1", "hackathon_id": "h1", "members": ["u0", "u1", "u2"]},
+        {"$id": "t2", "hackathon_id": "h1", "members": ["u2", "u3"]},
+        {"$id": "t3", "hackathon_id": "h2", "members": ["u4", "u5"]},
+    ])
+    fake.seed(settings.COLLECTION_SUBMISSIONS, [{"$id": "s1", "hackathon_id": "h1"}])
+    return fake
+
+
+def without_age(stats):
+    return {k: v for k, v in stats.items() if k != "as_of_seconds"}
+
+
+def test_counts_are_scoped_to_the_hackathon(event):
+    registry = CounterRegistry()
+
+    async def scenario():
+        return await asyncio.gather(registry.stats("h1"), registry.stats("h2"))
+
+    h1, h2 = asyncio.run(scenario())
+    assert without_age(h1) == {
+        "platform_users": 10, "participants": 4, "teams_formed": 2,
+        "submissions_received": 1, "platform_users_without_team": 6,
+    }
+    assert (h2["participants"], h2["teams_formed"], h2["submissions_received"]) == (2, 1, 0)
+    assert h2["platform_users"] == 10
+
+
+def test_writes_after_reconcile_update_counters_in_memory(event):
+    registry = CounterRegistry()
+
+    async def scenario():
+        await registry.stats("h1")
+        event.latency = 1   # any further Appwrite read would time the test out
+        registry.team_created({"hackathon_id": "h1", "members": ["u6"]})
+        registry.member_added("h1", "u7")
+        registry.member_removed("h1", "u3")
+        registry.submission_created("h1")
+        registry.user_registered()
+        return await asyncio.wait_for(registry.stats("h1"), 0.5)
+
+    stats = asyncio.run(scenario())
+    assert (stats["teams_formed"], stats["submissions_received"]) == (3, 2)
+    assert (stats["participants"], stats["platform_users"]) == (5, 11)
+
+
+def test_writes_during_a_reconcile_are_replayed_onto_its_result(event):
+    event.latency = 0.01
+    registry = CounterRegistry()
+
+    async def scenario():
+        counting = asyncio.ensure_future(registry.stats("h1"))
+        await asyncio.sleep(0.005)   # reconcile is waiting on Appwrite
+        registry.team_created({"hackathon_id": "h1", "members": ["u8"]})
+        registry.submission_created("h1")
+        registry.member_removed("h1", "u0")
+        registry.user_registered()
+        return await counting
+
+    stats = asyncio.run(scenario())
+    assert without_age(stats) == {
+        "platform_users": 11, "participants": 4, "teams_formed": 3,
+        "submissions_received": 2, "platform_users_without_team": 7,
+    }
+
+
+def test_stale_counters_are_reconciled_against_appwrite(event):
+    registry = CounterRegistry(max_staleness=0)
+
+    async def scenario():
+        await registry.stats("h1")
+        registry.team_created({"hackathon_id": "h1", "members": ["u9"]})   # never reached Appwrite
+        event.seed(settings.COLLECTION_SUBMISSIONS, [{"$id": "s2", "hackathon_id": "h1"}])   # another worker
+        return await registry.stats("h1")
+
+    stats = asyncio.run(scenario())
+    assert (stats["teams_formed"], stats["participants"], stats["submissions_received"]) == (2, 4, 2)
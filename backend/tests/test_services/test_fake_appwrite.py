@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from appwrite.exception import AppwriteException
+from appwrite.operator import Operator
+from appwrite.query import Query
+from app.services.fake_appwrite import DEFAULT_LIMIT, apply_queries
+
+TEAMS = [
+    {"$id": "t1", "name": "Bravo", "members": ["u1", "u2"], "size": 2},
+    {"$id": "t2", "name": "Alpha", "members": ["u3"], "size": 1},
+    {"$id": "t3", "name": "Charlie", "members": ["u2", "u4"], "size": 2},
+    {"$id": "t4", "name": "Delta", "members": []},
+]
+
+
+def ids(docs):
+    return [d["$id"] for d in docs]
+
+
+def test_equal_on_array_matches_any_element():
+    total, docs = apply_queries(TEAMS, [Query.equal("members", ["u2"])])
+    assert total == 2
+    assert ids(docs) == ["t1", "t3"]
+
+    _, docs = apply_queries(TEAMS, [Query.equal("members", ["u3", "u4"])])
+    assert ids(docs) == ["t2", "t3"]
+
+
+def test_equal_on_scalar():
+    _, docs = apply_queries(TEAMS, [Query.equal("name", ["Alpha", "Delta"])])
+    assert ids(docs) == ["t2", "t4"]
+
+
+def test_select_keeps_system_attributes_only():
+    _, docs = apply_queries(TEAMS, [Query.select(["name"]), Query.limit(1)])
+    assert docs == [{"$id": "t1", "name": "Bravo"}]
+
+
+def test_order_puts_missing_values_last_and_honours_key_order():
+    _, docs = apply_queries(TEAMS, [Query.order_asc("name")])
+    assert ids(docs) == ["t2", "t1", "t3", "t4"]
+
+    # size desc first, then name asc within the same size; t4 has no size
+    _, docs = apply_queries(TEAMS, [Query.order_desc("size"), Query.order_asc("name")])
+    assert ids(docs) == ["t1", "t3", "t2", "t4"]
+
+
+def test_cursor_pages_after_the_given_document():
+    queries = [Query.order_asc("name"), Query.limit(2)]
+    total, first = apply_queries(TEAMS, queries)
+    _, second = apply_queries(TEAMS, queries + [Query.cursor_after(first[-1]["$id"])])
+    assert total == 4
+    assert ids(first) == ["t2", "t1"]
+    assert ids(second) == ["t3", "t4"]
+
+
+def test_unknown_cursor_is_rejected():
+    with pytest.raises(AppwriteException) as e:
+        apply_queries(TEAMS, [Query.cursor_after("missing")])
+    assert e.value.code == 400
+
+
+def test_total_counts_filtered_docs_not_the_page():
+    docs = [{"$id": f"d{i}", "even": i % 2 == 0} for i in range(100)]
+    total, page = apply_queries(docs, [Query.equal("even", [True]), Query.limit(5)])
+    assert total == 50
+    assert len(page) == 5
+
+    total, page = apply_queries(docs)
+    assert total == 100
+    assert len(page) == DEFAULT_LIMIT
+
+
+def test_results_are_copies(fake):
+    fake.seed("teams", TEAMS)
+    doc = asyncio.run(fake.databases.get_document(None, "teams", "t1"))
+    doc["members"].append("intruder")
+    assert fake.collections["teams"]["t1"]["members"] == ["u1", "u2"]
+
+
+def test_get_document_applies_select(fake):
+    fake.seed("teams", TEAMS)
+    doc = asyncio.run(fake.databases.get_document(None, "teams", "t1", [Query.select(["size"])]))
+    assert set(doc) == {"$id", "$collectionId", "$databaseId", "size"}
+
+
+def test_array_operators_apply_to_the_stored_value(fake):
+    fake.seed("teams", TEAMS)
+
+    async def scenario():
+        db = fake.databases
+        await db.update_document(None, "teams", "t2", {"members": Operator.array_append(["u5", "u6"])})
+        return await db.update_document(None, "teams", "t2", {"members": Operator.array_remove("u3")})
+
+    assert asyncio.run(scenario())["members"] == ["u5", "u6"]
+
+
+def test_concurrent_array_operators_do_not_lose_writes(fake):
+    fake.latency, fake.jitter = 0.001, 0.005
+    fake.seed("teams", [{"$id": "t", "members": []}])
+
+    async def scenario():
+        db = fake.databases
+        await asyncio.gather(*[
+            db.update_document(None, "teams", "t", {"members": Operator.array_append([f"u{i}"])})
+            for i in range(30)
+        ])
+
+    asyncio.run(scenario())
+    assert sorted(fake.collections["teams"]["t"]["members"]) == sorted(f"u{i}" for i in range(30))
@@ -0,0 +1,51 @@
+import random
+from app.services.matching import MatchEngine, calculate_match_score
+
+
+def team(tid, looking_for):
+    return {"$id": tid, "looking_for": looking_for}
+
+
+def user(uid, skills):
+    return {"$id": uid, "skills": skills}
+
+
+def test_teams_ranked_by_score_with_unmatched_and_empty_teams_left_out():
+    teams = [
+        team("half", ["Python", "React"]),
+        team("full", ["python"]),
+        team("none", ["Go"]),
+        team("open", []),
+        team("third", ["Python", "Figma", "Rust"]),
+    ]
+    ranked = MatchEngine().rank_teams_for_user([" PYTHON ", "react"], teams, k=10)
+    # Equal scores keep the input order
+    assert [(score, t["$id"]) for score, t in ranked] == [(100, "half"), (100, "full"), (33, "third")]
+
+
+def test_users_ranked_for_team_top_k():
+    users = [user("a", ["Python"]), user("b", ["python", "sql"]), user("c", []), user("d", ["Go"])]
+    ranked = MatchEngine().rank_users_for_team(["Python", "SQL"], users, k=1)
+    assert [(score, u["$id"]) for score, u in ranked] == [(100, "b")]
+    assert MatchEngine().rank_users_for_team([], users) == []
+
+
+def test_bitset_scores_match_the_set_based_score():
+    rng = random.Random(11)
+    skills = [f"skill{i}" for i in range(40)]
+    users = [user(f"u{i}", rng.sample(skills, rng.randint(0, 8))) for i in range(300)]
+    wanted = rng.sample(skills, 6)
+
+    ranked = MatchEngine().rank_users_for_team(wanted, users, k=300)
+    expected = sorted(
+        ((calculate_match_score(u["skills"], wanted), u["$id"]) for u in users),
+        key=lambda s: -s[0],
+    )
+    assert [(score, u["$id"]) for score, u in ranked] == [s for s in expected if s[0] > 0]
+
+
+def test_vocabulary_is_per_engine():
+    first = MatchEngine()
+    first.rank_users_for_team(["a", "b"], [user("u", ["c", "d", "e"])])
+    assert len(first.vocab) == 5
+    assert len(MatchEngine().vocab) == 0
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import pytest
+from app.core.config import settings
+from app.services.summary_queue import FakeSummaryBackend, SummaryQueue, TokenBucket
+
+HACKATHONS = settings.COLLECTION_HACKATHONS
+
+
+class ScriptedBackend:
+    """Summary = first sentence; each text can be given its own delay."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.texts = []
+
+    async def summarize(self, text):
+        self.texts.append(text)
+        await asyncio.sleep(self.delays.get(text, 0))
+        return text.split(". ")[0]
+
+
+@pytest.fixture
+def hackathon(fake):
+    fake.seed(HACKATHONS, [{"$id": "h1", "name": "Hack"}])
+    return fake
+
+
+def run_queue(queue, scenario):
+    async def main():
+        queue.start()
+        try:
+            await scenario()
+            await queue.join()
+        finally:
+            await queue.stop()
+    asyncio.run(main())
+
+
+def test_reenqueued_waiting_job_runs_once_with_the_latest_text(hackathon):
+    backend = ScriptedBackend()
+    queue = SummaryQueue(backend, workers=1, rate=100, burst=10)
+
+    async def scenario():
+        for version in ("First. a", "Second. b", "Third. c"):
+            queue.enqueue("h1", version)
+
+    run_queue(queue, scenario)
+    assert backend.texts == ["Third. c"]
+    assert hackathon.collections[HACKATHONS]["h1"][settings.AI_SUMMARY_ATTRIBUTE] == "Third"
+    assert queue.stats()["completed"] == 1
+
+
+def test_slow_job_for_an_old_text_does_not_overwrite_a_newer_summary(hackathon):
+    backend = ScriptedBackend(delays={"Old. a": 0.05})
+    queue = SummaryQueue(backend, workers=2, rate=100, burst=10)
+
+    async def scenario():
+        queue.enqueue("h1", "Old. a")
+        await asyncio.sleep(0.01)   # first worker is busy with the old text
+        queue.enqueue("h1", "New. b")
+
+    run_queue(queue, scenario)
+    assert hackathon.collections[HACKATHONS]["h1"][settings.AI_SUMMARY_ATTRIBUTE] == "New"
+    assert queue.stats()["superseded"] == 1
+    assert queue.stats()["completed"] == 1
+
+
+def test_final_failure_is_counted_and_logged(hackathon, caplog):
+    queue = SummaryQueue(FakeSummaryBackend(failure_rate=1), workers=1, rate=100, burst=10,
+                         max_retries=2, retry_delay=0)
+
+    async def scenario():
+        queue.enqueue("h1", "Some text. More.")
+
+    with caplog.at_level(logging.ERROR, logger="hackconnect.summaries"):
+        run_queue(queue, scenario)
+    assert queue.stats()["failed"] == 1
+    assert queue.stats()["retries"] == 2
+    assert "h1" in caplog.text
+
+
+@pytest.mark.parametrize("rate, capacity", [(0, 5), (-1, 5), (1, 0)])
+def test_token_bucket_rejects_settings_that_would_stall(rate, capacity):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, capacity)
+
+
+def test_disabled_queue_ignores_rate():
+    queue = SummaryQueue(None, rate=0)
+    queue.enqueue("h1", "text")
+    assert queue.stats()["queued"] == 0
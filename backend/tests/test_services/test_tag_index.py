@@ -0,0 +1,95 @@
+import asyncio
+import random
+from app.core.config import settings
+from app.services.tag_index import HackathonTagIndex
+
+
+def hackathon(hid, tags, status="upcoming", start="2026-01-01"):
+    return {"$id": hid, "name": hid, "tags": tags, "status": status, "start_date": start}
+
+
+def ids(docs):
+    return [d["$id"] for d in docs]
+
+
+def test_upsert_indexes_new_and_updated_tags():
+    index = HackathonTagIndex()
+    index.upsert(hackathon("h1", ["AI", "Web3"]))
+    assert ids(index.query([" ai "])) == ["h1"]   # tags match case- and whitespace-insensitively
+
+    index.upsert(hackathon("h1", ["Climate"]))
+    assert index.query(["AI"]) == []
+    assert ids(index.query(["climate"])) == ["h1"]
+    assert index.stats()["tags"] == 1
+
+
+def test_status_change_is_seen_by_the_status_filter():
+    index = HackathonTagIndex()
+    index.upsert(hackathon("h1", ["AI"], status="upcoming"))
+    assert ids(index.query(["AI"], status="upcoming")) == ["h1"]
+
+    index.upsert(hackathon("h1", ["AI"], status="ongoing"))
+    assert index.query(["AI"], status="upcoming") == []
+    assert ids(index.query(["AI"], status="ongoing")) == ["h1"]
+    assert ids(index.all(status="ongoing")) == ["h1"]
+
+
+def test_remove_drops_doc_and_empty_postings():
+    index = HackathonTagIndex()
+    index.upsert(hackathon("h1", ["AI"]))
+    index.remove("h1")
+    index.remove("missing")
+    assert index.query(["AI"]) == []
+    assert index.stats() == {"hackathons": 0, "tags": 0, "age_seconds": None}
+
+
+def test_ranked_by_overlap_then_status_then_start_date():
+    index = HackathonTagIndex()
+    index.replace_all([
+        hackathon("one-tag", ["AI"], status="ongoing"),
+        hackathon("ended", ["AI", "Web3"], status="ended"),
+        hackathon("late", ["AI", "Web3"], start="2026-06-01"),
+        hackathon("early", ["AI", "Web3"], start="2026-02-01"),
+        hackathon("live", ["AI", "Web3"], status="ongoing", start="2026-09-01"),
+        hackathon("other", ["Health"]),
+    ])
+    assert ids(index.query(["AI", "Web3"])) == ["live", "early", "late", "ended", "one-tag"]
+
+
+def test_top_k_matches_a_full_sort():
+    rng = random.Random(7)
+    tags = [f"t{i}" for i in range(12)]
+    index = HackathonTagIndex()
+    index.replace_all([
+        hackathon(f"h{i:03}", rng.sample(tags, 4), status=rng.choice(["upcoming", "ongoing", "ended", "draft"]),
+                  start=f"2026-{rng.randint(1, 12):02}-01")
+        for i in range(300)
+    ])
+    wanted = tags[:5]
+    full = index.query(wanted)
+    for k in (1, 10, 50):
+        assert index.query(wanted, limit=k) == full[:k]
+
+
+def test_zero_limit_returns_nothing():
+    index = HackathonTagIndex()
+    index.replace_all([hackathon("h1", ["AI"]), hackathon("h2", ["AI"])])
+    assert index.query(["AI"], limit=0) == []
+    assert index.all(limit=0) == []
+    assert len(index.all()) == 2
+
+
+def test_concurrent_callers_share_one_build_on_every_loop(fake):
+    fake.latency = 0.002
+    fake.seed(settings.COLLECTION_HACKATHONS, [hackathon("h1", ["AI"]), hackathon("h2", ["Web3"])])
+    index = HackathonTagIndex()
+
+    async def scenario():
+        index._built_at = None   # force a rebuild
+        calls = fake.calls
+        await asyncio.gather(*[index.ensure_built() for _ in range(5)])
+        return fake.calls - calls
+
+    for _ in range(2):   # a second asyncio.run must not trip over the build lock
+        assert asyncio.run(scenario()) == 1
+    assert ids(index.query(["ai", "web3"])) == ["h1", "h2"]
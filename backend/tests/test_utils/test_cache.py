@@ -0,0 +1,49 @@
+import pytest
+from app.utils import cache
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    c = TTLCache(ttl=10)
+    c.set("k", "v")
+    clock[0] += 9.9
+    assert c.get("k") == "v"
+    clock[0] += 0.1
+    assert c.get("k") is None
+    assert "k" not in c
+    assert c.stats()["expirations"] == 1
+    assert len(c) == 0
+
+
+def test_set_refreshes_expiry(clock):
+    c = TTLCache(ttl=10)
+    c.set("k", 1)
+    clock[0] += 8
+    c.set("k", 2)
+    clock[0] += 8
+    assert c.get("k") == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    c = TTLCache(maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+    assert "a" in c
+    assert "b" not in c
+    assert c.stats()["evictions"] == 1
+
+
+def test_falsy_values_are_cached(clock):
+    c = TTLCache()
+    c.set("empty", [])
+    assert c.get("empty", "default") == []
+    assert "empty" in c
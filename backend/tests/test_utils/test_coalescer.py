@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from app.utils.coalescer import WriteCoalescer
+
+
+def test_writes_in_one_window_are_flushed_together():
+    flushes = []
+
+    async def flush_fn(key, items):
+        flushes.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+    async def scenario():
+        coalescer = WriteCoalescer(flush_fn, window=0.01)
+        results = await asyncio.gather(
+            coalescer.submit("t1", "a"), coalescer.submit("t1", "b"), coalescer.submit("t2", "c"),
+        )
+        return coalescer, results
+
+    coalescer, results = asyncio.run(scenario())
+    assert results == ["t1:a", "t1:b", "t2:c"]
+    assert sorted(flushes) == [("t1", ["a", "b"]), ("t2", ["c"])]
+    assert coalescer.stats()["largest_batch"] == 2
+    assert coalescer.stats()["pending_keys"] == 0
+
+
+def test_per_item_exceptions_only_reach_their_caller():
+    async def flush_fn(key, items):
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    async def scenario():
+        coalescer = WriteCoalescer(flush_fn)
+        return await asyncio.gather(
+            coalescer.submit("k", "ok"), coalescer.submit("k", "bad"), return_exceptions=True,
+        )
+
+    ok, bad = asyncio.run(scenario())
+    assert ok == "ok"
+    assert isinstance(bad, ValueError)
+
+
+def test_flush_failure_reaches_every_caller():
+    async def flush_fn(key, items):
+        raise RuntimeError("write failed")
+
+    async def scenario():
+        coalescer = WriteCoalescer(flush_fn)
+        await asyncio.gather(coalescer.submit("k", 1), coalescer.submit("k", 2))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
+
+
+def test_max_batch_size_flushes_without_waiting_for_the_window():
+    sizes = []
+
+    async def flush_fn(key, items):
+        sizes.append(len(items))
+        return list(items)
+
+    async def scenario():
+        coalescer = WriteCoalescer(flush_fn, window=10, max_batch_size=3)
+        return await asyncio.gather(*[coalescer.submit("k", i) for i in range(6)])
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 1)) == list(range(6))
+    assert sizes == [3, 3]
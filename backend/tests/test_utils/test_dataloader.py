@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from app.utils.dataloader import BatchLoader
+
+
+def make_loader(**kwargs):
+    calls = []
+
+    async def batch_fn(keys):
+        calls.append(list(keys))
+        await asyncio.sleep(0)
+        return {k: k.upper() for k in keys if k != "missing"}
+
+    return BatchLoader(batch_fn, **kwargs), calls
+
+
+def test_concurrent_loads_share_one_batch():
+    async def scenario():
+        loader, calls = make_loader()
+        values = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("a"))
+        return loader, calls, values
+
+    loader, calls, values = asyncio.run(scenario())
+    assert values == ["A", "B", "A"]
+    assert calls == [["a", "b"]]
+    assert loader.stats()["coalesced"] == 1
+    assert loader.stats()["inflight"] == 0
+
+
+def test_missing_keys_resolve_to_none():
+    async def scenario():
+        loader, _ = make_loader()
+        return await loader.load_many(["x", "missing", "x"])
+
+    assert asyncio.run(scenario()) == {"x": "X", "missing": None}
+
+
+def test_max_batch_size_dispatches_early():
+    async def scenario():
+        loader, calls = make_loader(delay=10, max_batch_size=2)
+        await loader.load_many(["a", "b", "c", "d"])
+        return calls
+
+    # With a 10s delay, finishing at all means both batches went out on size
+    assert asyncio.run(asyncio.wait_for(scenario(), 1)) == [["a", "b"], ["c", "d"]]
+
+
+def test_batch_error_reaches_every_waiter():
+    async def batch_fn(keys):
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        loader = BatchLoader(batch_fn)
+        return await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_caller_does_not_cancel_other_waiters():
+    async def scenario():
+        loader, _ = make_loader(delay=0.01)
+        first = asyncio.ensure_future(loader.load("a"))
+        second = asyncio.ensure_future(loader.load("a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first
+
+    value, first = asyncio.run(scenario())
+    assert value == "A"
+    with pytest.raises(asyncio.CancelledError):
+        first.result()
@@ -0,0 +1,77 @@
+import asyncio
+from app.utils.locks import KeyedLocks, LoopLocal
+
+
+def test_same_key_is_serialized_different_keys_are_not():
+    async def scenario():
+        locks = KeyedLocks()
+        log = []
+
+        async def worker(key, name):
+            async with locks.hold(key):
+                log.append(f"{name} in")
+                await asyncio.sleep(0.01)
+                log.append(f"{name} out")
+
+        await asyncio.gather(worker("team", "a"), worker("team", "b"), worker("other", "c"))
+        return locks, log
+
+    locks, log = asyncio.run(scenario())
+    # a and b never overlap; c runs alongside a
+    assert log.index("a out") < log.index("b in")
+    assert log.index("c in") < log.index("a out")
+    assert locks.stats()["contended"] == 1
+
+
+def test_idle_keys_are_evicted():
+    async def scenario():
+        locks = KeyedLocks(shards=4)
+        sizes = []
+
+        async def worker(key):
+            async with locks.hold(key):
+                sizes.append(len(locks))
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*[worker(f"team{i % 10}") for i in range(50)])
+        return locks, sizes
+
+    locks, sizes = asyncio.run(scenario())
+    assert max(sizes) == 10
+    assert len(locks) == 0
+    assert locks.stats()["acquisitions"] == 50
+
+
+def test_lock_is_released_and_evicted_when_the_body_raises():
+    async def scenario():
+        locks = KeyedLocks()
+        try:
+            async with locks.hold("k"):
+                raise ValueError
+        except ValueError:
+            pass
+        return locks
+
+    assert len(asyncio.run(scenario())) == 0
+
+
+def test_loop_local_primitives_survive_a_new_event_loop():
+    lock = LoopLocal(asyncio.Lock)
+
+    async def contend():
+        async def worker():
+            async with lock.get():
+                await asyncio.sleep(0.001)
+        await asyncio.gather(worker(), worker())
+
+    asyncio.run(contend())
+    asyncio.run(contend())   # a shared asyncio.Lock would now be bound to the first loop
+
+
+def test_loop_local_is_shared_within_a_loop():
+    semaphore = LoopLocal(lambda: asyncio.Semaphore(2))
+
+    async def same():
+        return semaphore.get() is semaphore.get()
+
+    assert asyncio.run(same())
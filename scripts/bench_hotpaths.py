@@ -0,0 +1,300 @@
+"""
+Micro-benchmarks for the backend's pure-Python request-path code.
+
+Covers team enrichment, the recommendations tag index and the
+get_recommendations handler (tag + status filtering, ranking, rendering),
+profile assembly, match scoring and Pydantic validation of the main
+request/response models, over fixed synthetic datasets (seeded, so runs are
+comparable).
+
+Results can be saved as a baseline and later checked against it; the check
+fails (exit 1) when a benchmark is slower than baseline * threshold, and
+stays slower when re-measured. A fixed calibration loop is timed before every
+benchmark and baselines are scaled by the median of those timings, so a busy
+or different machine does not read as a regression. Still, prefer
+regenerating the baseline (--save) on the machine that runs --check.
+
+Usage (from the repo root):
+    python scripts/bench_hotpaths.py                         # 1k and 10k docs
+    python scripts/bench_hotpaths.py --sizes 1000 10000 100000
+    python scripts/bench_hotpaths.py --save                  # write scripts/bench_baseline.json
+    python scripts/bench_hotpaths.py --check --threshold 1.5
+    python scripts/bench_hotpaths.py --only tag_index
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.api.routes.hackathons import get_recommendations  # noqa: E402
+from app.api.routes.teams import _enrich_team  # noqa: E402
+from app.models.hackathon import HackathonCreate  # noqa: E402
+from app.models.team import TeamCreate  # noqa: E402
+from app.models.user import UserResponse  # noqa: E402
+from app.services.matching import MatchEngine, SkillVocabulary, calculate_match_score  # noqa: E402
+from app.services.tag_index import HackathonTagIndex, tag_index  # noqa: E402
+from app.utils.profiles import build_user_profile  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+SKILLS = [f"skill{i}" for i in range(60)] + ["Python", "React", "ML", "Design", "Rust", "Go"]
+TAGS = [f"tag{i}" for i in range(40)] + ["AI", "Web3", "Health", "FinTech", "Climate"]
+STATUSES = ["upcoming", "ongoing", "ended", "draft"]
+TIMESTAMP = "2026-10-01T09:00:00.000+00:00"
+
+
+# --- SYNTHETIC DATASETS ---
+
+def make_users(rng, n):
+    return [{
+        "$id": f"user{i}", "username": f"user{i}", "account_id": f"user{i}", "role": "participant",
+        "bio": "Hi!", "skills": rng.sample(SKILLS, 4), "tech_stack": rng.sample(SKILLS, 2),
+        "xp": rng.randint(0, 5000), "reputation_score": rng.random() * 5,
+        "$createdAt": TIMESTAMP, "$updatedAt": TIMESTAMP,
+    } for i in range(n)]
+
+
+def make_teams(rng, n, user_ids):
+    return [{
+        "$id": f"team{i}", "name": f"Team {i}", "description": "We build things", "hackathon_id": f"hack{i % 50}",
+        "leader_id": user_ids[i % len(user_ids)], "members": rng.sample(user_ids, 3),
+        "join_requests": rng.sample(user_ids, rng.randint(0, 3)), "looking_for": rng.sample(SKILLS, 3),
+        "tech_stack": rng.sample(SKILLS, 2), "status": "open",
+    } for i in range(n)]
+
+
+def make_hackathons(rng, n):
+    return [{
+        "$id": f"hack{i}", "name": f"Hackathon {i}", "description": "An event", "location": "Online",
+        "start_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T09:00:00",
+        "end_date": "2026-12-31T21:00:00", "tags": rng.sample(TAGS, rng.randint(1, 4)),
+        "status": rng.choice(STATUSES), "organizer_id": f"user{i}", "mode": "online",
+        "min_team_size": 1, "max_team_size": 4,
+    } for i in range(n)]
+
+
+# --- BENCHMARKS ---
+# Each takes (rng, n) and returns a zero-arg callable that runs the workload once.
+
+def bench_enrich_teams(rng, n):
+    users = make_users(rng, max(100, n // 4))
+    teams = make_teams(rng, n, [u["$id"] for u in users])
+    user_map = {u["$id"]: u["username"] for u in users}
+
+    def run():
+        for team in teams:
+            _enrich_team(team, user_map)
+    return run
+
+
+def bench_tag_index_build(rng, n):
+    docs = make_hackathons(rng, n)
+
+    def run():
+        HackathonTagIndex().replace_all(docs)
+    return run
+
+
+def bench_tag_index_query(rng, n):
+    index = HackathonTagIndex()
+    index.replace_all(make_hackathons(rng, n))
+    queries = [rng.sample(TAGS, 3) for _ in range(100)]
+
+    def run():
+        for tags in queries:
+            index.query(tags, limit=20)
+    return run
+
+
+def bench_get_recommendations(rng, n):
+    """The route handler itself: tag + status filtering, ranking and the JSON response."""
+    tag_index.replace_all(make_hackathons(rng, n))
+    # One in ten without tags, which takes the tag_index.all() branch
+    requests = [(rng.sample(TAGS, 3) if i % 10 else [], rng.choice([None] + STATUSES)) for i in range(100)]
+    loop = asyncio.new_event_loop()
+
+    async def batch():
+        for tags, status in requests:
+            await get_recommendations(tags, limit=20, status=status)
+
+    def run():
+        loop.run_until_complete(batch())
+    return run
+
+
+def bench_build_user_profile(rng, n):
+    docs = make_users(rng, n)
+    auth = [{"$id": d["$id"], "email": f"{d['$id']}@example.com", "name": d["username"]} for d in docs]
+    pairs = list(zip(docs, auth))
+
+    def run():
+        for doc, auth_user in pairs:
+            build_user_profile(doc, auth_user)
+    return run
+
+
+def bench_calculate_match_score(rng, n):
+    pairs = [(rng.sample(SKILLS, 4), rng.sample(SKILLS, 3)) for _ in range(n)]
+
+    def run():
+        for user_skills, wanted in pairs:
+            calculate_match_score(user_skills, wanted)
+    return run
+
+
+def bench_rank_teams_for_user(rng, n):
+    engine = MatchEngine(SkillVocabulary())
+    teams = make_teams(rng, n, [f"user{i}" for i in range(100)])
+    profiles = [rng.sample(SKILLS, 4) for _ in range(10)]
+
+    def run():
+        for skills in profiles:
+            engine.rank_teams_for_user(skills, teams, k=10)
+    return run
+
+
+def bench_validate_hackathon_create(rng, n):
+    payloads = make_hackathons(rng, n)
+
+    def run():
+        for p in payloads:
+            HackathonCreate.model_validate(p)
+    return run
+
+
+def bench_validate_team_create(rng, n):
+    payloads = make_teams(rng, n, [f"user{i}" for i in range(100)])
+
+    def run():
+        for p in payloads:
+            TeamCreate.model_validate(p)
+    return run
+
+
+def bench_validate_user_response(rng, n):
+    docs = make_users(rng, n)
+    payloads = [build_user_profile(d, {"email": f"{d['$id']}@example.com", "name": d["username"]}) for d in docs]
+
+    def run():
+        for p in payloads:
+            UserResponse.model_validate(p)
+    return run
+
+
+BENCHMARKS = {
+    "enrich_teams": bench_enrich_teams,
+    "tag_index_build": bench_tag_index_build,
+    "tag_index_query": bench_tag_index_query,
+    "get_recommendations": bench_get_recommendations,
+    "build_user_profile": bench_build_user_profile,
+    "calculate_match_score": bench_calculate_match_score,
+    "rank_teams_for_user": bench_rank_teams_for_user,
+    "validate_hackathon_create": bench_validate_hackathon_create,
+    "validate_team_create": bench_validate_team_create,
+    "validate_user_response": bench_validate_user_response,
+}
+
+
+def calibration():
+    """Fixed pure-Python workload (dicts, lists, strings) used to normalise machine speed."""
+    data = [{"id": str(i), "tags": [f"t{i % 7}", f"t{i % 11}"]} for i in range(2000)]
+    counts = {}
+    for doc in data:
+        for tag in doc["tags"]:
+            counts[tag] = counts.get(tag, 0) + 1
+    return sorted(counts.items(), key=lambda kv: kv[1])
+
+
+def measure(fn, repeat: int, min_time: float) -> float:
+    """
+    Best-of-`repeat` seconds per call; each sample loops until `min_time` has passed.
+    GC is paused while timing (as timeit does) so collections do not add noise.
+    """
+    fn()  # warm-up
+    best = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            loops, start = 0, time.perf_counter()
+            while True:
+                fn()
+                loops += 1
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_time:
+                    break
+            best = min(best, elapsed / loops)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run a subset")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="fail if slower than baseline * threshold")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args()
+
+    results = {}
+    workloads = {}
+    calibrations = []
+    print(f"{'benchmark':34} {'docs':>7} {'total':>10} {'per doc':>10}")
+    for name in args.only or BENCHMARKS:
+        for n in args.sizes:
+            # Calibrate next to every benchmark: machine speed drifts during a run
+            calibrations.append(measure(calibration, args.repeat, args.min_time))
+            fn = workloads[f"{name}[{n}]"] = BENCHMARKS[name](random.Random(n), n)
+            seconds = measure(fn, args.repeat, args.min_time)
+            results[f"{name}[{n}]"] = seconds
+            print(f"{name:34} {n:7} {seconds * 1000:8.2f}ms {seconds / n * 1e9:8.0f}ns")
+    calibration_seconds = statistics.median(calibrations)
+    print(f"\ncalibration: {calibration_seconds * 1000:.3f}ms (median of {len(calibrations)})")
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": f"{platform.python_implementation()} {platform.python_version()} {platform.machine()}",
+                       "calibration": calibration_seconds, "results": results}, f, indent=2, sort_keys=True)
+        print(f"\nsaved baseline to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        speed = calibration_seconds / stored["calibration"]
+        baseline = {key: seconds * speed for key, seconds in stored["results"].items()}
+        regressions = []
+        print(f"\nmachine speed vs baseline: {1 / speed:.2f}x (baselines scaled accordingly)")
+        print(f"{'benchmark':44} {'baseline':>10} {'now':>10} {'ratio':>7}")
+        for key, seconds in results.items():
+            if key not in baseline:
+                continue
+            ratio = seconds / baseline[key]
+            if ratio > args.threshold:
+                # One noisy sample is not a regression: it has to reproduce
+                seconds = min(seconds, measure(workloads[key], args.repeat, args.min_time))
+                ratio = seconds / baseline[key]
+            flag = "  REGRESSION" if ratio > args.threshold else ""
+            print(f"{key:44} {baseline[key] * 1000:8.2f}ms {seconds * 1000:8.2f}ms {ratio:6.2f}x{flag}")
+            if flag:
+                regressions.append(key)
+        if regressions:
+            print(f"\nFAIL: {len(regressions)} benchmark(s) slower than {args.threshold:.2f}x baseline")
+            sys.exit(1)
+        print(f"\nOK: all within {args.threshold:.2f}x baseline")
+
+
+if __name__ == "__main__":
+    main()
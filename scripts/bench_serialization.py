@@ -0,0 +1,93 @@
+"""
+Serialization and bytes-on-wire benchmark for the list endpoints.
+
+Compares how a list page used to be rendered (FastAPI's jsonable_encoder +
+JSONResponse) with FastJSONResponse (orjson when installed, no encoder pass),
+on payloads shaped like GET /api/teams/ (enriched teams) and
+GET /api/hackathons/. For each it also reports the body size raw, gzipped
+and brotli-compressed at the levels CompressionMiddleware uses.
+
+Usage (from the repo root):
+    python scripts/bench_serialization.py                  # 25 and 100 docs per page
+    python scripts/bench_serialization.py --sizes 25 100 1000
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from app.api.routes.teams import _enrich_team  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.utils import responses  # noqa: E402
+from app.utils.responses import FastJSONResponse  # noqa: E402
+from bench_hotpaths import make_hackathons, make_teams, make_users, measure  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# --- PAYLOADS ---
+# Each takes (rng, n) and returns the dict a list endpoint hands to its response class.
+
+def teams_page(rng, n):
+    users = make_users(rng, max(100, n))
+    teams = make_teams(rng, n, [u["$id"] for u in users])
+    user_map = {u["$id"]: u["username"] for u in users}
+    for team in teams:
+        _enrich_team(team, user_map)
+    return {"total": n * 4, "documents": teams, "next_cursor": teams[-1]["$id"]}
+
+
+def hackathons_page(rng, n):
+    docs = make_hackathons(rng, n)
+    return {"success": True, "documents": docs, "total": n * 4, "next_cursor": docs[-1]["$id"]}
+
+
+PAYLOADS = {
+    "teams": teams_page,
+    "hackathons": hackathons_page,
+}
+
+
+def render_default(payload):
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def render_fast(payload):
+    return FastJSONResponse(payload).body
+
+
+def wire_sizes(body: bytes) -> str:
+    gz = len(gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL))
+    br = len(brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)) if brotli else None
+    return f"{len(body):>9} {gz:>9} {br if br is not None else '-':>9}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if responses.orjson is not None else 'no (stdlib fallback)'}, "
+          f"brotli: {'yes' if brotli is not None else 'no'}\n")
+    print(f"{'payload':12} {'docs':>6} {'renderer':9} {'encode':>10} {'speedup':>8} {'raw B':>9} {'gzip B':>9} {'br B':>9}")
+    for name, make in PAYLOADS.items():
+        for n in args.sizes:
+            payload = make(random.Random(n), n)
+            before = measure(lambda: render_default(payload), args.repeat, args.min_time)
+            after = measure(lambda: render_fast(payload), args.repeat, args.min_time)
+            print(f"{name:12} {n:6} {'default':9} {before * 1000:8.3f}ms {'':>8} {wire_sizes(render_default(payload))}")
+            print(f"{name:12} {n:6} {'fast':9} {after * 1000:8.3f}ms {before / after:7.1f}x {wire_sizes(render_fast(payload))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Startup benchmark: how long until the backend is ready to serve.
+
+Each run starts a fresh interpreter, imports app.main and runs the FastAPI
+lifespan startup (what a serverless cold start does before the first request).
+Exits non-zero if the median exceeds the budget, so it can gate CI.
+
+Usage (from the repo root):
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --budget 1.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+# Runs inside the child interpreter; prints "<import seconds> <ready seconds>"
+CHILD = """
+import asyncio, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    return ready
+
+ready = asyncio.run(startup())
+loaded = [m for m in ("google.generativeai", "httpx") if m in sys.modules]
+print(imported - start, ready - start, ",".join(loaded) or "-")
+"""
+
+
+def run_once():
+    wall_start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - wall_start
+    if result.returncode != 0:
+        sys.exit(f"startup failed:\n{result.stderr[-2000:]}")
+    imported, ready, loaded = result.stdout.split()
+    return float(imported), float(ready), wall, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", "1.5")),
+                        help="max median seconds from interpreter start to ready (default 1.5)")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    imports = [r[0] for r in runs]
+    readies = [r[1] for r in runs]
+    walls = [r[2] for r in runs]
+
+    print(f"runs: {args.runs}")
+    print(f"import app.main   median {statistics.median(imports) * 1000:7.1f} ms   max {max(imports) * 1000:7.1f} ms")
+    print(f"ready (lifespan)  median {statistics.median(readies) * 1000:7.1f} ms   max {max(readies) * 1000:7.1f} ms")
+    print(f"process wall      median {statistics.median(walls) * 1000:7.1f} ms   max {max(walls) * 1000:7.1f} ms")
+    print(f"lazy subsystems loaded at startup: {runs[0][3]}")
+
+    median_wall = statistics.median(walls)
+    if median_wall > args.budget:
+        print(f"FAIL: median startup {median_wall:.3f}s exceeds budget {args.budget:.3f}s")
+        sys.exit(1)
+    print(f"OK: median startup {median_wall:.3f}s within budget {args.budget:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Hackathon-day load test.
+
+Replays an event-day traffic mix against the FastAPI app, in process, with the
+in-memory Appwrite fake standing in for the real project (so it runs on a
+laptop and results are comparable between branches). The day is split into
+phases with their own mix:
+
+    registration   sign-up and login bursts, browsing hackathons
+    formation      team browsing, join / approve / reject churn, dashboard polling
+    crunch         submissions, judging spike (single and batch scores), leaderboard and dashboard polling
+
+Reports throughput and p50/p95/p99 latency, 4xx and 5xx rates per route.
+
+Usage (from the repo root):
+    python scripts/load_test.py
+    python scripts/load_test.py --users 200 --phase-seconds 10 --latency-ms 20 --error-rate 0.01
+    python scripts/load_test.py --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+# Keep the N+1 detector quiet; the load test reports its own numbers
+os.environ.setdefault("UPSTREAM_CHECK_MODE", "off")
+os.environ.setdefault("AI_SUMMARY_BACKEND", "off")
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.fake_appwrite import install_fake_backend  # noqa: E402
+
+SKILLS = ["python", "react", "ml", "design", "rust", "go", "devops", "web3", "ios", "android"]
+TAGS = ["AI", "Web3", "Health", "FinTech", "Climate", "EdTech", "Gaming"]
+
+
+class EventState:
+    """What the simulated participants know about (IDs they can act on)."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.hackathons = []
+        self.users = []
+        self.organizers = {}              # hackathon_id -> organizer user id
+        self.teams = {}                   # team_id -> {"hackathon_id", "leader_id", "members", "requests"}
+        self.submissions = defaultdict(list)  # hackathon_id -> [submission_id]
+        self.judges = []
+
+    def hackathon(self):
+        return self.rng.choice(self.hackathons)
+
+    def user(self):
+        return self.rng.choice(self.users)
+
+    def team(self):
+        return self.rng.choice(list(self.teams)) if self.teams else None
+
+
+def seed(fake, state: EventState, hackathons: int, users: int, teams: int):
+    """Pre-event data, written straight into the fake (no latency)."""
+    rng = state.rng
+    for i in range(users):
+        uid = f"user{i:05d}"
+        fake.seed_user(uid, f"{uid}@example.com", f"User {i}")
+        state.users.append(uid)
+    fake.seed(settings.COLLECTION_USERS, [
+        {"$id": uid, "username": uid, "account_id": uid, "role": "participant", "xp": 0,
+         "reputation_score": 0.0, "skills": rng.sample(SKILLS, 3), "tech_stack": [], "bio": ""}
+        for uid in state.users
+    ])
+    state.judges = state.users[:max(1, users // 50)]
+
+    docs = []
+    for i in range(hackathons):
+        hid = f"hack{i:03d}"
+        state.hackathons.append(hid)
+        state.organizers[hid] = state.users[i % len(state.users)]
+        docs.append({
+            "$id": hid, "name": f"Hackathon {i}", "description": "An event", "tagline": "Build things",
+            "start_date": "2026-10-01T09:00:00.000+00:00", "end_date": "2026-10-02T21:00:00.000+00:00",
+            "location": "Online", "mode": "online", "tags": rng.sample(TAGS, 2), "status": "ongoing",
+            "organizer_id": state.organizers[hid], "min_team_size": 1, "max_team_size": 4,
+        })
+    fake.seed(settings.COLLECTION_HACKATHONS, docs)
+
+    docs = []
+    for i in range(teams):
+        tid = f"team{i:05d}"
+        hid = state.hackathons[i % hackathons]
+        members = rng.sample(state.users, rng.randint(1, 3))
+        state.teams[tid] = {"hackathon_id": hid, "leader_id": members[0], "members": list(members), "requests": []}
+        docs.append({
+            "$id": tid, "name": f"Team {i}", "description": "We build", "hackathon_id": hid,
+            "leader_id": members[0], "members": members, "join_requests": [],
+            "looking_for": rng.sample(SKILLS, 2), "tech_stack": rng.sample(SKILLS, 2), "status": "open",
+        })
+    fake.seed(settings.COLLECTION_TEAMS, docs)
+
+
+# --- SCENARIOS ---
+# Each returns (route label, method, path, json body or None), or None to skip.
+
+def register(s):
+    n = uuid.uuid4().hex[:10]
+    return ("POST /api/auth/register", "POST", "/api/auth/register",
+            {"email": f"{n}@example.com", "password": "password123", "name": f"New {n}", "username": n})
+
+
+def login(s):
+    return ("POST /api/auth/login", "POST", "/api/auth/login", {"id": s.user()})
+
+
+def list_hackathons(s):
+    return ("GET /api/hackathons/", "GET", "/api/hackathons/?limit=25", None)
+
+
+def get_hackathon(s):
+    return ("GET /api/hackathons/{hackathon_id}", "GET", f"/api/hackathons/{s.hackathon()}", None)
+
+
+def recommendations(s):
+    return ("POST /api/hackathons/recommendations", "POST", "/api/hackathons/recommendations", s.rng.sample(TAGS, 2))
+
+
+def list_teams(s):
+    return ("GET /api/teams/", "GET", "/api/teams/?limit=25", None)
+
+
+def hackathon_teams(s):
+    return ("GET /api/hackathons/{hackathon_id}/teams", "GET", f"/api/hackathons/{s.hackathon()}/teams?limit=25", None)
+
+
+def get_team(s):
+    tid = s.team()
+    return tid and ("GET /api/teams/{team_id}", "GET", f"/api/teams/{tid}", None)
+
+
+def match(s):
+    return ("GET /api/teams/match/{user_id}", "GET", f"/api/teams/match/{s.user()}?hackathon_id={s.hackathon()}", None)
+
+
+def join(s):
+    tid = s.team()
+    if tid is None:
+        return None
+    uid = s.user()
+    team = s.teams[tid]
+    if uid not in team["members"] and uid not in team["requests"]:
+        team["requests"].append(uid)
+    return ("POST /api/teams/join", "POST", "/api/teams/join", {"team_id": tid, "user_id": uid})
+
+
+def _pending(s):
+    candidates = [tid for tid, t in s.teams.items() if t["requests"]]
+    if not candidates:
+        return None
+    tid = s.rng.choice(candidates)
+    team = s.teams[tid]
+    return tid, team, team["requests"].pop(0)
+
+
+def approve(s):
+    picked = _pending(s)
+    if picked is None:
+        return None
+    tid, team, uid = picked
+    team["members"].append(uid)
+    return ("POST /api/teams/approve", "POST", "/api/teams/approve",
+            {"team_id": tid, "leader_id": team["leader_id"], "target_user_id": uid})
+
+
+def reject(s):
+    picked = _pending(s)
+    if picked is None:
+        return None
+    tid, team, uid = picked
+    return ("POST /api/teams/reject", "POST", "/api/teams/reject",
+            {"team_id": tid, "leader_id": team["leader_id"], "target_user_id": uid})
+
+
+def dashboard(s):
+    return ("GET /api/organizer/{hackathon_id}/stats", "GET", f"/api/organizer/{s.hackathon()}/stats", None)
+
+
+def submit(s):
+    tid = s.team()
+    if tid is None:
+        return None
+    hid = s.teams[tid]["hackathon_id"]
+    return ("POST /api/submissions/", "POST", "/api/submissions/", {
+        "hackathon_id": hid, "team_id": tid, "project_title": f"Project {tid}",
+        "description": "What we built", "repo_links": [], "demo_video_url": "https://example.com/demo",
+    })
+
+
+def list_submissions(s):
+    return ("GET /api/submissions/{hackathon_id}", "GET", f"/api/submissions/{s.hackathon()}?limit=25", None)
+
+
+def score(s):
+    hid = s.rng.choice([h for h in s.hackathons if s.submissions[h]] or [None])
+    if hid is None:
+        return None
+    return ("POST /api/judging/score", "POST", "/api/judging/score", {
+        "submission_id": s.rng.choice(s.submissions[hid]), "judge_id": s.rng.choice(s.judges),
+        "technical_score": s.rng.randint(1, 10), "design_score": s.rng.randint(1, 10),
+        "utility_score": s.rng.randint(1, 10),
+    })
+
+
+def score_batch(s):
+    """A judge submitting a whole sitting (several submissions of one hackathon) at once."""
+    hid = s.rng.choice([h for h in s.hackathons if s.submissions[h]] or [None])
+    if hid is None:
+        return None
+    judge = s.rng.choice(s.judges)
+    picked = s.rng.sample(s.submissions[hid], min(len(s.submissions[hid]), s.rng.randint(2, 10)))
+    return ("POST /api/judging/scores/batch", "POST", "/api/judging/scores/batch", [{
+        "submission_id": sid, "judge_id": judge,
+        "technical_score": s.rng.randint(1, 10), "design_score": s.rng.randint(1, 10),
+        "utility_score": s.rng.randint(1, 10),
+    } for sid in picked])
+
+
+def leaderboard(s):
+    return ("GET /api/judging/{hackathon_id}/leaderboard", "GET", f"/api/judging/{s.hackathon()}/leaderboard", None)
+
+
+PHASES = {
+    "registration": {
+        register: 30, login: 25, list_hackathons: 15, get_hackathon: 10, recommendations: 10, list_teams: 10,
+    },
+    "formation": {
+        list_teams: 20, hackathon_teams: 10, get_team: 15, match: 5, join: 15, approve: 8, reject: 2,
+        dashboard: 15, login: 10,
+    },
+    "crunch": {
+        submit: 15, list_submissions: 10, score: 15, score_batch: 10, leaderboard: 15, dashboard: 20, get_team: 10, list_teams: 5,
+    },
+}
+
+
+def remember(state: EventState, label: str, body, response):
+    """Feed created IDs back into the state so later requests can use them."""
+    if response.status_code != 200:
+        return
+    if label == "POST /api/auth/register":
+        state.users.append(response.json()["id"])
+    elif label == "POST /api/submissions/":
+        state.submissions[body["hackathon_id"]].append(response.json()["data"]["$id"])
+
+
+async def participant(client, state: EventState, mix: dict, deadline: float, results, think: float):
+    scenarios, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        request = state.rng.choices(scenarios, weights)[0](state)
+        if request is None:
+            continue
+        label, method, path, body = request
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            status = response.status_code
+            remember(state, label, body, response)
+        except Exception:
+            status = 599  # transport / unhandled error
+        results[label].append((time.perf_counter() - start, status))
+        if think:
+            await asyncio.sleep(state.rng.uniform(0, think))
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results, elapsed: float) -> dict:
+    report = {}
+    for label, samples in sorted(results.items()):
+        latencies = sorted(d for d, _ in samples)
+        count = len(samples)
+        report[label] = {
+            "count": count,
+            "rps": round(count / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "4xx_rate": round(sum(1 for _, s in samples if 400 <= s < 500) / count, 4),
+            "5xx_rate": round(sum(1 for _, s in samples if s >= 500) / count, 4),
+        }
+    return report
+
+
+def print_report(title: str, report: dict, elapsed: float):
+    total = sum(r["count"] for r in report.values())
+    print(f"\n== {title}: {total} requests in {elapsed:.1f}s ({total / elapsed:.0f} req/s)")
+    print(f"{'route':48} {'count':>7} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'4xx':>6} {'5xx':>6}")
+    for label, r in report.items():
+        print(f"{label:48} {r['count']:7} {r['rps']:7} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f}"
+              f" {r['4xx_rate']:6.1%} {r['5xx_rate']:6.1%}")
+
+
+async def run(args) -> dict:
+    fake = install_fake_backend(
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, error_rate=0.0, seed=args.seed,
+    )
+    state = EventState(random.Random(args.seed))
+    seed(fake, state, args.hackathons, args.seed_users, args.teams)
+    # Faults only once seeding is done
+    fake.error_rate = args.error_rate
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    output = {"config": vars(args), "phases": {}}
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", limits=limits) as client:
+            everything = defaultdict(list)
+            total_elapsed = 0.0
+            for phase in args.phases:
+                results = defaultdict(list)
+                start = time.perf_counter()
+                deadline = start + args.phase_seconds
+                await asyncio.gather(*[
+                    participant(client, state, PHASES[phase], deadline, results, args.think_ms / 1000)
+                    for _ in range(args.users)
+                ])
+                elapsed = time.perf_counter() - start
+                total_elapsed += elapsed
+                report = summarize(results, elapsed)
+                output["phases"][phase] = report
+                print_report(phase, report, elapsed)
+                for label, samples in results.items():
+                    everything[label].extend(samples)
+
+            output["overall"] = summarize(everything, total_elapsed)
+            print_report("overall", output["overall"], total_elapsed)
+    print(f"\nfake appwrite: {fake.stats()}")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="concurrent simulated participants")
+    parser.add_argument("--phase-seconds", type=float, default=5.0)
+    parser.add_argument("--phases", nargs="+", default=list(PHASES), choices=list(PHASES))
+    parser.add_argument("--think-ms", type=float, default=0.0, help="max random pause between a participant's requests")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="fake Appwrite latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fake Appwrite failure probability per call")
+    parser.add_argument("--hackathons", type=int, default=5)
+    parser.add_argument("--seed-users", type=int, default=2000)
+    parser.add_argument("--teams", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    output = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
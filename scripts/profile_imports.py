@@ -0,0 +1,63 @@
+"""
+Import-time profile of the backend (what a serverless cold start pays for).
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and
+prints the slowest modules by cumulative and by self time.
+
+Usage (from the repo root):
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --top 40 --module app.api.routes.teams
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+
+def profile(module: str):
+    """Return [(self_us, cumulative_us, depth, name)] for every import in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=25, help="rows per table")
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    total = next((cum for _, cum, _, name in rows if name == args.module), 0)
+    print(f"import {args.module}: {total / 1000:.1f} ms total, {len(rows)} modules\n")
+
+    print("Slowest by cumulative time (module + everything it pulls in):")
+    for self_us, cum, _, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cum / 1000:8.1f} ms  {name}")
+
+    print("\nSlowest by self time:")
+    for self_us, cum, _, name in sorted(rows, key=lambda r: r[0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    app_rows = [r for r in rows if r[3].startswith("app.")]
+    print("\nOur modules (self time):")
+    for self_us, cum, _, name in sorted(app_rows, key=lambda r: r[0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()